@@ -0,0 +1,126 @@
+"""Board rendering and task moves: fractional position keys vs integer positions.
+
+Builds a project of 10 sections with N tasks each (default 1,000, 5,000 and
+20,000) on generated fractional keys, plus the same board with integer
+positions 0..N-1. Then times:
+  - render: the first 50 cards of a section, and the whole section, in board
+    order via the (section_id, position) index, and with that index dropped
+  - move: 2,000 random moves (any task to a random spot in a random section)
+    with `Database.move_task`, which writes one row, against integer
+    positions, which shift every task below the old and the new spot
+and reports the rows written per move and the key lengths after the moves,
+and after MOVES appends at the bottom and top of a section (as delta runs add
+tasks).
+
+Usage: python benchmarks/bench_board.py [tasks_per_section ...]
+"""
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np
+from database import Database
+from utils.positions import spaced_keys, key_between
+
+SECTIONS = 10
+MOVES = 2_000
+PAGE = 50
+
+def build(db: Database, per_section: int) -> list[str]:
+    """One project of SECTIONS sections, per_section tasks each; returns the section ids"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.initialize_schema(str(ROOT / "schema.sql"))
+    sections = [f"section-{s:02d}" for s in range(SECTIONS)]
+    rank = np.tile(np.arange(per_section), SECTIONS)
+    keys = np.char.decode(spaced_keys(rank, np.full(len(rank), per_section)), "ascii").tolist()
+    rows = [(f"task-{i:08d}", "project", sections[i // per_section], keys[i], f"Task {i}",
+             "2025-01-01T00:00:00", "user") for i in range(len(keys))]
+    db.conn.executemany("""
+        INSERT INTO tasks (task_id, project_id, section_id, position, name, created_at, created_by)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    # The same board with integer positions
+    db.conn.execute("CREATE TABLE int_board (task_id TEXT PRIMARY KEY, section_id TEXT, pos INTEGER)")
+    db.conn.execute("CREATE INDEX idx_int_board ON int_board(section_id, pos)")
+    db.conn.executemany("INSERT INTO int_board VALUES (?, ?, ?)",
+                        ((r[0], r[2], int(k)) for r, k in zip(rows, rank.tolist())))
+    db.conn.commit()
+    return sections
+
+def time_render(db: Database, sections: list[str], label: str):
+    for limit in (PAGE, None):
+        start = time.perf_counter()
+        for section in sections * 10:
+            db.section_tasks(section, limit)
+        elapsed = (time.perf_counter() - start) / (len(sections) * 10)
+        print(f"   render {'first ' + str(limit) if limit else 'whole section':<14} {label:<14}"
+              f" {elapsed * 1e3:8.3f} ms")
+
+def int_move(conn, task_id: str, section_id: str, pos: int) -> int:
+    """Integer-position move: close the gap left behind, open one at pos; returns rows written"""
+    old_section, old_pos = conn.execute("SELECT section_id, pos FROM int_board WHERE task_id = ?",
+                                        (task_id,)).fetchone()
+    written = conn.execute("UPDATE int_board SET pos = pos - 1 WHERE section_id = ? AND pos > ?",
+                           (old_section, old_pos)).rowcount
+    written += conn.execute("UPDATE int_board SET pos = pos + 1 WHERE section_id = ? AND pos >= ?",
+                            (section_id, pos)).rowcount
+    conn.execute("UPDATE int_board SET section_id = ?, pos = ? WHERE task_id = ?", (section_id, pos, task_id))
+    conn.commit()
+    return written + 1
+
+def end_keys(first: str, last: str) -> tuple[int, int]:
+    """Key lengths after MOVES successive appends below last and above first"""
+    bottom, top = last, first
+    for _ in range(MOVES):
+        bottom, top = key_between(bottom, None), key_between(None, top)
+    return len(bottom), len(top)
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 5_000, 20_000]
+    for per_section in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(str(Path(tmp) / "board.sqlite"))
+            db.connect()
+            sections = build(db, per_section)
+            print(f"{SECTIONS} sections x {per_section:,} tasks")
+            time_render(db, sections, "indexed")
+
+            rng = random.Random(7)
+            task_ids = [f"task-{i:08d}" for i in range(SECTIONS * per_section)]
+            moves = [(rng.choice(task_ids), rng.choice(sections), rng.randrange(per_section)) for _ in range(MOVES)]
+            elapsed = 0.0
+            for task_id, section, spot in moves:
+                # The task the UI drops onto (not timed: the client already knows it)
+                after = db.conn.execute(
+                    "SELECT task_id FROM tasks WHERE section_id = ? ORDER BY position LIMIT 1 OFFSET ?",
+                    (section, spot)
+                ).fetchone()
+                start = time.perf_counter()
+                db.move_task(task_id, section, after[0] if after and after[0] != task_id else None)
+                elapsed += time.perf_counter() - start
+            lengths = [row[0] for row in db.conn.execute("SELECT length(position) FROM tasks")]
+            print(f"   move  fractional     {elapsed / MOVES * 1e3:8.3f} ms   1 row written"
+                  f"   (keys: mean {np.mean(lengths):.1f}, max {max(lengths)} chars)")
+            start = time.perf_counter()
+            written = sum(int_move(db.conn, task_id, section, spot) for task_id, section, spot in moves)
+            elapsed = time.perf_counter() - start
+            print(f"   move  integer        {elapsed / MOVES * 1e3:8.3f} ms   {written / MOVES:,.0f} rows written")
+
+            first, last = db.conn.execute("SELECT MIN(position), MAX(position) FROM tasks WHERE section_id = ?",
+                                          (sections[0],)).fetchone()
+            bottom, top = end_keys(first, last)
+            print(f"   {MOVES:,} appends: bottom key {bottom} chars, top key {top} chars")
+
+            db.conn.execute("DROP INDEX idx_tasks_section_position")
+            time_render(db, sections, "no index")
+            db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Time vectorized comment generation at the default scale and at 1M+ comments.
+
+Usage: python benchmarks/bench_comments.py [num_tasks ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import numpy as np
+from generators.comments import generate_comments
+
+def make_tasks(n: int, users: list[dict], rng: np.random.Generator) -> list[dict]:
+    """Synthetic task rows with just the fields comment generation reads"""
+    created = np.datetime64("2024-01-01") + rng.integers(0, 700, size=n).astype("timedelta64[D]")
+    completed = rng.random(n) < 0.6
+    done_at = created.astype("datetime64[s]") + rng.integers(3600, 30 * 86400, size=n).astype("timedelta64[s]")
+    return [
+        {
+            "task_id": f"task-{i}",
+            "assignee_id": users[i % len(users)]["user_id"] if i % 7 else None,
+            "created_at": str(created[i]) + "T00:00:00",
+            "completed": bool(completed[i]),
+            "completed_at": str(done_at[i]) if completed[i] else None,
+        }
+        for i in range(n)
+    ]
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [34_000, 1_000_000]
+    rng = np.random.default_rng(7)
+    users = [{"user_id": f"user-{i}"} for i in range(7_500)]
+    for n in sizes:
+        tasks = make_tasks(n, users, rng)
+        start = time.perf_counter()
+        comments = generate_comments(tasks, users, rng=rng)
+        elapsed = time.perf_counter() - start
+        total = len(comments)
+        print(f"{n:>10,} tasks -> {total:>10,} comments in {elapsed:6.2f}s ({total / elapsed:,.0f} comments/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compact (dictionary-encoded) schema against the plain one: size, build time, scans.
+
+Copies a generated database twice with the same code path, once plain and
+once compact (`compact.compact` with and without COMPACT_COLUMNS), then
+reports file size, copy time and the best of 5 runs of scan queries, with
+and without encoded columns (on the compact copy both through the decoding
+views and, for some, on the codes directly: grouped on the code and decoded
+once per group, or filtered on an indexed code), plus all of
+validation_queries.sql.
+
+Usage: python benchmarks/bench_compact.py [DB ...]   (default: the generated database)
+"""
+import sys
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from config import DB_PATH
+from compact import compact, split_statements
+
+RUNS = 5
+# Name -> (SQL, SQL on the compact copy's codes; None = the same SQL through the decoding views)
+SCANS = {
+    "tasks by priority": ("SELECT priority, COUNT(*) FROM tasks GROUP BY priority", None),
+    "  on codes": ("SELECT priority, COUNT(*) FROM tasks GROUP BY priority", """
+        SELECT l.value, n FROM (SELECT priority_code, COUNT(*) AS n FROM tasks_data GROUP BY 1) c
+        LEFT JOIN lookup_tasks_priority l ON l.code = c.priority_code"""),
+    "users by department": ("SELECT department, job_title, COUNT(*) FROM users GROUP BY 1, 2", None),
+    "comments by type": ("SELECT comment_type, COUNT(*), SUM(length(comment_text)) FROM comments GROUP BY 1", None),
+    "stories by type": ("SELECT story_type, COUNT(*) FROM stories GROUP BY 1", None),
+    "  on codes ": ("SELECT story_type, COUNT(*) FROM stories GROUP BY 1", """
+        SELECT l.value, n FROM (SELECT story_type_code, COUNT(*) AS n FROM stories_data GROUP BY 1) c
+        LEFT JOIN lookup_stories_story_type l ON l.code = c.story_type_code"""),
+    "on-hold projects (indexed)": ("SELECT COUNT(*) FROM projects WHERE status = 'on_hold'", """
+        SELECT COUNT(*) FROM projects
+        WHERE status_code = (SELECT code FROM lookup_projects_status WHERE value = 'on_hold')"""),
+    "tasks, no encoded column": ("SELECT COUNT(*), SUM(num_comments) FROM tasks WHERE completed = 1", None),
+    "stories, no encoded column": ("SELECT COUNT(DISTINCT actor_id) FROM stories", None),
+}
+
+def best(conn: sqlite3.Connection, statements: list[str]) -> float:
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        for sql in statements:
+            conn.execute(sql).fetchall()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    sources = sys.argv[1:] or [str(ROOT / DB_PATH)]
+    # The script's SQL statements, without the sqlite3 shell's dot-commands
+    script = "".join(line for line in (ROOT / "validation_queries.sql").read_text().splitlines(keepends=True)
+                     if not line.startswith("."))
+    validation = split_statements(script)
+    for source in sources:
+        print(source)
+        with tempfile.TemporaryDirectory() as tmp:
+            results = {}
+            for layout in ("plain", "compact"):
+                out = str(Path(tmp) / f"{layout}.sqlite")
+                start = time.perf_counter()
+                compact(source, out, **({"columns": {}} if layout == "plain" else {}))
+                built = time.perf_counter() - start
+                conn = sqlite3.connect(out)
+                scans = {name: best(conn, [sql if layout == "plain" or coded is None else coded])
+                         for name, (sql, coded) in SCANS.items()}
+                scans["validation_queries.sql"] = best(conn, validation)
+                conn.close()
+                results[layout] = (Path(out).stat().st_size, built, scans)
+            (plain_size, plain_built, plain), (size, built, scans) = results["plain"], results["compact"]
+            print(f"   size   plain {plain_size / 2**20:7.1f} MiB   compact {size / 2**20:7.1f} MiB"
+                  f"   ({1 - size / plain_size:.0%} smaller)")
+            print(f"   build  plain {plain_built:7.2f}s      compact {built:7.2f}s")
+            for name in scans:
+                print(f"   {name:<28} plain {plain[name] * 1e3:8.2f} ms   compact {scans[name] * 1e3:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
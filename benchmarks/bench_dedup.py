@@ -0,0 +1,67 @@
+"""Measure near-duplicate filtering: throughput, memory and rejection rates.
+
+Streams template task names (scoped per project, as generate_tasks does)
+and unique free text through a NearDuplicateFilter, then checks rejection
+on pairs that should and should not match: light edits of a sentence,
+and unrelated sentences (false rejects).
+
+Usage: python benchmarks/bench_dedup.py [n_texts]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from generators.tasks import generate_task_name
+from utils.dedup import NearDuplicateFilter
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+def word(rng: random.Random) -> str:
+    return "".join(rng.choices(LETTERS, k=rng.randint(3, 9)))
+
+def sentence(rng: random.Random, n_words: int = 10) -> str:
+    """Unrelated free text: random pseudo-words, so pairs share almost no 3-grams"""
+    return " ".join(word(rng) for _ in range(n_words))
+
+def edit(rng: random.Random, text: str) -> str:
+    """Case/whitespace changes or one word swapped out"""
+    words = text.split()
+    if rng.random() < 0.5:
+        words[rng.randrange(len(words))] = word(rng)
+        return " ".join(words)
+    return "  ".join(words).upper() + " "
+
+def stream(texts: list[str], scopes, batch: int = 50_000) -> tuple[float, NearDuplicateFilter]:
+    dedup = NearDuplicateFilter()
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch):
+        dedup.filter(texts[i:i + batch], scopes[i:i + batch] if scopes else None)
+    return len(texts) / (time.perf_counter() - start), dedup
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(7)
+    random.seed(7)
+
+    names = [generate_task_name(f"Project {i // 60}", "Engineering", use_llm=False) for i in range(n)]
+    rate, dedup = stream(names, [i // 60 for i in range(n)])
+    print(f"template task names   {rate:10,.0f} texts/s ({rate * 60:,.0f}/min)"
+          f"   rejected {dedup.rejected / n:6.1%} within projects   filter {dedup.nbytes / 2**20:.1f} MiB")
+
+    free = [sentence(rng, rng.randint(6, 20)) for _ in range(n)]
+    rate, dedup = stream(free, None)
+    print(f"unique free text      {rate:10,.0f} texts/s ({rate * 60:,.0f}/min)"
+          f"   rejected {dedup.rejected / n:6.1%} (false rejects)")
+
+    base = [sentence(rng, 12) for _ in range(20_000)]
+    dedup = NearDuplicateFilter()
+    dedup.filter(base)
+    caught = (~dedup.filter([edit(rng, t) for t in base])).mean()
+    print(f"edited copies         caught {caught:6.1%} of 20,000 near-duplicates")
+
+if __name__ == "__main__":
+    main()
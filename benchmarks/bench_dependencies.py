@@ -0,0 +1,94 @@
+"""Task dependencies: generation, critical-path summary and blocked-work queries.
+
+Generates tasks for synthetic projects at the given scale (1 ~ 33k tasks,
+30 ~ 1M) in teams of eight projects, then their dependency links, into a
+temporary database, and builds the critical-path summary. Then times, for
+1,000 random tasks / projects:
+  - what blocks this task: direct blockers, and every blocker up the chains
+  - longest chain in a project: the summary (deepest row + critical_blocker_id
+    walk) against a recursive search over the project's links
+
+Usage: python benchmarks/bench_dependencies.py [scale ...]
+"""
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import numpy as np
+from bench_table import make_inputs
+from database import Database
+from dependencies import build_dependency_summary
+from generators.tasks import generate_tasks
+from generators.dependencies import generate_dependencies
+
+QUERIES = 1_000
+PROJECTS_PER_TEAM = 8
+
+# Longest chain without the summary: every path through the project's tasks, one level per step
+SEARCH_SQL = """
+    WITH RECURSIVE chain(task_id, length) AS (
+        SELECT task_id, 0 FROM tasks WHERE project_id = :project
+        UNION
+        SELECT d.task_id, c.length + 1 FROM chain c
+        JOIN task_dependencies d ON d.depends_on_id = c.task_id
+        JOIN tasks t ON t.task_id = d.task_id AND t.project_id = :project
+    )
+    SELECT MAX(length) FROM chain
+"""
+
+def build(db: Database, scale: int) -> tuple[list[str], list[str]]:
+    users, projects, sections = make_inputs(scale, np.random.default_rng(7))
+    for i, project in enumerate(projects):
+        project["team_id"] = f"team-{i // PROJECTS_PER_TEAM:05d}"
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.initialize_schema(str(ROOT / "schema.sql"))
+        tasks = generate_tasks(projects, sections, users, use_llm=False)
+        with db.conn:
+            db.write_rows("tasks", tasks)
+    start = time.perf_counter()
+    links = generate_dependencies(tasks, projects, np.random.default_rng(7))
+    generated = time.perf_counter() - start
+    with contextlib.redirect_stdout(io.StringIO()):
+        with db.conn:
+            db.write_rows("task_dependencies", links)
+    start = time.perf_counter()
+    linked = build_dependency_summary(db.conn)
+    summarized = time.perf_counter() - start
+    depth = db.conn.execute("SELECT MAX(depth) FROM task_dependency_summary").fetchone()[0]
+    print(f"{len(tasks):,} tasks: {len(links):,} links generated in {generated:.2f}s,"
+          f" summary of {linked:,} linked tasks built in {summarized:.2f}s (deepest chain {depth})")
+    task_ids = [row[0] for row in db.conn.execute("SELECT task_id FROM task_dependencies")]
+    return task_ids, [p["project_id"] for p in projects]
+
+def timed(label: str, query, ids: list[str]):
+    start = time.perf_counter()
+    rows = sum(len(query(i)) for i in ids)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<40} {elapsed / len(ids) * 1e3:8.3f} ms/query ({rows / len(ids):.1f} rows)")
+
+def main():
+    scales = [int(a) for a in sys.argv[1:]] or [1, 30]
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(str(Path(tmp) / "dependencies.sqlite"))
+            db.connect()
+            task_ids, project_ids = build(db, scale)
+            rng = random.Random(11)
+            tasks, projects = rng.choices(task_ids, k=QUERIES), rng.choices(project_ids, k=QUERIES)
+            timed("what blocks this task (direct)", lambda t: db.blocking_tasks(t, transitive=False), tasks)
+            timed("what blocks this task (transitive)", db.blocking_tasks, tasks)
+            timed("longest chain in project (summary)", db.longest_chain, projects)
+            timed("longest chain in project (search)",
+                  lambda p: [db.conn.execute(SEARCH_SQL, {"project": p}).fetchone()[0]], projects[:QUERIES // 10])
+            db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Asana-API-shaped JSON export: throughput and peak memory as the workspace grows.
+
+Scales the generated database by copying its tasks, with their comments,
+stories and dependency links, N times under new ids into a temporary
+database (1 ~ 33k tasks, 30 ~ 1M), then runs `export.export` in a fresh
+process for each serializer (orjson when installed, and the json module)
+and worker count, reporting documents/s, output size and the peak resident
+memory of the largest exporting process, which tracks EXPORT_BATCH_ROWS
+rather than the workspace.
+
+Usage: python benchmarks/bench_export.py [scale ...]   (default: 1 10)
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from config import DB_PATH
+
+# Columns holding ids of copied rows, suffixed in each copy
+COPIED = {
+    "tasks": ["task_id", "parent_task_id"],
+    "comments": ["comment_id", "task_id", "parent_comment_id"],
+    "stories": ["story_id", "task_id"],
+    "task_dependencies": ["task_id", "depends_on_id"],
+}
+
+# Run in a fresh process: (documents, seconds, bytes written, peak MiB of the largest exporting process)
+WORKER = """
+import resource, sys, time
+from pathlib import Path
+if sys.argv[4] == "json":
+    sys.modules["orjson"] = None  # Forces the standard-library fallback
+sys.path.insert(0, sys.argv[1])
+from export import export
+start = time.perf_counter()
+manifest = export(sys.argv[2], sys.argv[3], workers=int(sys.argv[5]))
+elapsed = time.perf_counter() - start
+size = sum(p.stat().st_size for p in Path(sys.argv[3]).iterdir())
+peak = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+print(sum(r["documents"] for r in manifest["resources"].values()), elapsed, size, peak / 1024)
+"""
+
+def scaled(source: str, out: str, scale: int) -> int:
+    """Copy source to out with its tasks (and their children) repeated scale times; returns the task count"""
+    src = sqlite3.connect(source)
+    conn = sqlite3.connect(out)
+    src.backup(conn)
+    src.close()
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.execute("ATTACH DATABASE ? AS src", (source,))
+    with conn:
+        for copy in range(1, scale):
+            for table, ids in COPIED.items():
+                columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+                select = [f"{c} || '-{copy}'" if c in ids else c for c in columns]
+                conn.execute(f"INSERT INTO main.{table} ({', '.join(columns)}) "
+                             f"SELECT {', '.join(select)} FROM src.{table}")
+    tasks = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    conn.close()
+    return tasks
+
+def main():
+    scales = [int(a) for a in sys.argv[1:]] or [1, 10]
+    serializers = ["json"]
+    try:
+        import orjson  # noqa: F401
+        serializers.insert(0, "orjson")
+    except ImportError:
+        pass
+    workers = sorted({1, os.cpu_count() or 1, 4})
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = str(Path(tmp) / "workspace.sqlite")
+            tasks = scaled(str(ROOT / DB_PATH), db, scale)
+            print(f"{tasks:,} tasks ({os.cpu_count()} CPUs)")
+            for serializer in serializers:
+                for n in workers:
+                    out = subprocess.run(
+                        [sys.executable, "-c", WORKER, str(ROOT / "src"), db, str(Path(tmp) / "export"),
+                         serializer, str(n)],
+                        check=True, capture_output=True, text=True,
+                    ).stdout
+                    documents, seconds, size, peak = (float(v) for v in out.split())
+                    print(f"   {serializer:<7} {n} workers  {seconds:7.1f}s  {documents / seconds:9,.0f} docs/s"
+                          f"  {size / 2**20:8.0f} MiB  peak {peak:5.0f} MiB")
+
+if __name__ == "__main__":
+    main()
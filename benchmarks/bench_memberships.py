@@ -0,0 +1,81 @@
+"""Membership queries: "projects visible to a user" and "members of a project".
+
+Generates an organization of 7,500 users per scale (teams scaled to match,
+1 ~ 85 teams) with multi-team memberships, projects and project members into
+a temporary database, then times both queries for 2,000 random users /
+projects, first with the schema's user-side membership indexes and then
+without them (only the (team, user) and (project, user) keys left).
+
+Usage: python benchmarks/bench_memberships.py [scale ...]
+"""
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np
+from config import NUM_TEAMS
+from database import Database
+from generators.teams import generate_teams
+from generators.users import generate_users
+from generators.projects import generate_projects, generate_project_memberships
+
+USER_SIDE_INDEXES = ["idx_team_memberships_user", "idx_project_memberships_user", "idx_project_followers_user"]
+QUERIES = 2_000
+
+def build(db: Database, scale: int) -> tuple[list[str], list[str]]:
+    random.seed(7)
+    rng = np.random.default_rng(7)
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.initialize_schema(str(ROOT / "schema.sql"))
+        teams = generate_teams("org", NUM_TEAMS * scale)
+        users, memberships = generate_users("org", "example.com", teams, 7_500 * scale, rng)
+        projects, _ = generate_projects(teams, users, use_llm=False, memberships=memberships)
+        members, followers = generate_project_memberships(projects, users, memberships, rng)
+        with db.conn:
+            db.write_rows("organizations", [{"org_id": "org", "name": "Org", "domain": "example.com",
+                                             "created_at": "2020-01-01T00:00:00"}])
+            db.write_rows("teams", teams)
+            db.write_rows("users", users)
+            db.write_rows("team_memberships", memberships)
+            db.write_rows("projects", projects)
+            db.write_rows("project_memberships", members)
+            db.write_rows("project_followers", followers)
+    print(f"{len(users):,} users, {len(teams):,} teams: {len(memberships):,} team memberships,"
+          f" {len(projects):,} projects, {len(members):,} project members, {len(followers):,} followers")
+    db.conn.execute("ANALYZE")
+    return [u["user_id"] for u in users], [p["project_id"] for p in projects]
+
+def timed(label: str, query, ids: list[str]):
+    start = time.perf_counter()
+    rows = sum(len(query(i)) for i in ids)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<50} {elapsed / len(ids) * 1e6:9.1f} µs/query ({rows / len(ids):.1f} rows)")
+
+def main():
+    scales = [int(a) for a in sys.argv[1:]] or [1, 13]
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(str(Path(tmp) / "memberships.sqlite"))
+            db.connect()
+            user_ids, project_ids = build(db, scale)
+            rng = random.Random(11)
+            users, projects = rng.choices(user_ids, k=QUERIES), rng.choices(project_ids, k=QUERIES)
+            for indexed in (True, False):
+                if not indexed:
+                    for name in USER_SIDE_INDEXES:
+                        db.conn.execute(f"DROP INDEX {name}")
+                    db.conn.execute("ANALYZE")
+                suffix = "" if indexed else " (no user-side indexes)"
+                timed("projects visible to user" + suffix, db.visible_projects, users)
+                timed("members of project" + suffix, db.project_members, projects)
+            db.close()
+
+if __name__ == "__main__":
+    main()
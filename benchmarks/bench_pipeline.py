@@ -0,0 +1,99 @@
+"""Compare sequential generate-then-insert with the background DatabaseWriter pipeline.
+
+Generates tasks, comments and stories for synthetic projects at the given
+scale (1 ~ 33k tasks) twice into a fresh file database: once inserting each
+stage on the main thread before generating the next (as main.py used to),
+once streaming each stage's batches (`iter_tasks`, `iter_comments`,
+`iter_stories`) to a DatabaseWriter thread as main.py does. Prints the wall
+time of both and the pipeline's per-stage overlap.
+
+Usage: python benchmarks/bench_pipeline.py [scale ...]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import numpy as np
+from bench_table import make_inputs
+from database import Database
+from writer import DatabaseWriter
+from utils.table import Table
+from generators.tasks import generate_tasks, iter_tasks
+from generators.comments import generate_comments, iter_comments
+from generators.stories import iter_stories
+
+SCHEMA = str(ROOT / "schema.sql")
+
+def stages(users, projects, sections):
+    """(stage, table, build, stream) in order; each takes the previous stage outputs"""
+    sections_by_project = {}
+    for section in sections:
+        sections_by_project.setdefault(section["project_id"], []).append(section["section_id"])
+    user_ids = [u["user_id"] for u in users]
+    return [
+        ("tasks", "tasks", lambda out: generate_tasks(projects, sections, users, use_llm=False),
+         lambda out: iter_tasks(projects, sections, users, use_llm=False)),
+        ("comments", "comments", lambda out: generate_comments(out["tasks"], users),
+         lambda out: iter_comments(out["tasks"], users)),
+        ("stories", "stories", lambda out: iter_stories(out["tasks"], sections_by_project, user_ids),
+         lambda out: iter_stories(out["tasks"], sections_by_project, user_ids)),
+    ]
+
+def sequential(path: str, plan) -> float:
+    db = Database(path)
+    db.connect()
+    db.initialize_schema(SCHEMA)
+    start = time.perf_counter()
+    out = {}
+    for name, table, build, _ in plan:
+        out[name] = build(out)
+        with db.conn:
+            if name == "stories":
+                indexes = db.drop_indexes(table)
+                for chunk in out[name]:
+                    db.write_rows(table, chunk)
+                db.create_indexes(indexes)
+            else:
+                db.write_rows(table, out[name])
+    db.close()
+    return time.perf_counter() - start
+
+def pipelined(path: str, plan) -> tuple[float, list[dict]]:
+    writer = DatabaseWriter(path).start()
+    writer.run(lambda db: db.initialize_schema(SCHEMA))
+    start = time.perf_counter()
+    out = {}
+    for name, table, _, stream in plan:
+        with writer.stage(name):
+            if name == "stories":
+                writer.write_stream(table, stream(out))
+                continue
+            chunks = []
+            writer.write_stream(table, (chunks.append(chunk) or chunk for chunk in stream(out)))
+            out[name] = Table.concat(chunks)
+    writer.close()
+    return time.perf_counter() - start, writer.report()
+
+def main():
+    scales = [int(a) for a in sys.argv[1:]] or [1, 5]
+    for scale in scales:
+        users, projects, sections = make_inputs(scale, np.random.default_rng(7))
+        plan = stages(users, projects, sections)
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            seq = sequential(str(Path(tmp) / "sequential.sqlite"), plan)
+            pipe, report = pipelined(str(Path(tmp) / "pipelined.sqlite"), plan)
+        print(f"scale {scale}: sequential {seq:.1f}s   pipelined {pipe:.1f}s   ({seq / pipe:.2f}x)")
+        for row in report:
+            share = row["overlapped"] / row["write"] if row["write"] else 0.0
+            print(f"   {row['stage']:<9} generate {row['produce']:6.2f}s   write {row['write']:6.2f}s"
+                  f"   overlapped {share:4.0%}   waited {row['blocked']:.2f}s")
+
+if __name__ == "__main__":
+    main()
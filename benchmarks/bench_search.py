@@ -0,0 +1,99 @@
+"""Compare FTS5 search with LIKE scans over task and comment text at 33k and 1M tasks.
+
+Builds a throwaway database per size from schema.sql with template task names
+and generated comments, then times each query as a LIKE '%term%' scan over
+tasks.name/description and comments.comment_text, as an FTS5 MATCH returning
+every hit, and through the ranked search API (top 20).
+
+Usage: python benchmarks/bench_search.py [num_tasks ...]
+"""
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np
+from config import DEPT_DISTRIBUTION
+from generators.tasks import generate_task_name
+from generators.comments import generate_comments
+from search import build_search_index, search
+
+QUERIES = ["api", "migration", "budget approval", "landing page", "performance bottleneck"]
+PROJECT_NAMES = ["Platform Revamp", "Q3 Campaign", "Mobile App", "Billing Migration", "Onboarding Flow"]
+
+def build_db(path: str, n: int, rng: np.random.Generator):
+    conn = sqlite3.connect(path)
+    conn.executescript((ROOT / "schema.sql").read_text())
+    departments = random.choices(list(DEPT_DISTRIBUTION), weights=list(DEPT_DISTRIBUTION.values()), k=n)
+    projects = random.choices(PROJECT_NAMES, k=n)
+    created = np.datetime64("2024-01-01T00:00:00") + rng.integers(0, 700 * 86400, size=n).astype("timedelta64[s]")
+    tasks = [
+        {"task_id": f"task-{i}", "assignee_id": None, "completed": False, "completed_at": None,
+         "created_at": str(created[i]), "name": generate_task_name(projects[i], departments[i], use_llm=False),
+         "description": f"Description for {projects[i]}"}
+        for i in range(n)
+    ]
+    conn.executemany(
+        "INSERT INTO tasks (task_id, project_id, name, description, created_at, created_by) VALUES (?, 'p', ?, ?, ?, 'u')",
+        ((t["task_id"], t["name"], t["description"], t["created_at"]) for t in tasks)
+    )
+    comments = generate_comments(tasks, [{"user_id": "u"}], rng=rng)
+    conn.executemany(
+        "INSERT INTO comments (comment_id, task_id, user_id, comment_text, created_at) VALUES (?, ?, ?, ?, ?)",
+        zip(comments["comment_id"], comments["task_id"], comments["user_id"],
+            comments["comment_text"], comments["created_at"])
+    )
+    conn.commit()
+    start = time.perf_counter()
+    build_search_index(conn)
+    return conn, len(comments["comment_id"]), time.perf_counter() - start
+
+def like_scan(conn: sqlite3.Connection, term: str) -> int:
+    pattern = f"%{term}%"
+    tasks = conn.execute("SELECT task_id FROM tasks WHERE name LIKE ? OR description LIKE ?", (pattern, pattern))
+    comments = conn.execute("SELECT comment_id FROM comments WHERE comment_text LIKE ?", (pattern,))
+    return len(tasks.fetchall()) + len(comments.fetchall())
+
+def fts_match(conn: sqlite3.Connection, term: str) -> int:
+    query = f'"{term}"'
+    tasks = conn.execute("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?", (query,))
+    comments = conn.execute("SELECT rowid FROM comments_fts WHERE comments_fts MATCH ?", (query,))
+    return len(tasks.fetchall()) + len(comments.fetchall())
+
+def ranked(conn: sqlite3.Connection, term: str) -> int:
+    return len(search(conn, term, kinds=("task", "comment")))
+
+def median_ms(fn, conn: sqlite3.Connection, term: str, repeats: int = 5) -> tuple[float, int]:
+    times, hits = [], 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        hits = fn(conn, term)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, hits
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [33_000, 1_000_000]
+    rng = np.random.default_rng(7)
+    random.seed(7)
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            conn, num_comments, index_time = build_db(str(Path(tmp) / "bench.sqlite"), n, rng)
+            print(f"{n:,} tasks, {num_comments:,} comments (FTS5 index built in {index_time:.2f}s)")
+            print(f"   {'query':<24}{'LIKE scan':>14}{'FTS5 MATCH':>14}{'ranked top 20':>16}")
+            for term in QUERIES:
+                like_ms, like_hits = median_ms(like_scan, conn, term)
+                fts_ms, fts_hits = median_ms(fts_match, conn, term)
+                rank_ms, _ = median_ms(ranked, conn, term)
+                print(f"   {term:<24}{like_ms:>9.1f} ms {fts_ms:>9.1f} ms {rank_ms:>11.1f} ms"
+                      f"   ({like_hits:,} / {fts_hits:,} hits)")
+            conn.close()
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Environment startup: loading a workspace from SQLite vs opening a memory-mapped snapshot.
+
+Generates users, tasks, comments and stories for synthetic projects at the
+given scale (1 ~ 33k tasks, 30 ~ 1M) into a temporary database and exports
+its snapshot. Then, in a fresh worker process each, times what an
+environment does at startup:
+  - sqlite: read tasks and comments into dicts keyed by id, plus the
+    project -> tasks and task -> comments maps
+  - snapshot: open the snapshot, then fetch one project's tasks, their names
+    and a task's comments (columns are mapped lazily, so this is the whole cost)
+and reports the worker's resident memory after startup; snapshot pages are
+shared through the page cache by every worker mapping the same files.
+
+Usage: python benchmarks/bench_snapshot.py [scale ...]
+"""
+import contextlib
+import io
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import numpy as np
+from bench_table import make_inputs
+from writer import DatabaseWriter
+from snapshot import export
+from generators.tasks import generate_tasks
+from generators.comments import generate_comments
+from generators.stories import iter_stories
+
+WORKER = {
+    "sqlite": """
+import sqlite3
+conn = sqlite3.connect(PATH)
+conn.row_factory = sqlite3.Row
+tasks, comments, by_project, by_task = {}, {}, {}, {}
+for row in conn.execute("SELECT * FROM tasks"):
+    tasks[row["task_id"]] = dict(row)
+    by_project.setdefault(row["project_id"], []).append(row["task_id"])
+for row in conn.execute("SELECT * FROM comments ORDER BY created_at"):
+    comments[row["comment_id"]] = dict(row)
+    by_task.setdefault(row["task_id"], []).append(row["comment_id"])
+project = next(iter(by_project))
+names = [tasks[t]["name"] for t in by_project[project]]
+thread = by_task.get(by_project[project][0], [])
+""",
+    "snapshot": """
+from snapshot import Snapshot
+snap = Snapshot(PATH)
+projects = snap.table("projects")
+row = projects.row_of(projects.column("project_id")[0])
+task_rows = snap.children("tasks.project_id", row)
+names = snap.table("tasks").column("name").decode(task_rows)
+thread = snap.children("comments.task_id", int(task_rows[0]))
+""",
+}
+
+def worker(kind: str, path: str) -> tuple[float, float]:
+    """Startup seconds (after interpreter launch) and resident MiB of a fresh process"""
+    script = (
+        f"import sys, time\nsys.path.insert(0, {str(ROOT / 'src')!r})\nPATH = {path!r}\n"
+        "start = time.perf_counter()\n" + WORKER[kind] +
+        "elapsed = time.perf_counter() - start\n"
+        "rss = next(int(l.split()[1]) for l in open('/proc/self/status') if l.startswith('VmRSS'))\n"
+        "print(elapsed, rss / 1024)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    seconds, rss = out.split()
+    return float(seconds), float(rss)
+
+def build(path: str, scale: int):
+    users, projects, sections = make_inputs(scale, np.random.default_rng(7))
+    sections_by_project = {}
+    for section in sections:
+        sections_by_project.setdefault(section["project_id"], []).append(section["section_id"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        writer = DatabaseWriter(path).start()
+        writer.run(lambda db: db.initialize_schema(str(ROOT / "schema.sql")))
+        # Just the NOT NULL columns make_inputs leaves out (foreign keys are not enforced)
+        writer.write("users", [{**u, "org_id": "org", "email": f"{u['user_id']}@example.com", "first_name": "A",
+                                "last_name": "B", "created_at": "2024-01-01T00:00:00"} for u in users])
+        writer.write("projects", [{**p, "team_id": "team"} for p in projects])
+        writer.write("sections", [{**s, "name": "Section", "position": 0, "created_at": "2024-01-01T00:00:00"}
+                                  for s in sections])
+        tasks = generate_tasks(projects, sections, users, use_llm=False)
+        writer.write("tasks", tasks)
+        writer.write("comments", generate_comments(tasks, users))
+        writer.write_stream("stories", iter_stories(tasks, sections_by_project, [u["user_id"] for u in users]))
+        writer.close()
+    return len(tasks)
+
+def main():
+    scales = [int(a) for a in sys.argv[1:]] or [1, 30]
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path, snap_path = str(Path(tmp) / "workspace.sqlite"), str(Path(tmp) / "snapshot")
+            n = build(db_path, scale)
+            start = time.perf_counter()
+            export(db_path, snap_path)
+            exported = time.perf_counter() - start
+            size = sum(p.stat().st_size for p in Path(snap_path).iterdir())
+            print(f"{n:,} tasks: snapshot exported in {exported:.1f}s ({size / 2**20:.0f} MiB)")
+            for kind in WORKER:
+                seconds, rss = worker(kind, db_path if kind == "sqlite" else snap_path)
+                print(f"   {kind:<8} startup {seconds:7.3f}s   resident {rss:6.0f} MiB")
+
+if __name__ == "__main__":
+    main()
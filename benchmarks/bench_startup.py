@@ -0,0 +1,30 @@
+"""Measure generator startup: fresh-interpreter import time of main.py and its heavy dependencies.
+
+Usage: python benchmarks/bench_startup.py [repeats]
+"""
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+MODULES = ["numpy", "openai", "faker", "main"]
+
+def time_import(module: str) -> float:
+    """Import module in a fresh interpreter and return the seconds it took"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip())
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for module in MODULES:
+        try:
+            times = [time_import(module) for _ in range(repeats)]
+        except subprocess.CalledProcessError:
+            print(f"{module:>8}: not installed")
+            continue
+        print(f"{module:>8}: median {statistics.median(times) * 1000:7.1f} ms over {repeats} runs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Stream the activity log for a large task set into SQLite: throughput and peak memory.
+
+Generates tasks for synthetic projects at the given scale (1 ~ 33k tasks),
+then bulk-loads their stories chunk by chunk with Database.write_rows,
+secondary indexes dropped and rebuilt once as the writer's write_stream does
+for main.py, reporting stories/s; a second, traced pass measures the peak
+memory allocated while streaming (which tracks STORY_CHUNK_TASKS, not the
+total).
+
+Usage: python benchmarks/bench_stories.py [scale ...]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import numpy as np
+from bench_table import make_inputs
+from database import Database
+from generators.tasks import generate_tasks
+from generators.stories import iter_stories
+
+def stream(tasks, sections_by_project, user_ids, rng, trace: bool = False) -> tuple[int, float, int]:
+    """Insert all stories into a fresh file database: (rows, seconds, peak traced bytes)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(str(Path(tmp) / "stories.sqlite"))
+        db.connect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.initialize_schema(str(ROOT / "schema.sql"))
+            if trace:
+                tracemalloc.start()
+            start = time.perf_counter()
+            with db.conn:
+                indexes = db.drop_indexes("stories")
+                count = sum(db.write_rows("stories", chunk)
+                            for chunk in iter_stories(tasks, sections_by_project, user_ids, rng))
+                db.create_indexes(indexes)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if trace else 0
+            tracemalloc.stop()
+        db.close()
+    return count, elapsed, peak
+
+def main():
+    scales = [int(a) for a in sys.argv[1:]] or [1, 10]
+    rng = np.random.default_rng(7)
+    for scale in scales:
+        users, projects, sections = make_inputs(scale, rng)
+        with contextlib.redirect_stdout(io.StringIO()):
+            tasks = generate_tasks(projects, sections, users, use_llm=False)
+        sections_by_project = {}
+        for section in sections:
+            sections_by_project.setdefault(section["project_id"], []).append(section["section_id"])
+        user_ids = [u["user_id"] for u in users]
+
+        count, elapsed, _ = stream(tasks, sections_by_project, user_ids, rng)
+        _, _, peak = stream(tasks, sections_by_project, user_ids, rng, trace=True)
+        print(f"{len(tasks):,} tasks -> {count:,} stories in {elapsed:.1f}s ({count / elapsed:,.0f} stories/s)"
+              f"   peak {peak / 2**20:.0f} MiB while streaming (tasks Table {tasks.nbytes / 2**20:.0f} MiB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare columnar Tables with list[dict] rows for generated tasks: memory and insert throughput.
+
+Generates tasks for synthetic projects at the default scale (~33k tasks) and
+10x, then measures the memory retained by the Table and by the equivalent
+dict rows (as generators used to return), and how fast each inserts into an
+in-memory SQLite database via Database.write_rows.
+
+Usage: python benchmarks/bench_table.py [scale ...]
+"""
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np
+from config import DEPT_DISTRIBUTION
+from database import Database
+from generators.tasks import generate_tasks
+
+def make_inputs(scale: int, rng: np.random.Generator) -> tuple[list[dict], list[dict], list[dict]]:
+    """Synthetic users/projects/sections sized like the default config times scale"""
+    departments = list(DEPT_DISTRIBUTION)
+    users = [{"user_id": f"user-{i:07d}", "department": departments[i % len(departments)]}
+             for i in range(7_500 * scale)]
+    projects, sections = [], []
+    for i in range(550 * scale):
+        project_id = f"project-{i:06d}"
+        projects.append({
+            "project_id": project_id, "name": f"Project {i}", "project_type": "sprint",
+            "owner_id": users[int(rng.integers(len(users)))]["user_id"],
+            "created_at": str(np.datetime64("2024-01-01") + np.timedelta64(int(rng.integers(0, 600)), "D")),
+        })
+        sections += [{"section_id": f"{project_id}-s{k}", "project_id": project_id} for k in range(4)]
+    return users, projects, sections
+
+def traced(fn):
+    """Run fn, returning (result, bytes still allocated by it, seconds)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained, elapsed
+
+def insert_rate(insert, rows) -> float:
+    db = Database(":memory:")
+    db.connect()
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.initialize_schema(str(ROOT / "schema.sql"))
+        start = time.perf_counter()
+        with db.conn:
+            insert(db, rows)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return len(rows) / elapsed
+
+def main():
+    scales = [int(a) for a in sys.argv[1:]] or [1, 10]
+    rng = np.random.default_rng(7)
+    for scale in scales:
+        users, projects, sections = make_inputs(scale, rng)
+        with contextlib.redirect_stdout(io.StringIO()):
+            table, table_bytes, gen_time = traced(lambda: generate_tasks(projects, sections, users, use_llm=False))
+        rows, row_bytes, _ = traced(
+            lambda: [dict(zip(table.names, values)) for values in zip(*(table.column(c) for c in table.names))]
+        )
+
+        n = len(table)
+        print(f"{n:,} tasks (generated in {gen_time:.2f}s)")
+        print(f"   memory   Table {table_bytes / 2**20:8.1f} MiB ({table_bytes / n:5.0f} B/row)"
+              f"   dict rows {row_bytes / 2**20:8.1f} MiB ({row_bytes / n:5.0f} B/row)")
+        table_rate = insert_rate(lambda db, t: db.write_rows("tasks", t), table)
+        rows_rate = insert_rate(lambda db, r: db.write_rows("tasks", r), rows)
+        print(f"   insert   Table {table_rate:12,.0f} rows/s"
+              f"         dict rows {rows_rate:12,.0f} rows/s")
+        print()
+
+if __name__ == "__main__":
+    main()
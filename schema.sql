@@ -67,6 +67,27 @@ CREATE TABLE projects (
     FOREIGN KEY (owner_id) REFERENCES users(user_id)
 );
 
+-- Project members (cross-functional projects include people from other teams)
+CREATE TABLE project_memberships (
+    project_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    role TEXT CHECK(role IN ('admin', 'editor', 'commenter', 'viewer')) DEFAULT 'editor',
+    added_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (project_id, user_id),
+    FOREIGN KEY (project_id) REFERENCES projects(project_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+) WITHOUT ROWID;
+
+-- Users following a project's activity
+CREATE TABLE project_followers (
+    project_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    followed_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (project_id, user_id),
+    FOREIGN KEY (project_id) REFERENCES projects(project_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+) WITHOUT ROWID;
+
 -- Sections (columns within projects)
 CREATE TABLE sections (
     section_id TEXT PRIMARY KEY,
@@ -82,6 +103,7 @@ CREATE TABLE tasks (
     task_id TEXT PRIMARY KEY,
     project_id TEXT NOT NULL,
     section_id TEXT,
+    position TEXT, -- Fractional-index key: board order within the section (see src/utils/positions.py)
     parent_task_id TEXT, -- NULL for top-level tasks, non-NULL for subtasks
     name TEXT NOT NULL,
     description TEXT,
@@ -110,11 +132,37 @@ CREATE TABLE comments (
     comment_id TEXT PRIMARY KEY,
     task_id TEXT NOT NULL,
     user_id TEXT NOT NULL,
+    parent_comment_id TEXT, -- NULL for top-level comments, non-NULL for replies
     comment_text TEXT NOT NULL,
     comment_type TEXT CHECK(comment_type IN ('comment', 'system')) DEFAULT 'comment',
     created_at TIMESTAMP NOT NULL,
     FOREIGN KEY (task_id) REFERENCES tasks(task_id),
-    FOREIGN KEY (user_id) REFERENCES users(user_id)
+    FOREIGN KEY (user_id) REFERENCES users(user_id),
+    FOREIGN KEY (parent_comment_id) REFERENCES comments(comment_id)
+);
+
+-- Task dependencies: task_id is blocked by depends_on_id, always a task created before it
+-- (by created_at, then task_id), so the links form a DAG (see src/generators/dependencies.py)
+CREATE TABLE task_dependencies (
+    task_id TEXT NOT NULL,
+    depends_on_id TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (task_id, depends_on_id),
+    FOREIGN KEY (task_id) REFERENCES tasks(task_id),
+    FOREIGN KEY (depends_on_id) REFERENCES tasks(task_id)
+) WITHOUT ROWID;
+
+-- Activity log: one story per task state change (see src/generators/stories.py)
+CREATE TABLE stories (
+    story_id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    actor_id TEXT, -- NULL when nobody in particular made the change
+    story_type TEXT CHECK(story_type IN ('created', 'assigned', 'section_changed', 'due_date_changed', 'completed')) NOT NULL,
+    old_value TEXT, -- Previous assignee / section / due date
+    new_value TEXT, -- New assignee / section / due date (starting section for 'created')
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY (task_id) REFERENCES tasks(task_id),
+    FOREIGN KEY (actor_id) REFERENCES users(user_id)
 );
 
 -- Custom Field Definitions
@@ -174,11 +222,80 @@ CREATE TABLE attachments (
     FOREIGN KEY (uploaded_by) REFERENCES users(user_id)
 );
 
+-- Workspace metadata (e.g. the simulated "now" the data was generated up to)
+CREATE TABLE workspace_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Materialized task summaries (maintained by triggers, see src/aggregates.py)
+CREATE TABLE user_task_summary (
+    user_id TEXT PRIMARY KEY,
+    open_tasks INTEGER NOT NULL DEFAULT 0,
+    completed_tasks INTEGER NOT NULL DEFAULT 0,
+    overdue_tasks INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
+CREATE TABLE project_task_summary (
+    project_id TEXT PRIMARY KEY,
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    completed_tasks INTEGER NOT NULL DEFAULT 0,
+    overdue_tasks INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (project_id) REFERENCES projects(project_id)
+);
+
+CREATE TABLE section_task_summary (
+    section_id TEXT PRIMARY KEY,
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    completed_tasks INTEGER NOT NULL DEFAULT 0,
+    overdue_tasks INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (section_id) REFERENCES sections(section_id)
+);
+
+CREATE TABLE team_task_summary (
+    team_id TEXT PRIMARY KEY,
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    completed_tasks INTEGER NOT NULL DEFAULT 0,
+    overdue_tasks INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (team_id) REFERENCES teams(team_id)
+);
+
+-- Critical paths over task_dependencies, one row per linked task (see src/dependencies.py)
+CREATE TABLE task_dependency_summary (
+    task_id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    num_blockers INTEGER NOT NULL DEFAULT 0,
+    num_dependents INTEGER NOT NULL DEFAULT 0,
+    depth INTEGER NOT NULL DEFAULT 0,          -- Links on the longest same-project chain of blockers ending here
+    critical_blocker_id TEXT,                  -- The blocker that chain runs through
+    FOREIGN KEY (task_id) REFERENCES tasks(task_id),
+    FOREIGN KEY (project_id) REFERENCES projects(project_id),
+    FOREIGN KEY (critical_blocker_id) REFERENCES tasks(task_id)
+);
+
 -- Indexes for common queries
 CREATE INDEX idx_users_org ON users(org_id);
 CREATE INDEX idx_teams_org ON teams(org_id);
-CREATE INDEX idx_projects_team ON projects(team_id);
+CREATE INDEX idx_projects_team ON projects(team_id, privacy);
 CREATE INDEX idx_tasks_project ON tasks(project_id);
 CREATE INDEX idx_tasks_assignee ON tasks(assignee_id);
 CREATE INDEX idx_tasks_due_date ON tasks(due_date);
-CREATE INDEX idx_comments_task ON comments(task_id);
\ No newline at end of file
+CREATE INDEX idx_comments_task ON comments(task_id);
+CREATE INDEX idx_stories_task ON stories(task_id, created_at);
+-- "What does this task block" (the primary key serves "what blocks this task")
+CREATE INDEX idx_task_dependencies_blocker ON task_dependencies(depends_on_id, task_id);
+-- "Longest chain in project": the deepest task of a project, then its critical_blocker_id chain
+CREATE INDEX idx_task_dependency_summary_project ON task_dependency_summary(project_id, depth);
+CREATE INDEX idx_attachments_task ON attachments(task_id);
+CREATE INDEX idx_projects_status ON projects(status);
+CREATE INDEX idx_sections_project ON sections(project_id);
+-- Board order: a section's task ids in position order straight off the index, and a move's neighbours
+CREATE INDEX idx_tasks_section_position ON tasks(section_id, position, task_id);
+-- Membership lookups from the user side ("my teams", "projects visible to me"); the
+-- (team, user) / (project, user) keys already serve "members of" queries
+CREATE INDEX idx_team_memberships_user ON team_memberships(user_id, team_id);
+CREATE INDEX idx_project_memberships_user ON project_memberships(user_id, project_id);
+CREATE INDEX idx_project_followers_user ON project_followers(user_id, project_id);
+-- Open work only: lets delta generation read open tasks without scanning closed ones
+CREATE INDEX idx_tasks_open ON tasks(project_id, task_id, assignee_id, created_at) WHERE completed = 0;
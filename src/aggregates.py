@@ -0,0 +1,150 @@
+"""Materialized task summaries for dashboard-style lookups.
+
+The *_task_summary tables (see schema.sql) hold per-user, per-project,
+per-section and per-team task counts so questions like "open tasks for this
+assignee" or "completion rate of this project" are a primary-key lookup
+instead of a GROUP BY over tasks.
+
+They are built in one pass over tasks after the bulk load (`build_aggregates`)
+and then kept current by triggers (`install_triggers`), which also maintain
+tasks.num_comments / tasks.num_subtasks. Overdue counts are relative to the
+simulation date in workspace_meta and are shifted when a delta advances it.
+"""
+import sqlite3
+
+SUMMARY_TABLES = ["user_task_summary", "project_task_summary", "section_task_summary", "team_task_summary"]
+
+# Today's date in the simulation, as used for "overdue"
+_TODAY_SQL = "(SELECT date(value) FROM workspace_meta WHERE key = 'simulation_current_date')"
+
+def _overdue_sql(row: str) -> str:
+    return f"IFNULL({row}.completed = 0 AND {row}.due_date < {_TODAY_SQL}, 0)"
+
+def _apply_task(row: str, sign: int) -> str:
+    """Statements adding (sign=1) or removing (sign=-1) one task's contribution"""
+    total = sign
+    completed = f"{sign} * ({row}.completed = 1)"
+    open_ = f"{sign} * ({row}.completed = 0)"
+    overdue = f"{sign} * {_overdue_sql(row)}"
+    upsert = """ON CONFLICT({key}) DO UPDATE SET
+            total_tasks = total_tasks + excluded.total_tasks,
+            completed_tasks = completed_tasks + excluded.completed_tasks,
+            overdue_tasks = overdue_tasks + excluded.overdue_tasks;"""
+    return f"""
+        INSERT INTO project_task_summary (project_id, total_tasks, completed_tasks, overdue_tasks)
+        SELECT {row}.project_id, {total}, {completed}, {overdue} WHERE 1
+        {upsert.format(key="project_id")}
+        INSERT INTO section_task_summary (section_id, total_tasks, completed_tasks, overdue_tasks)
+        SELECT {row}.section_id, {total}, {completed}, {overdue} WHERE {row}.section_id IS NOT NULL
+        {upsert.format(key="section_id")}
+        INSERT INTO team_task_summary (team_id, total_tasks, completed_tasks, overdue_tasks)
+        SELECT p.team_id, {total}, {completed}, {overdue} FROM projects p WHERE p.project_id = {row}.project_id
+        {upsert.format(key="team_id")}
+        INSERT INTO user_task_summary (user_id, open_tasks, completed_tasks, overdue_tasks)
+        SELECT {row}.assignee_id, {open_}, {completed}, {overdue} WHERE {row}.assignee_id IS NOT NULL
+        ON CONFLICT(user_id) DO UPDATE SET
+            open_tasks = open_tasks + excluded.open_tasks,
+            completed_tasks = completed_tasks + excluded.completed_tasks,
+            overdue_tasks = overdue_tasks + excluded.overdue_tasks;"""
+
+def _shift_overdue(table: str, key: str, group_sql: str, join_sql: str = "") -> str:
+    """Count open tasks that became overdue between the old and new simulation date"""
+    return f"""
+        UPDATE {table} SET overdue_tasks = overdue_tasks + d.n
+        FROM (
+            SELECT {group_sql} AS id, COUNT(*) AS n FROM tasks t {join_sql}
+            WHERE t.completed = 0 AND t.due_date >= date(OLD.value) AND t.due_date < date(NEW.value)
+            GROUP BY 1
+        ) AS d
+        WHERE {table}.{key} = d.id;"""
+
+TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS tasks_summary_insert AFTER INSERT ON tasks
+BEGIN
+    {_apply_task("NEW", 1)}
+    UPDATE tasks SET num_subtasks = num_subtasks + 1 WHERE task_id = NEW.parent_task_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_summary_delete AFTER DELETE ON tasks
+BEGIN
+    {_apply_task("OLD", -1)}
+    UPDATE tasks SET num_subtasks = num_subtasks - 1 WHERE task_id = OLD.parent_task_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_summary_update
+AFTER UPDATE OF project_id, section_id, assignee_id, completed, due_date ON tasks
+BEGIN
+    {_apply_task("OLD", -1)}
+    {_apply_task("NEW", 1)}
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_parent_update AFTER UPDATE OF parent_task_id ON tasks
+BEGIN
+    UPDATE tasks SET num_subtasks = num_subtasks - 1 WHERE task_id = OLD.parent_task_id;
+    UPDATE tasks SET num_subtasks = num_subtasks + 1 WHERE task_id = NEW.parent_task_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS comments_count_insert AFTER INSERT ON comments
+BEGIN
+    UPDATE tasks SET num_comments = num_comments + 1 WHERE task_id = NEW.task_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS comments_count_delete AFTER DELETE ON comments
+BEGIN
+    UPDATE tasks SET num_comments = num_comments - 1 WHERE task_id = OLD.task_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS meta_date_advance AFTER UPDATE OF value ON workspace_meta
+WHEN NEW.key = 'simulation_current_date' AND date(NEW.value) > date(OLD.value)
+BEGIN
+    {_shift_overdue("project_task_summary", "project_id", "t.project_id")}
+    {_shift_overdue("section_task_summary", "section_id", "t.section_id")}
+    {_shift_overdue("team_task_summary", "team_id", "p.team_id", "JOIN projects p ON p.project_id = t.project_id")}
+    {_shift_overdue("user_task_summary", "user_id", "t.assignee_id")}
+END;
+"""
+
+def build_aggregates(conn: sqlite3.Connection):
+    """(Re)compute every summary and the tasks' comment/subtask counts in one pass over tasks"""
+    conn.executescript(f"""
+        BEGIN;
+        DROP TABLE IF EXISTS temp.task_rollup;
+        CREATE TEMP TABLE task_rollup AS
+        SELECT project_id, section_id, assignee_id,
+               COUNT(*) AS total,
+               SUM(completed = 1) AS completed,
+               SUM(IFNULL(completed = 0 AND due_date < {_TODAY_SQL}, 0)) AS overdue
+        FROM tasks
+        GROUP BY project_id, section_id, assignee_id;
+
+        DELETE FROM project_task_summary;
+        DELETE FROM section_task_summary;
+        DELETE FROM team_task_summary;
+        DELETE FROM user_task_summary;
+
+        INSERT INTO project_task_summary
+        SELECT project_id, SUM(total), SUM(completed), SUM(overdue) FROM task_rollup GROUP BY project_id;
+        INSERT INTO section_task_summary
+        SELECT section_id, SUM(total), SUM(completed), SUM(overdue) FROM task_rollup
+        WHERE section_id IS NOT NULL GROUP BY section_id;
+        INSERT INTO team_task_summary
+        SELECT p.team_id, SUM(r.total), SUM(r.completed), SUM(r.overdue)
+        FROM task_rollup r JOIN projects p ON p.project_id = r.project_id GROUP BY p.team_id;
+        INSERT INTO user_task_summary
+        SELECT assignee_id, SUM(total - completed), SUM(completed), SUM(overdue) FROM task_rollup
+        WHERE assignee_id IS NOT NULL GROUP BY assignee_id;
+        DROP TABLE temp.task_rollup;
+
+        UPDATE tasks SET num_comments = c.n
+        FROM (SELECT task_id, COUNT(*) AS n FROM comments GROUP BY task_id) AS c
+        WHERE tasks.task_id = c.task_id;
+        UPDATE tasks SET num_subtasks = s.n
+        FROM (SELECT parent_task_id, COUNT(*) AS n FROM tasks WHERE parent_task_id IS NOT NULL GROUP BY parent_task_id) AS s
+        WHERE tasks.task_id = s.parent_task_id;
+        COMMIT;
+    """)
+
+def install_triggers(conn: sqlite3.Connection):
+    """Keep summaries and task counters current on every later write"""
+    conn.executescript(TRIGGERS)
+    conn.commit()
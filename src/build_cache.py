@@ -0,0 +1,173 @@
+"""Content-addressed cache of generation stage outputs and finished databases.
+
+Every stage (organization, teams, users, projects, tasks, comments) gets a
+key hashing everything its output depends on: the seed, whether the LLM is
+used, the source of the modules that produce it (plus the bundled name
+tables), the values of the config.py settings those modules import, and the
+key of the stage before it. The finished database's key adds schema.sql, the
+database, activity-log and post-processing modules and their settings. Changing a task setting
+therefore re-runs tasks and comments but reuses cached users and teams.
+
+Artifacts are pickled stage outputs or database files, compressed with zstd
+when the optional `zstandard` package is installed (gzip otherwise), stored
+as <key>.<ext> under CACHE_DIR. Reads refresh an artifact's mtime and writes
+evict the least recently used artifacts beyond CACHE_MAX_BYTES.
+"""
+import ast
+import gzip
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+import config
+from config import CACHE_DIR, CACHE_MAX_BYTES
+
+SRC = Path(__file__).parent
+
+# Sources shared by every stage
+COMMON_SOURCES = ["utils/id_generator.py", "utils/date_utils.py", "utils/seed.py", "utils/table.py"]
+LLM_SOURCES = ["utils/llm_utils.py", "utils/text_pool.py"]
+
+# Stage -> modules (relative to src/) whose code determines its output, in build order
+STAGE_SOURCES = {
+    "organization": ["generators/organizations.py", "scrapers/companies.py", "scrapers/frequency_table.py",
+                     "scrapers/data"],
+    "teams": ["generators/teams.py"],
+    "users": ["generators/users.py", "scrapers/names.py", "scrapers/frequency_table.py", "scrapers/data"],
+    "projects": ["generators/projects.py", "utils/dedup.py"] + LLM_SOURCES,
+    "tasks": ["generators/tasks.py", "utils/collaboration.py", "utils/positions.py", "utils/dedup.py"] + LLM_SOURCES,
+    "comments": ["generators/comments.py", "utils/collaboration.py", "utils/dedup.py"] + LLM_SOURCES,
+}
+
+# Sources of the finished database beyond its stages
+DATABASE_SOURCES = ["../schema.sql", "database.py", "writer.py", "aggregates.py", "search.py", "dependencies.py",
+                    "generators/stories.py", "generators/dependencies.py", "main.py"]
+
+# Settings that never change generated content (the seed is keyed explicitly)
+UNKEYED_SETTINGS = {"OPENAI_API_KEY", "DB_PATH", "SEED", "BUILD_CACHE", "CACHE_DIR", "CACHE_MAX_BYTES"}
+
+def _codecs() -> dict:
+    """Available compressors: extension -> (compress, decompress), preferred first"""
+    codecs = {}
+    try:
+        import zstandard
+        codecs["zst"] = (zstandard.ZstdCompressor(level=10).compress, zstandard.ZstdDecompressor().decompress)
+    except ImportError:
+        pass
+    codecs["gz"] = (lambda data: gzip.compress(data, compresslevel=6), gzip.decompress)
+    return codecs
+
+def _expand(sources: list[str]) -> list[Path]:
+    """Source paths (files or directories) -> sorted files"""
+    files = []
+    for source in sources:
+        path = (SRC / source).resolve()
+        if path.is_dir():
+            files += sorted(p for p in path.rglob("*") if p.is_file() and "__pycache__" not in p.parts)
+        elif path.exists():
+            files.append(path)
+    return files
+
+def _config_names(files: list[Path]) -> set[str]:
+    """Names the given Python files import from config"""
+    names = set()
+    for path in files:
+        if path.suffix != ".py":
+            continue
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.ImportFrom) and node.module == "config":
+                names.update(alias.name for alias in node.names)
+    return names - UNKEYED_SETTINGS
+
+def compute_key(name: str, sources: list[str], upstream: str | None = None, **inputs) -> str:
+    """Hash of a stage's code, the config settings it imports, its upstream key and other inputs"""
+    files = _expand(COMMON_SOURCES + sources)
+    settings = {n: repr(getattr(config, n)) for n in sorted(_config_names(files))}
+    h = hashlib.sha256(json.dumps(
+        {"stage": name, "upstream": upstream, "config": settings, "inputs": inputs}, sort_keys=True, default=repr
+    ).encode())
+    for path in files:
+        h.update(path.relative_to(SRC.parent).as_posix().encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()[:32]
+
+def stage_keys(seed: int, use_llm: bool) -> dict[str, str]:
+    """Key of every stage, each chained to the one before it"""
+    keys, upstream = {}, None
+    for stage, sources in STAGE_SOURCES.items():
+        inputs = {"seed": seed}
+        if LLM_SOURCES[0] in sources:
+            inputs["use_llm"] = use_llm
+        upstream = keys[stage] = compute_key(stage, sources, upstream, **inputs)
+    return keys
+
+def database_key(keys: dict[str, str]) -> str:
+    return compute_key("database", DATABASE_SOURCES, keys["comments"])
+
+class BuildCache:
+    """Compressed artifacts by key, with least-recently-used eviction"""
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.codecs = _codecs()
+
+    def _find(self, key: str) -> tuple[Path, str] | None:
+        for ext in self.codecs:
+            path = self.root / f"{key}.{ext}"
+            if path.exists():
+                return path, ext
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    def load(self, key: str) -> bytes | None:
+        """Artifact bytes for key, or None on a miss"""
+        found = self._find(key)
+        if found is None:
+            return None
+        path, ext = found
+        os.utime(path)  # Mark as recently used
+        return self.codecs[ext][1](path.read_bytes())
+
+    def store(self, key: str, data: bytes):
+        ext, (compress, _) = next(iter(self.codecs.items()))
+        path = self.root / f"{key}.{ext}"
+        tmp = path.with_suffix(f".{ext}.tmp")
+        tmp.write_bytes(compress(data))
+        tmp.replace(path)
+        self.evict(keep=path)
+
+    def load_object(self, key: str):
+        data = self.load(key)
+        return None if data is None else pickle.loads(data)
+
+    def store_object(self, key: str, obj):
+        self.store(key, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def restore_file(self, key: str, dest: str) -> bool:
+        """Write the cached file for key to dest; False on a miss"""
+        data = self.load(key)
+        if data is None:
+            return False
+        Path(dest).parent.mkdir(parents=True, exist_ok=True)
+        Path(dest).write_bytes(data)
+        return True
+
+    def store_file(self, key: str, src: str):
+        self.store(key, Path(src).read_bytes())
+
+    def evict(self, keep: Path | None = None):
+        """Delete least recently used artifacts until the cache fits in max_bytes"""
+        artifacts = sorted((p for p in self.root.iterdir() if p.is_file()), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in artifacts)
+        for path in artifacts:
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                total -= path.stat().st_size
+                path.unlink()
@@ -0,0 +1,199 @@
+"""Compact copy of a generated workspace with repeated text dictionary-encoded.
+
+Low-cardinality and templated TEXT columns (COMPACT_COLUMNS: priorities,
+departments, job titles, project types/statuses/colors, comment and story
+types, template task descriptions and comments) are stored as small
+integer codes into one lookup table per column, `lookup_<table>_<column>`
+(code INTEGER PRIMARY KEY, value), with the most frequent values on the
+smallest codes (0 takes no space in a record, codes up to 127 one byte).
+Values that occur only once stay inline, so a mostly unique column such as
+comment_text costs no more than before.
+
+An encoded table's rows live in `<table>_data`, where each encoded column
+`c` becomes `c` (inline values, NULL when coded) plus `c_code`, and a view
+named after the original table decodes them, so queries (validate.py,
+validation_queries.sql) run unchanged. Each encoded column is decoded by a
+scalar subquery (a primary-key lookup in its small, cached lookup table),
+which SQLite only evaluates for queries that read the column; joins would
+be kept even when unused in aggregate queries. Row ids are kept.
+
+The views also expose each code as `<column>_code`. Indexes on encoded
+columns are rebuilt on the codes, and indexed columns get a code for every
+value, so a filter on the code (`status_code = (SELECT code FROM
+lookup_projects_status WHERE value = 'on_hold')`) is an index search, and a
+dashboard grouping on `<column>_code` decodes once per group instead of
+once per row.
+
+The compact database is a read-only artifact: no triggers or search index.
+Deltas and extraction work on the plain database.
+
+Usage: python src/compact.py [--db PATH] [--out PATH]
+"""
+import argparse
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DB_PATH, COMPACT_DB_PATH
+
+SCHEMA_PATH = Path(__file__).parent.parent / "schema.sql"
+
+COMPACT_COLUMNS = {
+    "users": ["job_title", "department"],
+    "projects": ["project_type", "status", "color"],
+    "tasks": ["description", "priority"],
+    "comments": ["comment_text", "comment_type"],
+    "stories": ["story_type", "old_value", "new_value"],
+}
+MIN_REPEATS = 2  # Values seen fewer times stay inline
+
+def split_statements(sql: str) -> list[str]:
+    """Complete statements of a script, in order"""
+    statements, current = [], ""
+    for line in sql.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    return statements
+
+def compact_schema(schema: str, columns: dict[str, list[str]]) -> tuple[list[str], list[str], dict[str, set[str]]]:
+    """schema.sql rewritten for encoded tables: (CREATE TABLE statements, CREATE INDEX statements,
+    encoded columns that are indexed, per table)"""
+    rename = re.compile(r"\b(REFERENCES|TABLE|ON)\s+(" + "|".join(map(re.escape, columns)) + r")\s*\(") \
+        if columns else None
+    tables, indexes, indexed = [], [], {}
+    for statement in split_statements(schema):
+        body = re.sub(r"^(\s*--[^\n]*\n)+", "", statement)
+        if rename is not None:
+            body = rename.sub(lambda m: f"{m[1]} {m[2]}_data(" if m[1] != "TABLE" else f"TABLE {m[2]}_data (", body)
+        if body.startswith("CREATE TABLE"):
+            table = re.match(r"CREATE TABLE (\w+?)(?:_data)? \(", body)[1]
+            for column in columns.get(table, []):
+                # One column per line in schema.sql: its definition becomes the inline value plus the code
+                body = re.sub(
+                    rf"^(\s*){column} [^\n]*?(,?)(\s*--[^\n]*)?$",
+                    rf"\g<1>{column} TEXT,\n\g<1>{column}_code INTEGER REFERENCES lookup_{table}_{column}(code)\2",
+                    body, count=1, flags=re.M,
+                )
+            tables.append(body)
+        elif body.startswith("CREATE INDEX"):
+            table, keys = re.match(r"CREATE INDEX \w+ ON (\w+?)(?:_data)?\(([^)]*)\)", body).groups()
+            # Encoded columns are indexed on their codes
+            encoded = [k.strip() for k in keys.split(",") if k.strip() in columns.get(table, [])]
+            for column in encoded:
+                body = re.sub(rf"([(,]\s*){column}(\s*[,)])", rf"\g<1>{column}_code\2", body, count=1)
+            indexed.setdefault(table, set()).update(encoded)
+            indexes.append(body)
+    return tables, indexes, indexed
+
+def _columns(conn: sqlite3.Connection, schema: str, table: str) -> list[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+def _has_rowid(conn: sqlite3.Connection, schema: str, table: str) -> bool:
+    try:
+        conn.execute(f"SELECT rowid FROM {schema}.{table} LIMIT 0")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def _encode_table(conn: sqlite3.Connection, table: str, encoded: list[str], full: set[str]) -> list[str]:
+    """Fill the lookups and <table>_data from src.<table>; returns the view's select list
+
+    Columns in full get a code for every value, so a filter on the code finds every row.
+    """
+    source = _columns(conn, "src", table)
+    target = set(_columns(conn, "main", f"{table}_data"))
+    select, insert, joins = [], [], []
+    for i, column in enumerate(source):
+        if column not in target:
+            continue
+        if column not in encoded:
+            select.append(f"s.{column}")
+            insert.append(column)
+            continue
+        lookup = f"lookup_{table}_{column}"
+        conn.execute(f"""
+            INSERT INTO {lookup} (code, value)
+            SELECT ROW_NUMBER() OVER (ORDER BY COUNT(*) DESC, {column}) - 1, {column}
+            FROM src.{table} WHERE {column} IS NOT NULL
+            GROUP BY {column} HAVING COUNT(*) >= {1 if column in full else MIN_REPEATS}
+        """)
+        conn.execute(f"CREATE TEMP TABLE map_{i} (value TEXT PRIMARY KEY, code INTEGER) WITHOUT ROWID")
+        conn.execute(f"INSERT INTO map_{i} SELECT value, code FROM {lookup}")
+        joins.append(f"LEFT JOIN temp.map_{i} m{i} ON m{i}.value = s.{column}")
+        select += [f"CASE WHEN m{i}.code IS NULL THEN s.{column} END", f"m{i}.code"]
+        insert += [column, f"{column}_code"]
+    conn.execute(f"""
+        INSERT INTO main.{table}_data (rowid, {', '.join(insert)})
+        SELECT s.rowid, {', '.join(select)} FROM src.{table} s {' '.join(joins)}
+    """)
+    for i in range(len(source)):
+        conn.execute(f"DROP TABLE IF EXISTS temp.map_{i}")
+    return [
+        f"COALESCE((SELECT value FROM lookup_{table}_{column} WHERE code = d.{column}_code), d.{column}) AS {column}"
+        if column in encoded else f"d.{column}"
+        for column in source if column in target
+    ] + [f"d.{column}_code" for column in encoded]
+
+def compact(source: str, out: str, columns: dict[str, list[str]] = COMPACT_COLUMNS) -> dict:
+    """Write the compact copy of database source to out; returns row counts (columns={} gives a plain copy)"""
+    out_path = Path(out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(out)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("ATTACH DATABASE ? AS src", (source,))
+    tables, indexes, indexed = compact_schema(SCHEMA_PATH.read_text(), columns)
+    counts = {}
+    with conn:
+        for table, encoded in columns.items():
+            for column in encoded:
+                conn.execute(f"CREATE TABLE lookup_{table}_{column} (code INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE)")
+        for statement in tables:
+            conn.execute(statement)
+        for statement in tables:
+            name = re.match(r"CREATE TABLE (\w+)", statement)[1]
+            table = name.removesuffix("_data") if name.endswith("_data") and name[:-5] in columns else name
+            if not _columns(conn, "src", table):
+                continue
+            if table in columns:
+                select = _encode_table(conn, table, columns[table], indexed.get(table, set()))
+                conn.execute(f"CREATE VIEW {table} AS SELECT {', '.join(select)} FROM {table}_data d")
+            else:
+                names = set(_columns(conn, "src", table))
+                shared = ", ".join(c for c in _columns(conn, "main", table) if c in names)
+                rowid = "rowid, " if _has_rowid(conn, "main", table) else ""
+                conn.execute(f"INSERT INTO main.{table} ({rowid}{shared}) SELECT {rowid}{shared} FROM src.{table}")
+            counts[table] = conn.execute(f"SELECT COUNT(*) FROM main.{table}").fetchone()[0]
+        for statement in indexes:
+            conn.execute(statement)
+        conn.execute("INSERT OR REPLACE INTO workspace_meta (key, value) VALUES ('schema_layout', 'compact')")
+    conn.execute("DETACH DATABASE src")
+    conn.execute("ANALYZE")
+    conn.close()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a dictionary-encoded compact copy of a generated database")
+    parser.add_argument("--db", default=DB_PATH, help="Generated database")
+    parser.add_argument("--out", default=COMPACT_DB_PATH, help="Compact database to write (replaced if present)")
+    args = parser.parse_args()
+
+    print(f"🗜️  Compacting {args.db} into {args.out}...")
+    start = time.perf_counter()
+    counts = compact(args.db, args.out)
+    elapsed = time.perf_counter() - start
+    for table, encoded in COMPACT_COLUMNS.items():
+        if table in counts:
+            print(f"   ✓ {table}: {counts[table]} rows, encoded {', '.join(encoded)}")
+    before, after = Path(args.db).stat().st_size, Path(args.out).stat().st_size
+    print(f"   Done in {elapsed:.2f}s ({before / 2**20:.1f} MiB -> {after / 2**20:.1f} MiB)")
+
+if __name__ == "__main__":
+    main()
@@ -27,4 +27,61 @@ DEPT_DISTRIBUTION = {
     "Sales & Marketing": 0.28,
     "Operations": 0.18,
     "Product & Design": 0.12
-}
\ No newline at end of file
+}
+
+# LLM pooling: request many candidates per call instead of one string per call
+LLM_POOL_MODE = True
+LLM_POOL_BATCH_SIZE = 25  # Candidates requested per pooled LLM call
+LLM_POOL_LOW_WATERMARK = 5  # Refill a pool in the background below this size
+LLM_POOL_WORKERS = 4  # Concurrent background refills
+
+# Validation: allowed absolute drift of realized shares from generator targets
+VALIDATION_TOLERANCE = 0.03
+
+# Delta ("next day") generation against an existing database
+DELTA_TASKS_PER_PROJECT_PER_DAY = 0.05  # New tasks per active project per simulated day
+DELTA_BACKLOG_DAILY_COMPLETION = 0.002  # Daily completion chance for tasks open > 30 days
+
+# Full-text search: build FTS5 indexes over task/project/comment text after generation
+SEARCH_INDEX = True
+
+# Reproducible builds and the content-addressed build cache (see src/build_cache.py)
+SEED = 42  # None for an unseeded (non-reproducible, uncached) run
+BUILD_CACHE = True
+CACHE_DIR = "output/cache"
+CACHE_MAX_BYTES = 2 * 1024**3  # Least recently used artifacts are evicted beyond this
+
+# Near-duplicate control for generated text (see src/utils/dedup.py)
+DEDUP_TEXT = True
+DEDUP_MAX_ATTEMPTS = 3  # Regenerations of a near-duplicate before it is kept anyway
+DEDUP_CAPACITY = 500_000  # Texts remembered per filter before it rotates (bounds memory)
+
+# Activity log (stories): tasks whose stories are generated and inserted at a time
+STORY_CHUNK_TASKS = 50_000
+
+# Pipelined writes: generators queue row chunks for a background writer thread (see src/writer.py)
+WRITER_QUEUE_CHUNKS = 8  # Chunks buffered before generators block (backpressure)
+WRITER_CHUNK_ROWS = 50_000  # Rows per queued chunk
+WRITER_TRANSACTION_ROWS = 500_000  # Rows per commit
+GENERATOR_BATCH_PROJECTS = 128  # Projects per streamed batch of tasks and of their comments
+
+# Memory-mapped workspace snapshots for environment workers (see src/snapshot.py)
+SNAPSHOT_DIR = "output/snapshot"
+
+# Dictionary-encoded compact copy of the database (see src/compact.py)
+COMPACT_DB_PATH = "output/asana_simulation_compact.sqlite"
+
+# Asana-API-shaped JSON export (see src/export.py)
+EXPORT_DIR = "output/api_export"
+EXPORT_FORMAT = "ndjson"  # "ndjson" (one document per line) or "json" ({"data": [...]} per shard)
+EXPORT_SHARD_ROWS = 100_000  # Documents per output file
+EXPORT_BATCH_ROWS = 1_000  # Documents read and nested at a time per worker (bounds memory)
+EXPORT_WORKERS = min(4, os.cpu_count() or 1)  # Shard writer processes
+
+# Collaboration graph: who creates, is assigned and comments on a team's tasks (see src/utils/collaboration.py)
+COLLAB_TEAM_WEIGHT = 1.0  # Edge proximity weights, times the neighbor's activity
+COLLAB_DEPARTMENT_WEIGHT = 0.25
+COLLAB_ORG_WEIGHT = 0.05
+COLLAB_TEAM_NEIGHBORS = 48  # Teammates linked per user (sampled in larger teams)
+COLLAB_DEPARTMENT_NEIGHBORS = 12  # Random colleagues per user elsewhere in their department
+COLLAB_ORG_NEIGHBORS = 3  # Random colleagues per user anywhere in the organization
@@ -6,29 +6,49 @@ class Database:
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self.conn = None
+        self._search_checked = False
     
     def connect(self):
         """Establish database connection"""
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
+        self._search_checked = False
         return self.conn
     
+    def vacuum(self):
+        """VACUUM the database, then rebuild the search index if the rowids it follows were renumbered"""
+        from search import verify_search_index
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+        verify_search_index(self.conn)
+        self._search_checked = True
+    
     def initialize_schema(self, schema_path: str = "schema.sql"):
         """Execute schema SQL file"""
         # Drop existing tables if they exist
+        for fts in ("tasks_fts", "projects_fts", "comments_fts"):
+            self.conn.execute(f"DROP TABLE IF EXISTS {fts}")
+        for summary in ("user_task_summary", "project_task_summary", "section_task_summary", "team_task_summary"):
+            self.conn.execute(f"DROP TABLE IF EXISTS {summary}")
         self.conn.execute("DROP TABLE IF EXISTS task_tags")
         self.conn.execute("DROP TABLE IF EXISTS attachments")
         self.conn.execute("DROP TABLE IF EXISTS custom_field_values")
         self.conn.execute("DROP TABLE IF EXISTS custom_field_definitions")
+        self.conn.execute("DROP TABLE IF EXISTS task_dependency_summary")
+        self.conn.execute("DROP TABLE IF EXISTS task_dependencies")
+        self.conn.execute("DROP TABLE IF EXISTS stories")
         self.conn.execute("DROP TABLE IF EXISTS comments")
         self.conn.execute("DROP TABLE IF EXISTS tasks")
         self.conn.execute("DROP TABLE IF EXISTS sections")
+        self.conn.execute("DROP TABLE IF EXISTS project_followers")
+        self.conn.execute("DROP TABLE IF EXISTS project_memberships")
         self.conn.execute("DROP TABLE IF EXISTS projects")
         self.conn.execute("DROP TABLE IF EXISTS team_memberships")
         self.conn.execute("DROP TABLE IF EXISTS teams")
         self.conn.execute("DROP TABLE IF EXISTS users")
         self.conn.execute("DROP TABLE IF EXISTS tags")
         self.conn.execute("DROP TABLE IF EXISTS organizations")
+        self.conn.execute("DROP TABLE IF EXISTS workspace_meta")
         self.conn.commit()
         
         with open(schema_path, 'r') as f:
@@ -37,20 +57,135 @@ class Database:
         self.conn.commit()
         print("✓ Database schema initialized")
     
-    def insert_batch(self, table:  str, rows: list[dict]):
-        """Insert multiple rows efficiently"""
+    def write_rows(self, table: str, data, chunk_size: int = 50_000) -> int:
+        """Insert dict rows or a `utils.table.Table` without committing or printing; returns the row count"""
+        if len(data) == 0:
+            return 0
+        names = data.names if hasattr(data, "chunks") else list(data[0].keys())
+        query = f"INSERT INTO {table} ({','.join(names)}) VALUES ({','.join(['?' for _ in names])})"
+        if hasattr(data, "chunks"):
+            for chunk in data.chunks(chunk_size):
+                self.conn.executemany(query, zip(*chunk.values()))
+        else:
+            self.conn.executemany(query, (tuple(row[col] for col in names) for row in data))
+        return len(data)
+    
+    def drop_indexes(self, table: str) -> list[tuple[str, str]]:
+        """Drop a table's secondary indexes ahead of a bulk load; returns (name, sql) to recreate them"""
+        indexes = self.conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+        ).fetchall()
+        for name, _ in indexes:
+            self.conn.execute(f"DROP INDEX {name}")
+        return [tuple(index) for index in indexes]
+    
+    def create_indexes(self, indexes: list[tuple[str, str]]):
+        for _, sql in indexes:
+            self.conn.execute(sql)
+    
+    def upsert_batch(self, table: str, rows: list[dict], key_columns: list[str], commit: bool = True):
+        """Insert rows, updating the non-key columns of rows whose key already exists"""
         if not rows:
             return
         
-        columns = rows[0].keys()
+        columns = list(rows[0].keys())
         placeholders = ','.join(['?' for _ in columns])
-        query = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})"
+        updates = ','.join(f"{col}=excluded.{col}" for col in columns if col not in key_columns)
+        conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        query = (f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders}) "
+                 f"ON CONFLICT({','.join(key_columns)}) {conflict}")
         
-        values = [tuple(row[col] for col in columns) for row in rows]
-        self. conn.executemany(query, values)
-        self.conn.commit()
-        print(f"✓ Inserted {len(rows)} rows into {table}")
+        self.conn.executemany(query, (tuple(row[col] for col in columns) for row in rows))
+        if commit:
+            self.conn.commit()
+    
+    def get_meta(self, key: str, default: str | None = None) -> str | None:
+        """Read a workspace_meta value"""
+        row = self.conn.execute("SELECT value FROM workspace_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
     
+    def set_meta(self, key: str, value: str, commit: bool = True):
+        """Write a workspace_meta value"""
+        self.upsert_batch("workspace_meta", [{"key": key, "value": value}], ["key"], commit=commit)
+    
+    def search(self, text: str, kinds: tuple[str, ...] = ("task", "project", "comment"),
+               limit: int = 20, raw: bool = False) -> list[dict]:
+        """Ranked full-text search over task, project and comment text (see search.py).
+
+        The first search on a connection checks that the index still matches
+        the content rowids and rebuilds it if a VACUUM renumbered them.
+        """
+        from search import search, verify_search_index
+        if not self._search_checked:
+            verify_search_index(self.conn)
+            self._search_checked = True
+        return search(self.conn, text, kinds=kinds, limit=limit, raw=raw)
+
+    def section_tasks(self, section_id: str, limit: int | None = None) -> list[dict]:
+        """A section's tasks in board order (walks the (section_id, position) index, no sort)"""
+        rows = self.conn.execute("""
+            SELECT task_id, name, position, assignee_id, due_date, completed FROM tasks
+            WHERE section_id = ? ORDER BY position LIMIT ?
+        """, (section_id, -1 if limit is None else limit))
+        return [dict(row) for row in rows]
+
+    def move_task(self, task_id: str, section_id: str, after_task_id: str | None = None,
+                  commit: bool = True) -> str:
+        """Move a task into section_id right after after_task_id (None = to the top); returns its new position.
+
+        Only the moved task is written: its key is chosen between its new neighbours'.
+        """
+        from utils.positions import key_between
+        if after_task_id is None:
+            before = None
+        else:
+            before = self.conn.execute(
+                "SELECT position FROM tasks WHERE task_id = ? AND section_id = ?", (after_task_id, section_id)
+            ).fetchone()
+            if before is None:
+                raise ValueError(f"Task {after_task_id} is not in section {section_id}")
+            before = before[0]
+        # The next task down, by a seek on the (section_id, position) index
+        bound = "" if before is None else "AND position > ?"
+        after = self.conn.execute(f"""
+            SELECT position FROM tasks WHERE section_id = ? {bound} AND task_id != ?
+            ORDER BY position LIMIT 1
+        """, (section_id, *([] if before is None else [before]), task_id)).fetchone()
+        position = key_between(before, after[0] if after else None)
+        self.conn.execute("UPDATE tasks SET section_id = ?, position = ? WHERE task_id = ?",
+                          (section_id, position, task_id))
+        if commit:
+            self.conn.commit()
+        return position
+
+    def blocking_tasks(self, task_id: str, transitive: bool = True) -> list[dict]:
+        """Tasks blocking a task, directly or through any chain (see dependencies.py)"""
+        from dependencies import blocking_tasks
+        return blocking_tasks(self.conn, task_id, transitive=transitive)
+
+    def longest_chain(self, project_id: str) -> list[str]:
+        """Task ids on a project's longest dependency chain, first blocker first (see dependencies.py)"""
+        from dependencies import longest_chain
+        return longest_chain(self.conn, project_id)
+
+    def visible_projects(self, user_id: str) -> list[str]:
+        """Projects a user can see: public projects of their teams, plus any project they are a member of"""
+        rows = self.conn.execute("""
+            SELECT p.project_id FROM team_memberships m
+            JOIN projects p ON p.team_id = m.team_id AND p.privacy = 'public'
+            WHERE m.user_id = ?
+            UNION
+            SELECT pm.project_id FROM project_memberships pm WHERE pm.user_id = ?
+        """, (user_id, user_id))
+        return [row[0] for row in rows]
+
+    def project_members(self, project_id: str) -> list[dict]:
+        """Members of a project with their roles"""
+        rows = self.conn.execute(
+            "SELECT user_id, role, added_at FROM project_memberships WHERE project_id = ?", (project_id,)
+        )
+        return [dict(row) for row in rows]
+
     def close(self):
         if self.conn:
             self.conn.close()
\ No newline at end of file
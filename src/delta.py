@@ -0,0 +1,267 @@
+"""Append-only "next day" generation against an existing database.
+
+Advances a generated workspace from its recorded simulation date to a new
+one: completes some open tasks, creates new tasks in active projects and adds
+comments and activity-log stories, all timestamped inside the window. Only open tasks, active projects
+(with their sections) and active users are read, each through an index, and
+everything is written in one transaction, so cost tracks the size of the
+delta rather than the database. Every random draw comes from the stage
+seeded with (--seed, window), so a delta is reproducible. Windows end at
+midnight of a date, and the new date is recorded as YYYY-MM-DD, the same
+form main.py writes.
+
+Usage: python src/delta.py [--db PATH] [--days N | --until YYYY-MM-DD] [--seed N]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+from database import Database
+from config import (
+    DB_PATH, SIMULATION_CURRENT_DATE, DELTA_TASKS_PER_PROJECT_PER_DAY, DELTA_BACKLOG_DAILY_COMPLETION, SEED
+)
+from utils.id_generator import generate_ids
+from utils.seed import seed_stage, default_rng
+from utils.date_utils import generate_due_dates, generate_completion_times, cycle_time_cdf, MAX_CYCLE_DAYS
+from utils.collaboration import CollaborationGraph
+from utils.positions import keys_between
+from generators.tasks import (
+    generate_task_name, ASSIGNMENT_RATE, COMPLETION_BASE_RATES, DEFAULT_COMPLETION_RATE, PRIORITIES, PRIORITY_WEIGHTS
+)
+from generators.comments import generate_comments
+from generators.stories import generate_stories, completion_stories
+
+def _days_between(start: np.ndarray, end: np.datetime64) -> np.ndarray:
+    return (end - start).astype("timedelta64[s]").astype(np.float64) / 86400
+
+def load_state(db: Database) -> dict:
+    """Read the slice of the workspace a delta needs, each via an index"""
+    conn = db.conn
+    projects = [dict(r) for r in conn.execute("""
+        SELECT p.project_id, p.team_id, p.owner_id, p.name, p.project_type, u.department
+        FROM projects p LEFT JOIN users u ON u.user_id = p.owner_id
+        WHERE p.status = 'active'
+    """)]
+    sections = {}
+    for section_id, project_id in conn.execute("""
+        SELECT s.section_id, s.project_id FROM sections s
+        JOIN projects p ON p.project_id = s.project_id
+        WHERE p.status = 'active'
+    """):
+        sections.setdefault(project_id, []).append(section_id)
+    users = [dict(r) for r in conn.execute(
+        "SELECT user_id, department FROM users WHERE is_active = 1 ORDER BY rowid"
+    )]
+    memberships = [dict(r) for r in conn.execute("""
+        SELECT m.user_id, m.team_id FROM team_memberships m
+        JOIN users u ON u.user_id = m.user_id
+        WHERE u.is_active = 1
+    """)]
+    open_tasks = [dict(r) for r in conn.execute("""
+        SELECT t.task_id, t.project_id, t.assignee_id, t.created_by, t.created_at, p.project_type
+        FROM tasks t
+        JOIN projects p ON p.project_id = t.project_id
+        WHERE t.completed = 0
+    """)]
+    # Open tasks waiting on an open blocker can't finish yet
+    blocked = set()
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'task_dependencies'").fetchone():
+        blocked = {row[0] for row in conn.execute("""
+            SELECT DISTINCT d.task_id FROM tasks b
+            JOIN task_dependencies d ON d.depends_on_id = b.task_id
+            WHERE b.completed = 0
+        """)}
+    return {"projects": projects, "sections": sections, "users": users, "memberships": memberships,
+            "open_tasks": open_tasks, "blocked": blocked}
+
+def complete_open_tasks(open_tasks: list[dict], start: str, end: str, rng: np.random.Generator) -> list[dict]:
+    """Pick open tasks that finish inside the window.
+
+    Young tasks use the conditional log-normal cycle-time model (probability
+    of finishing in the window given still open at its start); tasks open
+    longer than the cycle-time cap complete at a small backlog rate.
+    """
+    if not open_tasks:
+        return []
+    start64, end64 = np.datetime64(start, "s"), np.datetime64(end, "s")
+    window_days = float(_days_between(np.array([start64]), end64)[0])
+    created = np.array([t["created_at"] for t in open_tasks], dtype="datetime64[us]").astype("datetime64[s]")
+    age = np.maximum(_days_between(created, start64), 0)
+    base = np.array([COMPLETION_BASE_RATES.get(t["project_type"], DEFAULT_COMPLETION_RATE) for t in open_tasks])
+
+    f_now, f_end = cycle_time_cdf(age), cycle_time_cdf(age + window_days)
+    young = age < MAX_CYCLE_DAYS
+    conditional = np.where(young, (f_end - f_now) / np.maximum(1 - f_now, 1e-9), 0.0)
+    backlog = 1 - (1 - DELTA_BACKLOG_DAILY_COMPLETION) ** window_days
+    prob = np.where(young, base * conditional, backlog)
+    done = np.flatnonzero(rng.random(len(open_tasks)) < prob)
+
+    # Completion time uniform over the part of the window the task existed in
+    window_start = np.maximum(created[done], start64)
+    span = (end64 - window_start).astype(np.int64)
+    completed_at = window_start + (rng.random(len(done)) * span).astype("timedelta64[s]")
+    completions = []
+    for i, ts in zip(done.tolist(), np.datetime_as_string(completed_at, unit="s").tolist()):
+        task = dict(open_tasks[i])
+        task.update(completed=True, completed_at=ts, completed_by=task["assignee_id"])
+        completions.append(task)
+    return completions
+
+def create_tasks(state: dict, start: str, end: str, rng: np.random.Generator,
+                 graph: CollaborationGraph) -> list[dict]:
+    """New tasks for active projects, created inside the window (people chosen as in generate_tasks)"""
+    start_dt, end_dt = datetime.fromisoformat(start), datetime.fromisoformat(end)
+    window_days = (end_dt - start_dt).total_seconds() / 86400
+
+    projects = [p for p in state["projects"] if state["sections"].get(p["project_id"])]
+    counts = rng.poisson(DELTA_TASKS_PER_PROJECT_PER_DAY * window_days, size=len(projects))
+    task_ids = iter(generate_ids(int(counts.sum())))
+
+    # Creator from the project's team (else the owner's), assignee among the creator's collaborators
+    team = graph.teams([p["team_id"] for p in projects])
+    owner = graph.rows([p["owner_id"] for p in projects])
+    team = np.where(team >= 0, team, np.where(owner >= 0, graph.home[np.maximum(owner, 0)], -1))
+    creators = graph.sample_members(np.repeat(team, counts), rng)
+    assignees = np.where(rng.random(len(creators)) < ASSIGNMENT_RATE, graph.sample(creators, rng), -1)
+    people = iter(zip(creators.tolist(), assignees.tolist()))
+
+    # Dates, sections and priorities for all new tasks at once, from rng
+    n = len(creators)
+    created = np.datetime64(start_dt.replace(microsecond=0), "s") + \
+        (rng.random(n) * window_days * 86400).astype("timedelta64[s]")
+    completed_at = generate_completion_times(created, rng)
+    base_rate = np.repeat([COMPLETION_BASE_RATES.get(p["project_type"], DEFAULT_COMPLETION_RATE) for p in projects],
+                          counts)
+    completed = (completed_at < np.datetime64(end_dt, "s")) & (rng.random(n) < base_rate)
+    due = generate_due_dates(created, rng)
+    num_sections = np.repeat([len(state["sections"][p["project_id"]]) for p in projects], counts)
+    section = (rng.random(n) * num_sections).astype(np.int64)
+    priority = rng.choice(len(PRIORITIES), size=n, p=PRIORITY_WEIGHTS)
+    rows = iter(zip(
+        np.datetime_as_string(created, unit="s").tolist(), np.datetime_as_string(completed_at, unit="s").tolist(),
+        completed.tolist(), [None if np.isnat(d) else str(d) for d in due], section.tolist(), priority.tolist(),
+    ))
+
+    tasks = []
+    for project, count in zip(projects, counts.tolist()):
+        department = project["department"] or "Engineering"
+        sections = state["sections"][project["project_id"]]
+        for _ in range(count):
+            created_at, completed_ts, completed_now, due_date, section_index, priority_index = next(rows)
+            creator, assignee = next(people)
+            assignee_id = graph.user_ids[assignee] if assignee >= 0 else None
+            tasks.append({
+                "task_id": next(task_ids),
+                "project_id": project["project_id"],
+                "section_id": sections[section_index],
+                "parent_task_id": None,
+                "name": generate_task_name(project["name"], department, use_llm=False),
+                "description": f"Description for {project['name']}",
+                "assignee_id": assignee_id,
+                "due_date": due_date,
+                "start_date": None,
+                "created_at": created_at,
+                "created_by": graph.user_ids[creator],
+                "completed": completed_now,
+                "completed_at": completed_ts if completed_now else None,
+                "completed_by": assignee_id if completed_now else None,
+                "priority": PRIORITIES[priority_index],
+                "num_likes": 0,
+                "num_subtasks": 0,
+                "num_comments": 0
+            })
+    return tasks
+
+def place_tasks(db: Database, tasks: list[dict]):
+    """Give new tasks positions at the bottom of their sections, in creation order"""
+    by_section = {}
+    for task in sorted(tasks, key=lambda t: t["created_at"]):
+        by_section.setdefault(task["section_id"], []).append(task)
+    for section_id, placed in by_section.items():
+        last = db.conn.execute("SELECT MAX(position) FROM tasks WHERE section_id = ?", (section_id,)).fetchone()[0]
+        for task, key in zip(placed, keys_between(last, None, len(placed))):
+            task["position"] = key
+
+def apply_delta(db: Database, until: str, rng: np.random.Generator | None = None) -> dict:
+    """Advance the workspace in db to the date `until` (any time of day is dropped); returns counts of what was written"""
+    rng = rng or default_rng()
+    if db.get_meta("schema_layout") == "compact":
+        raise ValueError("Compact databases are read-only: advance the plain database and compact it again")
+    start = db.get_meta("simulation_current_date", SIMULATION_CURRENT_DATE)
+    start = datetime.fromisoformat(start).isoformat()
+    end_date = datetime.fromisoformat(until).date()
+    end = datetime.combine(end_date, datetime.min.time()).isoformat()
+    if end <= start:
+        raise ValueError(f"Delta must move forward: workspace is at {start}, requested {end}")
+
+    state = load_state(db)
+    graph = CollaborationGraph.build(state["users"], state["memberships"], rng=rng)
+    unblocked = [t for t in state["open_tasks"] if t["task_id"] not in state["blocked"]]
+    completions = complete_open_tasks(unblocked, start, end, rng)
+    new_tasks = create_tasks(state, start, end, rng, graph)
+    place_tasks(db, new_tasks)
+
+    # Comments on everything that saw activity in the window
+    touched = new_tasks + completions
+    comments = generate_comments(touched, state["users"], rng=rng, window=(start, end), graph=graph)
+    user_ids = [u["user_id"] for u in state["users"]]
+    stories = generate_stories(new_tasks, state["sections"], user_ids, rng=rng, now=end)
+    closed = completion_stories(completions)
+
+    with db.conn:
+        db.upsert_batch("tasks", new_tasks, ["task_id"], commit=False)
+        db.conn.executemany(
+            "UPDATE tasks SET completed = 1, completed_at = ?, completed_by = ? WHERE task_id = ? AND completed = 0",
+            [(t["completed_at"], t["completed_by"], t["task_id"]) for t in completions]
+        )
+        # Triggers keep num_comments and the task summaries current
+        db.upsert_batch("comments", comments, ["comment_id"], commit=False)
+        db.upsert_batch("stories", stories, ["story_id"], commit=False)
+        db.upsert_batch("stories", closed, ["story_id"], commit=False)
+        db.set_meta("simulation_current_date", end_date.isoformat(), commit=False)
+
+    return {
+        "window": (start, end),
+        "open_tasks_read": len(state["open_tasks"]),
+        "completed": len(completions),
+        "new_tasks": len(new_tasks),
+        "comments": len(comments),
+        "stories": len(stories) + len(closed),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Append a date window of activity to an existing database")
+    parser.add_argument("--db", default=DB_PATH, help="Generated database to advance")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--days", type=int, default=1, help="Days to advance (default 1)")
+    group.add_argument("--until", help="Advance to this date (YYYY-MM-DD)")
+    parser.add_argument("--seed", type=int, default=SEED, help=f"Random seed (default {SEED})")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    db.connect()
+    current = db.get_meta("simulation_current_date", SIMULATION_CURRENT_DATE)
+    until = args.until or (datetime.fromisoformat(current).date() + timedelta(days=args.days)).isoformat()
+
+    print(f"⏩ Advancing {args.db} from {current} to {until}...")
+    # Seeded per window, so the same delta on the same database is reproducible
+    seed_stage(args.seed, f"delta:{current}:{until}")
+    start = time.perf_counter()
+    result = apply_delta(db, until)
+    elapsed = time.perf_counter() - start
+    db.close()
+
+    print(f"   Read {result['open_tasks_read']} open tasks")
+    print(f"   ✓ Completed {result['completed']} tasks")
+    print(f"   ✓ Created {result['new_tasks']} tasks")
+    print(f"   ✓ Added {result['comments']} comments")
+    print(f"   ✓ Added {result['stories']} stories")
+    print(f"   Done in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Critical paths over task dependencies, precomputed for blocked-work queries.
+
+task_dependency_summary (see schema.sql) has a row per task with a
+dependency link: its direct blocker/dependent counts, `depth`, the number of
+links on the longest chain of blockers ending at the task, and
+`critical_blocker_id`, the blocker that chain runs through. "Longest chain
+in a project" is then the deepest row of the project on the (project_id,
+depth) index plus a walk up critical_blocker_id, instead of a path search
+over the project's links; "what blocks this task" walks task_dependencies'
+primary key.
+
+Chains stay inside a project: `depth` and `critical_blocker_id` only follow
+links whose blocker is in the task's own project, so a project's longest
+chain never leaves it. Links to another project in the team still count in
+num_blockers/num_dependents and are returned by blocking_tasks.
+
+The summary is built once after the bulk load (`build_dependency_summary`)
+and after extraction. Depths are computed with NumPy by relaxing every link
+at once, one round per level of the longest chain. Deltas add no links (and
+never complete a task with open blockers), so it stays current.
+"""
+import sqlite3
+import numpy as np
+
+def build_dependency_summary(conn: sqlite3.Connection) -> int:
+    """(Re)compute task_dependency_summary from task_dependencies; returns the number of linked tasks"""
+    # Links as task rowids (plus whether both ends share a project), so the graph work is all on integer arrays
+    links = np.array(conn.execute("""
+        SELECT t.rowid, b.rowid, t.project_id = b.project_id FROM task_dependencies d
+        JOIN tasks t ON t.task_id = d.task_id
+        JOIN tasks b ON b.task_id = d.depends_on_id
+    """).fetchall(), dtype=np.int64).reshape(-1, 3)
+    rowids, index = np.unique(links[:, :2], return_inverse=True)
+    index = index.reshape(-1, 2)
+    num_blockers = np.bincount(index[:, 0], minlength=len(rowids))
+    num_dependents = np.bincount(index[:, 1], minlength=len(rowids))
+    same_project = links[:, 2].astype(bool)
+    task, blocker = index[same_project, 0], index[same_project, 1]
+
+    # Longest same-project chain ending at each task: relax those links until no depth grows
+    order = np.lexsort((blocker, task))
+    task, blocker = task[order], blocker[order]
+    starts = np.flatnonzero(np.r_[True, task[1:] != task[:-1]]) if len(task) else np.array([], dtype=np.int64)
+    targets = task[starts]
+    depth = np.zeros(len(rowids), dtype=np.int64)
+    while len(starts):
+        best = np.maximum.reduceat(depth[blocker] + 1, starts)
+        grew = best > depth[targets]
+        if not grew.any():
+            break
+        depth[targets[grew]] = best[grew]
+    # Each task's critical blocker: its first blocker (by rowid) on a longest chain
+    on_path = depth[blocker] + 1 == depth[task]
+    critical = np.full(len(rowids), -1, dtype=np.int64)
+    path_tasks, first = np.unique(task[on_path], return_index=True)
+    critical[path_tasks] = rowids[blocker[on_path][first]]
+
+    with conn:
+        conn.execute("DELETE FROM task_dependency_summary")
+        conn.execute("DROP TABLE IF EXISTS temp.dependency_rollup")
+        conn.execute("""
+            CREATE TEMP TABLE dependency_rollup (
+                task_rowid INTEGER PRIMARY KEY, num_blockers INTEGER, num_dependents INTEGER,
+                depth INTEGER, critical_rowid INTEGER
+            )
+        """)
+        conn.executemany("INSERT INTO dependency_rollup VALUES (?, ?, ?, ?, ?)", zip(
+            rowids.tolist(), num_blockers.tolist(), num_dependents.tolist(), depth.tolist(), critical.tolist()
+        ))
+        conn.execute("""
+            INSERT INTO task_dependency_summary
+                (task_id, project_id, num_blockers, num_dependents, depth, critical_blocker_id)
+            SELECT t.task_id, t.project_id, r.num_blockers, r.num_dependents, r.depth, b.task_id
+            FROM dependency_rollup r
+            JOIN tasks t ON t.rowid = r.task_rowid
+            LEFT JOIN tasks b ON b.rowid = r.critical_rowid
+        """)
+        conn.execute("DROP TABLE temp.dependency_rollup")
+    return len(rowids)
+
+def blocking_tasks(conn: sqlite3.Connection, task_id: str, transitive: bool = True) -> list[dict]:
+    """Tasks blocking task_id (directly, or through any chain), nearest first, with open/completed state"""
+    max_distance = -1 if transitive else 1
+    rows = conn.execute("""
+        WITH RECURSIVE upstream(task_id, distance) AS (
+            SELECT depends_on_id, 1 FROM task_dependencies WHERE task_id = :task
+            UNION
+            SELECT d.depends_on_id, u.distance + 1 FROM upstream u
+            JOIN task_dependencies d ON d.task_id = u.task_id
+            WHERE :max < 0 OR u.distance < :max
+        )
+        SELECT t.task_id, t.name, t.project_id, t.completed, MIN(u.distance) AS distance
+        FROM upstream u JOIN tasks t ON t.task_id = u.task_id
+        GROUP BY t.task_id
+        ORDER BY distance, t.created_at
+    """, {"task": task_id, "max": max_distance})
+    return [dict(zip(("task_id", "name", "project_id", "completed", "distance"), row)) for row in rows]
+
+def longest_chain(conn: sqlite3.Connection, project_id: str) -> list[str]:
+    """Task ids on the project's longest dependency chain, first blocker first (empty without links)
+
+    The chain only runs through the project's own tasks (see the module docstring).
+    """
+    rows = conn.execute("""
+        WITH RECURSIVE chain(task_id, depth) AS (
+            SELECT task_id, depth FROM (
+                SELECT task_id, depth FROM task_dependency_summary
+                WHERE project_id = ? ORDER BY depth DESC LIMIT 1
+            )
+            UNION ALL
+            SELECT s.critical_blocker_id, c.depth - 1 FROM chain c
+            JOIN task_dependency_summary s ON s.task_id = c.task_id
+            WHERE s.critical_blocker_id IS NOT NULL
+        )
+        SELECT task_id FROM chain ORDER BY depth
+    """, (project_id,))
+    return [row[0] for row in rows]
@@ -0,0 +1,360 @@
+"""Stream a generated workspace out as Asana-API-shaped JSON documents.
+
+Each resource (tasks, projects, users) is written as shards of
+EXPORT_SHARD_ROWS documents, `<resource>-00000.ndjson` (one document per
+line) or `<resource>-00000.json` (`{"data": [...]}`, like a list response),
+shaped like the API's full records with related resources nested:
+  - tasks: assignee, creator, parent, workspace, `projects` and
+    `memberships` (project + section), dependencies and dependents, priority
+    as an enum custom field, and `stories`, the task's comments and activity
+    log merged in time order (system stories carry assignee / old_section /
+    new_section / new_dates like the API's)
+  - projects: owner, team, workspace, members and followers
+  - users: photo and workspace
+Nested resources are compact records (gid, resource_type, name).
+
+Shards are ranges of the resource table's rowids, written in parallel by
+EXPORT_WORKERS processes, each with its own read-only connection. A worker
+reads EXPORT_BATCH_ROWS rows at a time and fetches their related rows with
+one query per relation, probing the child tables' task/project indexes, so
+memory tracks the batch size rather than the workspace. Documents are
+serialized with orjson when it is installed, else the standard json module.
+Shards go to a directory beside the target, renamed into place with
+manifest.json (document counts and shard files) once all are written.
+
+Usage: python src/export.py [--db PATH] [--out DIR] [--format ndjson|json] [--workers N]
+"""
+import argparse
+import json
+import shutil
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DB_PATH, EXPORT_DIR, EXPORT_FORMAT, EXPORT_SHARD_ROWS, EXPORT_BATCH_ROWS, EXPORT_WORKERS
+
+FORMAT_VERSION = 1
+FORMATS = ("ndjson", "json")
+PERMALINK = "https://app.asana.com/0/{}/{}"
+
+def _ts(column: str) -> str:
+    """SQL for an API timestamp (2025-01-06T09:30:00.000Z) from a stored one"""
+    return f"strftime('%Y-%m-%dT%H:%M:%fZ', {column})"
+
+def _name(alias: str) -> str:
+    """SQL for a user's display name"""
+    return f"{alias}.first_name || ' ' || {alias}.last_name"
+
+# Story types of the activity log -> API story resource_subtype
+STORY_SUBTYPES = {
+    "created": "added_to_project",
+    "assigned": "assigned",
+    "section_changed": "section_changed",
+    "due_date_changed": "due_date_changed",
+    "completed": "marked_complete",
+}
+
+def _serializer() -> tuple[str, Callable[[object], bytes]]:
+    """Fastest available JSON encoder: (name, object -> UTF-8 bytes)"""
+    try:
+        import orjson
+        return "orjson", orjson.dumps
+    except ImportError:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), check_circular=False)
+        return "json", lambda obj: encoder.encode(obj).encode("utf-8")
+
+def _compact(resource_type: str, gid: str | None, name: str | None) -> dict | None:
+    return {"gid": gid, "resource_type": resource_type, "name": name} if gid is not None else None
+
+def _by_key(rows: Iterator[tuple]) -> dict[str, list[tuple]]:
+    """Rows grouped on their first column"""
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[0], []).append(row)
+    return groups
+
+def _short_date(value: str | None) -> str:
+    if value is None:
+        return "no due date"
+    day = date.fromisoformat(value)
+    return f"{day:%b} {day.day}, {day.year}"
+
+def _workspace(conn: sqlite3.Connection) -> dict | None:
+    row = conn.execute("SELECT org_id, name FROM organizations ORDER BY rowid LIMIT 1").fetchone()
+    return _compact("workspace", *row) if row else None
+
+# --- tasks ---------------------------------------------------------------
+
+# The tasks of a rowid range, as a subquery the child tables' task indexes are probed with
+BATCH_TASKS = "SELECT task_id FROM tasks WHERE rowid BETWEEN :first AND :last"
+
+def _story(row: tuple, project: dict) -> dict:
+    _, story_id, story_type, created_at, actor_id, actor, old_value, new_value, assignee_id, assignee, \
+        old_section, new_section = row
+    story = {
+        "gid": story_id, "resource_type": "story", "created_at": created_at,
+        "created_by": _compact("user", actor_id, actor), "type": "system",
+        "resource_subtype": STORY_SUBTYPES[story_type],
+    }
+    if story_type == "created":
+        story["text"] = f"added to {project['name']}"
+        story["project"] = project
+    elif story_type == "assigned":
+        story["assignee"] = _compact("user", assignee_id, assignee)
+        if assignee_id is None:
+            story["resource_subtype"], story["text"] = "unassigned", "unassigned this task"
+        else:
+            story["text"] = f"assigned to {assignee}"
+    elif story_type == "section_changed":
+        story["text"] = f'moved this task from "{old_section}" to "{new_section}" in {project["name"]}'
+        story["old_section"] = _compact("section", old_value, old_section)
+        story["new_section"] = _compact("section", new_value, new_section)
+    elif story_type == "due_date_changed":
+        story["text"] = f"changed the due date to {_short_date(new_value)}"
+        story["old_dates"] = {"due_on": old_value}
+        story["new_dates"] = {"due_on": new_value}
+    else:
+        story["text"] = "marked this task complete"
+    return story
+
+def _task_documents(conn: sqlite3.Connection, first: int, last: int, workspace: dict) -> list[dict]:
+    bounds = {"first": first, "last": last}
+    stories = _by_key(conn.execute(f"""
+        SELECT s.task_id, s.story_id, s.story_type, {_ts('s.created_at')}, s.actor_id, {_name('actor')},
+               s.old_value, s.new_value, assignee.user_id, {_name('assignee')}, old.name, new.name
+        FROM stories s
+        LEFT JOIN users actor ON actor.user_id = s.actor_id
+        LEFT JOIN users assignee ON s.story_type = 'assigned' AND assignee.user_id = s.new_value
+        LEFT JOIN sections old ON s.story_type = 'section_changed' AND old.section_id = s.old_value
+        LEFT JOIN sections new ON s.story_type = 'section_changed' AND new.section_id = s.new_value
+        WHERE s.task_id IN ({BATCH_TASKS})
+    """, bounds))
+    comments = _by_key(conn.execute(f"""
+        SELECT c.task_id, c.comment_id, c.comment_type, {_ts('c.created_at')}, c.user_id, {_name('u')}, c.comment_text
+        FROM comments c LEFT JOIN users u ON u.user_id = c.user_id
+        WHERE c.task_id IN ({BATCH_TASKS})
+    """, bounds))
+    dependencies = _by_key(conn.execute(f"""
+        SELECT d.task_id, b.task_id, b.name FROM task_dependencies d JOIN tasks b ON b.task_id = d.depends_on_id
+        WHERE d.task_id IN ({BATCH_TASKS})
+    """, bounds))
+    dependents = _by_key(conn.execute(f"""
+        SELECT d.depends_on_id, t.task_id, t.name FROM task_dependencies d JOIN tasks t ON t.task_id = d.task_id
+        WHERE d.depends_on_id IN ({BATCH_TASKS})
+    """, bounds))
+
+    documents = []
+    for row in conn.execute(f"""
+        SELECT t.task_id, t.name, t.description, t.completed, {_ts('t.completed_at')}, {_ts('t.created_at')},
+               t.due_date, t.start_date, t.priority, t.num_likes, t.num_subtasks,
+               p.project_id, p.name, s.section_id, s.name, parent.task_id, parent.name,
+               t.assignee_id, {_name('assignee')}, t.created_by, {_name('creator')},
+               t.completed_by, {_name('completer')}
+        FROM tasks t
+        JOIN projects p ON p.project_id = t.project_id
+        LEFT JOIN sections s ON s.section_id = t.section_id
+        LEFT JOIN tasks parent ON parent.task_id = t.parent_task_id
+        LEFT JOIN users assignee ON assignee.user_id = t.assignee_id
+        LEFT JOIN users creator ON creator.user_id = t.created_by
+        LEFT JOIN users completer ON completer.user_id = t.completed_by
+        WHERE t.rowid BETWEEN :first AND :last
+        ORDER BY t.rowid
+    """, bounds):
+        (task_id, name, notes, completed, completed_at, created_at, due_on, start_on, priority, num_likes,
+         num_subtasks, project_id, project_name, section_id, section_name, parent_id, parent_name,
+         assignee_id, assignee, creator_id, creator, completer_id, completer) = row
+        project = _compact("project", project_id, project_name)
+        task_stories = [_story(story, project) for story in stories.get(task_id, ())]
+        task_stories += [{
+            "gid": comment_id, "resource_type": "story", "created_at": at,
+            "created_by": _compact("user", user_id, user), "type": comment_type,
+            "resource_subtype": "comment_added", "text": text,
+        } for _, comment_id, comment_type, at, user_id, user, text in comments.get(task_id, ())]
+        task_stories.sort(key=lambda story: story["created_at"])
+        documents.append({
+            "gid": task_id, "resource_type": "task", "resource_subtype": "default_task",
+            "name": name, "notes": notes or "",
+            "completed": bool(completed), "completed_at": completed_at,
+            "completed_by": _compact("user", completer_id, completer),
+            "created_at": created_at, "created_by": _compact("user", creator_id, creator),
+            "modified_at": max([created_at, completed_at or created_at] + [s["created_at"] for s in task_stories]),
+            "due_on": due_on, "start_on": start_on,
+            "assignee": _compact("user", assignee_id, assignee),
+            "parent": _compact("task", parent_id, parent_name),
+            "workspace": workspace,
+            "projects": [project],
+            "memberships": [{"project": project, "section": _compact("section", section_id, section_name)}],
+            "num_likes": num_likes, "num_subtasks": num_subtasks,
+            "custom_fields": [{
+                "gid": "priority", "resource_type": "custom_field", "name": "Priority", "resource_subtype": "enum",
+                "display_value": priority.capitalize() if priority else None,
+            }],
+            "dependencies": [_compact("task", gid, title) for _, gid, title in dependencies.get(task_id, ())],
+            "dependents": [_compact("task", gid, title) for _, gid, title in dependents.get(task_id, ())],
+            "permalink_url": PERMALINK.format(project_id, task_id),
+            "stories": task_stories,
+        })
+    return documents
+
+# --- projects and users --------------------------------------------------
+
+BATCH_PROJECTS = "SELECT project_id FROM projects WHERE rowid BETWEEN :first AND :last"
+
+def _project_documents(conn: sqlite3.Connection, first: int, last: int, workspace: dict) -> list[dict]:
+    bounds = {"first": first, "last": last}
+    people = {}
+    for table in ("project_memberships", "project_followers"):
+        people[table] = _by_key(conn.execute(f"""
+            SELECT m.project_id, u.user_id, {_name('u')} FROM {table} m JOIN users u ON u.user_id = m.user_id
+            WHERE m.project_id IN ({BATCH_PROJECTS})
+        """, bounds))
+    documents = []
+    for row in conn.execute(f"""
+        SELECT p.project_id, p.name, p.description, p.project_type, p.status, p.color, p.privacy,
+               p.start_date, p.due_date, {_ts('p.created_at')}, t.team_id, t.name, p.owner_id, {_name('owner')}
+        FROM projects p
+        JOIN teams t ON t.team_id = p.team_id
+        LEFT JOIN users owner ON owner.user_id = p.owner_id
+        WHERE p.rowid BETWEEN :first AND :last
+        ORDER BY p.rowid
+    """, bounds):
+        (project_id, name, notes, project_type, status, color, privacy, start_on, due_on, created_at,
+         team_id, team, owner_id, owner) = row
+        documents.append({
+            "gid": project_id, "resource_type": "project", "name": name, "notes": notes or "",
+            "archived": status == "archived", "color": color, "created_at": created_at,
+            "start_on": start_on, "due_on": due_on,
+            "public": privacy == "public",
+            "privacy_setting": "public_to_workspace" if privacy == "public" else "private",
+            "owner": _compact("user", owner_id, owner),
+            "team": _compact("team", team_id, team),
+            "workspace": workspace,
+            "members": [_compact("user", gid, person) for _, gid, person
+                        in people["project_memberships"].get(project_id, ())],
+            "followers": [_compact("user", gid, person) for _, gid, person
+                          in people["project_followers"].get(project_id, ())],
+            "project_type": project_type, "status": status,
+            "permalink_url": PERMALINK.format(project_id, project_id),
+        })
+    return documents
+
+def _user_documents(conn: sqlite3.Connection, first: int, last: int, workspace: dict) -> list[dict]:
+    return [{
+        "gid": user_id, "resource_type": "user", "name": name, "email": email,
+        "photo": {"image_128x128": photo} if photo else None,
+        "workspaces": [workspace],
+    } for user_id, name, email, photo in conn.execute(f"""
+        SELECT u.user_id, {_name('u')}, u.email, u.profile_photo_url FROM users u
+        WHERE u.rowid BETWEEN ? AND ? ORDER BY u.rowid
+    """, (first, last))]
+
+# Resource -> (table, documents for a rowid range), tasks first: their shards take longest
+RESOURCES = {
+    "tasks": ("tasks", _task_documents),
+    "projects": ("projects", _project_documents),
+    "users": ("users", _user_documents),
+}
+
+# --- writing -------------------------------------------------------------
+
+def plan_shards(conn: sqlite3.Connection, table: str, shard_rows: int) -> list[tuple[int, int]]:
+    """Inclusive rowid ranges of up to shard_rows rows each, in rowid order"""
+    starts = [row[0] for row in conn.execute(f"""
+        SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER (ORDER BY rowid) - 1 AS n FROM {table})
+        WHERE n % ? = 0
+    """, (shard_rows,))]
+    if not starts:
+        return []
+    end = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0]
+    return [(start, after - 1) for start, after in zip(starts, starts[1:])] + [(starts[-1], end)]
+
+def _batches(conn: sqlite3.Connection, table: str, first: int, last: int,
+             batch_rows: int) -> Iterator[tuple[int, int]]:
+    """Inclusive rowid ranges of up to batch_rows rows within [first, last], read as they are needed"""
+    cursor = conn.execute(f"SELECT rowid FROM {table} WHERE rowid BETWEEN ? AND ? ORDER BY rowid", (first, last))
+    while rowids := cursor.fetchmany(batch_rows):
+        yield rowids[0][0], rowids[-1][0]
+
+def write_shard(source: str, path: str, resource: str, fmt: str, first: int, last: int,
+                batch_rows: int = EXPORT_BATCH_ROWS) -> int:
+    """Write the documents of a rowid range of a resource to path; returns the number written"""
+    table, documents = RESOURCES[resource]
+    _, dumps = _serializer()
+    conn = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    workspace = _workspace(conn)
+    written = 0
+    with open(path, "wb", buffering=1 << 20) as out:
+        if fmt == "json":
+            out.write(b'{"data":[\n')
+        for lo, hi in _batches(conn, table, first, last, batch_rows):
+            for document in documents(conn, lo, hi, workspace):
+                if fmt == "json" and written:
+                    out.write(b",\n")
+                out.write(dumps(document))
+                if fmt == "ndjson":
+                    out.write(b"\n")
+                written += 1
+        if fmt == "json":
+            out.write(b"\n]}\n")
+    conn.close()
+    return written
+
+def export(source: str, out: str, fmt: str = EXPORT_FORMAT, workers: int = EXPORT_WORKERS,
+           shard_rows: int = EXPORT_SHARD_ROWS) -> dict:
+    """Write the JSON export of database source to directory out; returns the manifest"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    out_path = Path(out)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    conn = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    jobs = [(resource, tmp / f"{resource}-{i:05d}.{fmt}", first, last)
+            for resource, (table, _) in RESOURCES.items()
+            for i, (first, last) in enumerate(plan_shards(conn, table, shard_rows))]
+    conn.close()
+
+    args = [(str(source), str(path), resource, fmt, first, last) for resource, path, first, last in jobs]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = list(executor.map(write_shard, *zip(*args)))
+    else:
+        counts = [write_shard(*job) for job in args]
+    manifest = {"version": FORMAT_VERSION, "source": str(source), "format": fmt, "serializer": _serializer()[0],
+                "resources": {resource: {"documents": 0, "shards": []} for resource in RESOURCES}}
+    for (resource, path, _, _), count in zip(jobs, counts):
+        manifest["resources"][resource]["documents"] += count
+        manifest["resources"][resource]["shards"].append(path.name)
+
+    (tmp / "manifest.json").write_text(json.dumps(manifest, indent=1))
+    shutil.rmtree(out_path, ignore_errors=True)
+    tmp.rename(out_path)
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a generated database as Asana-API-shaped JSON")
+    parser.add_argument("--db", default=DB_PATH, help="Generated database")
+    parser.add_argument("--out", default=EXPORT_DIR, help="Export directory to write (replaced if present)")
+    parser.add_argument("--format", default=EXPORT_FORMAT, choices=FORMATS,
+                        help="ndjson: one document per line; json: {\"data\": [...]} per shard")
+    parser.add_argument("--workers", type=int, default=EXPORT_WORKERS, help="Shard writer processes")
+    args = parser.parse_args()
+
+    print(f"📦 Exporting {args.db} to {args.out} ({args.format}, {_serializer()[0]}, {args.workers} workers)...")
+    start = time.perf_counter()
+    manifest = export(args.db, args.out, args.format, args.workers)
+    elapsed = time.perf_counter() - start
+    size = sum(p.stat().st_size for p in Path(args.out).iterdir())
+    for resource, spec in manifest["resources"].items():
+        print(f"   ✓ {resource}: {spec['documents']} documents in {len(spec['shards'])} shards")
+    print(f"   Done in {elapsed:.2f}s ({size / 2**20:.1f} MiB)")
+
+if __name__ == "__main__":
+    main()
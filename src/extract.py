@@ -0,0 +1,212 @@
+"""Extract a referentially closed slice of a generated workspace into a new database.
+
+Given team and/or project ids (or a target task count, filled with whole
+teams), copies the teams, their memberships and users, projects with their
+members and followers, sections, tasks, comments, stories, dependencies
+between selected tasks and task-level extras, plus every user referenced
+from outside the selected teams (owners, project members, assignees,
+creators, commenters, story actors), so every foreign key in the output
+resolves. The source is ATTACHed and each table is copied with one
+INSERT ... SELECT driven by temp id sets and the source's indexes, so cost
+tracks the size of the slice, not the workspace.
+
+Summary tables (dependency critical paths included), triggers and (when the
+source has one) the search index are rebuilt on the slice.
+
+Usage: python src/extract.py --out PATH [--db PATH] (--team ID ... | --project ID ... | --target-tasks N) [--seed N]
+"""
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DB_PATH
+from aggregates import build_aggregates, install_triggers
+from search import build_search_index
+from dependencies import build_dependency_summary
+
+SCHEMA_PATH = Path(__file__).parent.parent / "schema.sql"
+
+# Table -> WHERE clause over the source table (aliased s) selecting the slice
+COPY_PLAN = [
+    ("organizations", "1"),
+    ("teams", "s.team_id IN (SELECT id FROM sel_teams)"),
+    ("users", "s.user_id IN (SELECT id FROM sel_users)"),
+    ("team_memberships", "s.team_id IN (SELECT id FROM sel_teams)"),
+    ("projects", "s.project_id IN (SELECT id FROM sel_projects)"),
+    ("project_memberships", "s.project_id IN (SELECT id FROM sel_projects)"),
+    ("project_followers", "s.project_id IN (SELECT id FROM sel_projects)"),
+    ("sections", "s.project_id IN (SELECT id FROM sel_projects)"),
+    ("tasks", "s.rowid IN (SELECT id FROM sel_tasks)"),
+    ("comments", "s.task_id IN (SELECT task_id FROM main.tasks)"),
+    ("stories", "s.task_id IN (SELECT task_id FROM main.tasks)"),
+    # EXISTS for the blocker, so the key is probed once per selected task rather than once per pair
+    ("task_dependencies", "s.task_id IN (SELECT task_id FROM main.tasks)"
+                          " AND EXISTS (SELECT 1 FROM main.tasks t WHERE t.task_id = s.depends_on_id)"),
+    ("custom_field_definitions", "s.project_id IN (SELECT id FROM sel_projects)"),
+    ("custom_field_values", "s.field_id IN (SELECT field_id FROM main.custom_field_definitions)"
+                            " AND s.task_id IN (SELECT task_id FROM main.tasks)"),
+    ("tags", "1"),
+    ("task_tags", "s.task_id IN (SELECT task_id FROM main.tasks)"),
+    ("attachments", "s.task_id IN (SELECT task_id FROM main.tasks)"),
+    ("workspace_meta", "1"),
+]
+
+def _columns(conn: sqlite3.Connection, schema: str, table: str) -> list[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+def teams_for_target(conn: sqlite3.Connection, target_tasks: int, seed: int | None = None) -> list[str]:
+    """Whole teams, in random order, until they hold at least target_tasks tasks"""
+    has_summary = conn.execute(
+        "SELECT 1 FROM src.sqlite_master WHERE name = 'team_task_summary'"
+    ).fetchone()
+    if has_summary:
+        sizes = conn.execute("SELECT team_id, total_tasks FROM src.team_task_summary").fetchall()
+    else:
+        sizes = conn.execute("""
+            SELECT p.team_id, COUNT(*) FROM src.tasks t JOIN src.projects p ON p.project_id = t.project_id
+            GROUP BY p.team_id
+        """).fetchall()
+    random.Random(seed).shuffle(sizes)
+    teams, total = [], 0
+    for team_id, size in sizes:
+        if total >= target_tasks:
+            break
+        if size:
+            teams.append(team_id)
+            total += size
+    return teams
+
+def select_slice(conn: sqlite3.Connection, team_ids: list[str], project_ids: list[str]):
+    """Fill temp id sets for the slice, closing over every reference"""
+    conn.executescript("""
+        CREATE TEMP TABLE sel_teams (id TEXT PRIMARY KEY) WITHOUT ROWID;
+        CREATE TEMP TABLE sel_projects (id TEXT PRIMARY KEY) WITHOUT ROWID;
+        CREATE TEMP TABLE sel_tasks (id INTEGER PRIMARY KEY);
+        CREATE TEMP TABLE sel_users (id TEXT PRIMARY KEY) WITHOUT ROWID;
+    """)
+    conn.executemany("INSERT OR IGNORE INTO sel_teams VALUES (?)", ((t,) for t in team_ids))
+    conn.executemany("INSERT OR IGNORE INTO sel_projects VALUES (?)", ((p,) for p in project_ids))
+    conn.executescript("""
+        INSERT OR IGNORE INTO sel_projects
+        SELECT p.project_id FROM src.projects p WHERE p.team_id IN (SELECT id FROM sel_teams);
+
+        INSERT OR IGNORE INTO sel_tasks
+        SELECT t.rowid FROM src.tasks t WHERE t.project_id IN (SELECT id FROM sel_projects);
+
+        -- Parent tasks living in other projects, and those projects
+        INSERT OR IGNORE INTO sel_tasks
+        WITH RECURSIVE ancestors(task_id) AS (
+            SELECT t.parent_task_id FROM src.tasks t
+            WHERE t.rowid IN (SELECT id FROM sel_tasks) AND t.parent_task_id IS NOT NULL
+            UNION
+            SELECT t.parent_task_id FROM src.tasks t JOIN ancestors a ON t.task_id = a.task_id
+            WHERE t.parent_task_id IS NOT NULL
+        )
+        SELECT t.rowid FROM src.tasks t JOIN ancestors a ON t.task_id = a.task_id;
+        INSERT OR IGNORE INTO sel_projects
+        SELECT DISTINCT t.project_id FROM src.tasks t WHERE t.rowid IN (SELECT id FROM sel_tasks);
+
+        INSERT OR IGNORE INTO sel_teams
+        SELECT DISTINCT p.team_id FROM src.projects p WHERE p.project_id IN (SELECT id FROM sel_projects);
+
+        -- Team members, then every user referenced from the slice
+        INSERT OR IGNORE INTO sel_users
+        SELECT m.user_id FROM src.team_memberships m WHERE m.team_id IN (SELECT id FROM sel_teams);
+        INSERT OR IGNORE INTO sel_users
+        SELECT p.owner_id FROM src.projects p
+        WHERE p.project_id IN (SELECT id FROM sel_projects) AND p.owner_id IS NOT NULL;
+        INSERT OR IGNORE INTO sel_users
+        SELECT u FROM (
+            SELECT t.assignee_id AS u FROM src.tasks t WHERE t.rowid IN (SELECT id FROM sel_tasks)
+            UNION SELECT t.created_by FROM src.tasks t WHERE t.rowid IN (SELECT id FROM sel_tasks)
+            UNION SELECT t.completed_by FROM src.tasks t WHERE t.rowid IN (SELECT id FROM sel_tasks)
+            UNION SELECT c.user_id FROM src.comments c
+                  JOIN src.tasks t ON t.task_id = c.task_id WHERE t.rowid IN (SELECT id FROM sel_tasks)
+            UNION SELECT a.uploaded_by FROM src.attachments a
+                  JOIN src.tasks t ON t.task_id = a.task_id WHERE t.rowid IN (SELECT id FROM sel_tasks)
+        ) WHERE u IS NOT NULL;
+    """)
+    # Databases generated before project memberships have none
+    for table in ("project_memberships", "project_followers"):
+        if conn.execute("SELECT 1 FROM src.sqlite_master WHERE name = ?", (table,)).fetchone():
+            conn.execute(f"""
+                INSERT OR IGNORE INTO sel_users
+                SELECT m.user_id FROM src.{table} m WHERE m.project_id IN (SELECT id FROM sel_projects)
+            """)
+    # Databases generated before the activity log have no stories
+    if conn.execute("SELECT 1 FROM src.sqlite_master WHERE name = 'stories'").fetchone():
+        conn.execute("""
+            INSERT OR IGNORE INTO sel_users
+            SELECT s.actor_id FROM src.stories s
+            JOIN src.tasks t ON t.task_id = s.task_id
+            WHERE t.rowid IN (SELECT id FROM sel_tasks) AND s.actor_id IS NOT NULL
+        """)
+
+def extract(source: str, out: str, team_ids: list[str] = (), project_ids: list[str] = (),
+            target_tasks: int | None = None, seed: int | None = None) -> dict:
+    """Write the slice of source selected by teams/projects (or target_tasks) to out; returns row counts"""
+    out_path = Path(out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(out_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executescript(SCHEMA_PATH.read_text())
+    conn.execute("ATTACH DATABASE ? AS src", (source,))
+
+    team_ids = list(team_ids)
+    if target_tasks:
+        team_ids += teams_for_target(conn, target_tasks, seed)
+    if not team_ids and not project_ids:
+        raise ValueError("Nothing selected: pass team ids, project ids or a target task count")
+    select_slice(conn, team_ids, list(project_ids))
+
+    counts = {}
+    with conn:
+        for table, where in COPY_PLAN:
+            source_columns = set(_columns(conn, "src", table))
+            if not source_columns:
+                continue
+            columns = ", ".join(c for c in _columns(conn, "main", table) if c in source_columns)
+            cursor = conn.execute(
+                f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM src.{table} s WHERE {where}"
+            )
+            counts[table] = cursor.rowcount
+
+    has_search = conn.execute("SELECT 1 FROM src.sqlite_master WHERE name = 'tasks_fts'").fetchone()
+    conn.execute("DETACH DATABASE src")
+    build_aggregates(conn)
+    install_triggers(conn)
+    build_dependency_summary(conn)
+    if has_search:
+        build_search_index(conn)
+    conn.close()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract a referentially closed workspace slice")
+    parser.add_argument("--db", default=DB_PATH, help="Source database")
+    parser.add_argument("--out", required=True, help="Database file to write (replaced if present)")
+    parser.add_argument("--team", nargs="*", default=[], help="Team ids to include")
+    parser.add_argument("--project", nargs="*", default=[], help="Project ids to include")
+    parser.add_argument("--target-tasks", type=int, help="Add random whole teams until this many tasks")
+    parser.add_argument("--seed", type=int, help="Seed for --target-tasks team choice")
+    args = parser.parse_args()
+
+    print(f"✂️  Extracting slice of {args.db} into {args.out}...")
+    start = time.perf_counter()
+    counts = extract(args.db, args.out, args.team, args.project, args.target_tasks, args.seed)
+    elapsed = time.perf_counter() - start
+    for table, count in counts.items():
+        if count:
+            print(f"   ✓ {table}: {count}")
+    print(f"   Done in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
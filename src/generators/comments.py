@@ -1,8 +1,12 @@
-from utils.id_generator import generate_id
-from utils.date_utils import random_date_between
-from utils.llm_utils import generate_with_llm
-from config import SIMULATION_CURRENT_DATE
-import random
+from utils.id_generator import generate_ids
+from utils.text_pool import TextPool
+from utils.table import StringColumn, Table
+from utils.seed import default_rng
+from utils.dedup import NearDuplicateFilter, diversify
+from utils.collaboration import CollaborationGraph
+from config import SIMULATION_CURRENT_DATE, DEDUP_TEXT, DEDUP_MAX_ATTEMPTS, DEDUP_CAPACITY, GENERATOR_BATCH_PROJECTS
+from typing import Iterator
+import numpy as np
 
 COMMENT_TEMPLATES = [
     "LGTM!  Approving.",
@@ -17,60 +21,210 @@ COMMENT_TEMPLATES = [
     "Need help with {issue}"
 ]
 
-def generate_comments(tasks: list[dict], users: list[dict]) -> list[dict]:
-    """Generate comments for tasks"""
-    comments = []
-    
-    for task in tasks: 
-        # Not all tasks have comments
-        if random.random() > 0.6:
+# Placeholder fills used when the LLM is disabled
+COMMENT_FILLS = {
+    "dependency": [
+        "the API review", "legal sign-off", "the design handoff", "infra capacity",
+        "the vendor contract", "QA environment access", "budget approval", "the data migration"
+    ],
+    "question": [
+        "what's the target date for this?", "who owns the rollout?",
+        "is this still in scope for this sprint?", "do we have sign-off from the stakeholders?",
+        "should this be split into subtasks?", "which environment should we test in?"
+    ],
+    "issue": [
+        "the test failures", "the stakeholder review", "access permissions", "the copy edits",
+        "the deployment checklist", "reproducing the bug", "the budget numbers"
+    ]
+}
+
+# Appended to a user comment that would otherwise repeat one in the same project
+COMMENT_FOLLOW_UPS = [
+    "Thanks!", "Let me know if anything changes.", "Will check back tomorrow.", "Details are in the doc.",
+    "Adding this to the next sync.", "Ping me with any questions.", "Following up from standup.", "cc the team."
+]
+
+COMMENT_COLUMNS = ["comment_id", "task_id", "user_id", "parent_comment_id", "comment_text", "comment_type", "created_at"]
+# Only user comments are generated: system activity (moves, assignments, completion) is the stories log
+COMMENT_TYPES = ["comment"]
+
+COMMENT_COUNT_CHOICES = np.array([1, 2, 3, 4, 5])
+COMMENT_COUNT_WEIGHTS = np.array([0.5, 0.25, 0.15, 0.07, 0.03])
+COMMENT_PROBABILITY = 0.6  # Share of tasks with any comments
+REPLY_PROBABILITY = 0.3  # Share of later comments that reply to an earlier one
+
+def _comment_pool_prompt(template: str, n: int) -> str:
+    return f"Complete this project comment in {n} different ways, each a short realistic comment: {template}"
+
+# Pooled LLM completions for placeholder templates, keyed by template
+COMMENT_POOL = TextPool(_comment_pool_prompt, temperature=0.9)
+
+def _template_vocabulary() -> tuple[list[str], np.ndarray]:
+    """Expand templates into every offline comment text, with the probability of picking each"""
+    texts, probs = [], []
+    for template in COMMENT_TEMPLATES:
+        if "{" not in template:
+            texts.append(template)
+            probs.append(1.0)
             continue
-        
-        # Number of comments
-        num_comments = random.choices([1, 2, 3, 4, 5], weights=[0.5, 0.25, 0.15, 0.07, 0.03])[0]
-        
-        for _ in range(num_comments):
-            # Comment type
-            is_system = random.random() < 0.2
-            
-            if is_system:
-                comment_text = random.choice([
-                    "Task moved to In Progress",
-                    "Due date changed",
-                    "Task assigned to user",
-                    "Task completed",
-                    "Attachment added"
-                ])
-                comment_type = "system"
-            else:
-                # User comment
-                template = random.choice(COMMENT_TEMPLATES)
+        key = template[template.index("{") + 1:template.index("}")]
+        fills = COMMENT_FILLS[key]
+        for fill in fills:
+            texts.append(template.format(**{key: fill}))
+            probs.append(1.0 / len(fills))
+    probs = np.array(probs)
+    return texts, probs / probs.sum()
+
+def _with_follow_up(text: str, n: int) -> str:
+    """The n-th (n >= 2) copy of a comment, with a distinct run of follow-up phrases appended"""
+    phrases, k = [], n - 2
+    while k >= 0:
+        phrases.append(COMMENT_FOLLOW_UPS[k % len(COMMENT_FOLLOW_UPS)])
+        k = k // len(COMMENT_FOLLOW_UPS) - 1
+    text = text.rstrip()
+    return " ".join([text if text.endswith((".", "!", "?")) else f"{text}."] + phrases)
+
+def _to_datetime64(values: list[str | None] | np.ndarray, fallback: np.datetime64) -> np.ndarray:
+    """Parse ISO timestamps (None/NaT -> fallback) into a datetime64[s] array"""
+    if isinstance(values, np.ndarray):
+        parsed = values.astype("datetime64[s]")
+        return np.where(np.isnat(parsed), fallback, parsed)
+    parsed = np.array([v if v else fallback for v in values], dtype="datetime64[us]")
+    return parsed.astype("datetime64[s]")
+
+def _task_fields(tasks: Table | list[dict]) -> dict:
+    """The task fields comments need, as arrays, from a Table or a list of dict rows"""
+    if isinstance(tasks, Table):
+        ids, assignees, creators = tasks.columns["task_id"], tasks.columns["assignee_id"], tasks.columns["created_by"]
+        projects = tasks.columns["project_id"]
+        return {
+            "task_id": ids.take(ids.codes),
+            "project_id": projects.take(projects.codes),
+            "assignee_id": assignees.take(assignees.codes),
+            "created_by": creators.take(creators.codes),
+            "created_at": tasks.columns["created_at"],
+            "completed_at": tasks.columns["completed_at"],
+        }
+    return {
+        "task_id": np.array([t["task_id"] for t in tasks], dtype=object),
+        "project_id": np.array([t["project_id"] for t in tasks], dtype=object),
+        "assignee_id": np.array([t["assignee_id"] for t in tasks], dtype=object),
+        "created_by": np.array([t.get("created_by") for t in tasks], dtype=object),
+        "created_at": [t["created_at"] for t in tasks],
+        "completed_at": [t["completed_at"] for t in tasks],
+    }
+
+def generate_comments(tasks: Table | list[dict], users: list[dict], use_llm: bool = False,
+                      rng: np.random.Generator | None = None,
+                      window: tuple[str, str] | None = None, graph: CollaborationGraph | None = None) -> Table:
+    """Generate comments for tasks as a columnar Table (see `Database.write_rows`).
+
+    Comment counts, authors, texts and timestamps are drawn for all tasks at
+    once. Each task's comments are sorted in time between its creation and its
+    completion (or the simulation date if still open), and later comments
+    may reply to an earlier one in the same thread. All are user comments;
+    what happened to the task is recorded by its stories. Commenters are
+    the assignee or collaborators of the assignee (or creator) in `graph`,
+    built from `users` alone if not given. With `window`
+    (start, end), comments are confined to that date range instead, as used
+    by the delta generator.
+    """
+    rng = rng or default_rng()
+    n_tasks = len(tasks)
+    now = np.datetime64(window[1] if window else SIMULATION_CURRENT_DATE, "s")
+
+    # Comment counts for every task at once; most tasks get none or one
+    counts = rng.choice(COMMENT_COUNT_CHOICES, size=n_tasks, p=COMMENT_COUNT_WEIGHTS)
+    counts[rng.random(n_tasks) >= COMMENT_PROBABILITY] = 0
+
+    total = int(counts.sum())
+    if total == 0:
+        return Table({name: StringColumn.nulls(0) for name in COMMENT_COLUMNS})
+
+    fields = _task_fields(tasks)
+    task_idx = np.repeat(np.arange(n_tasks), counts)
+    first_idx = np.repeat(np.cumsum(counts) - counts, counts)
+    position = np.arange(total) - first_idx
+
+    # Timestamps: sorted within each task, between creation and completion
+    start = _to_datetime64(fields["created_at"], now)
+    end = np.minimum(_to_datetime64(fields["completed_at"], now), now)
+    if window:
+        start = np.maximum(start, np.datetime64(window[0], "s"))
+    end = np.maximum(end, start)
+    offsets = rng.random(total)
+    offsets = offsets[np.argsort(task_idx + offsets, kind="stable")]
+    span = (end - start).astype(np.int64)[task_idx]
+    created_at = start[task_idx] + (offsets * span).astype("timedelta64[s]")
+
+    # Comment text: codes into the template vocabulary
+    texts, probs = _template_vocabulary()
+    comment_text = StringColumn(texts, rng.choice(len(texts), size=total, p=probs))
+    if use_llm or DEDUP_TEXT:
+        decoded = comment_text.take(comment_text.codes)
+        if use_llm:
+            template_idx = rng.integers(0, len(COMMENT_TEMPLATES), size=total)
+            for i in range(total):
+                template = COMMENT_TEMPLATES[template_idx[i]]
                 if "{" in template:
-                    # Fill in placeholder
-                    comment_text = generate_with_llm(f"Complete this project comment: {template}")
-                else:
-                    comment_text = template
-                comment_type = "comment"
-            
-            # Comment time:  between task creation and now
-            created_at = random_date_between(task["created_at"], SIMULATION_CURRENT_DATE)
-            
-            # Commenter
-            if task["assignee_id"] and random.random() < 0.6:
-                user_id = task["assignee_id"]
-            else:
-                user_id = random.choice(users)["user_id"]
-            
-            comments.append({
-                "comment_id": generate_id(),
-                "task_id": task["task_id"],
-                "user_id": user_id,
-                "comment_text": comment_text,
-                "comment_type": comment_type,
-                "created_at": created_at
-            })
-        
-        # Update task comment count
-        task["num_comments"] = num_comments
-    
-    return comments
\ No newline at end of file
+                    decoded[i] = COMMENT_POOL.draw(template) or decoded[i]
+        def make_text(k: int) -> str:
+            """A fresh comment, replacing a near-duplicate"""
+            template = COMMENT_TEMPLATES[rng.integers(len(COMMENT_TEMPLATES))]
+            if use_llm and "{" in template:
+                text = COMMENT_POOL.draw(template)
+                if text:
+                    return text
+            return texts[rng.choice(len(texts), p=probs)]
+        if DEDUP_TEXT:
+            # No project repeats a near-identical comment; with few templates, exact repeats left get a
+            # follow-up phrase rather than more redraws from the same vocabulary
+            decoded[:], _ = diversify(
+                decoded.tolist(), make_text, NearDuplicateFilter(capacity=DEDUP_CAPACITY),
+                scopes=fields["project_id"][task_idx].tolist(), max_attempts=DEDUP_MAX_ATTEMPTS,
+                distinct_attempts=0, disambiguate=_with_follow_up
+            )
+        comment_text = StringColumn.encode(decoded.tolist())
+
+    # Commenter: assignee 60% of the time, otherwise a collaborator of the assignee (or creator)
+    graph = graph or CollaborationGraph.build(users, rng=rng)
+    assignees = fields["assignee_id"][task_idx]
+    anchor = graph.rows(np.where(assignees == None, fields["created_by"][task_idx], assignees))  # noqa: E711
+    commenter = np.array(graph.user_ids, dtype=object)[graph.sample(anchor, rng)]
+    use_assignee = (assignees != None) & (rng.random(total) < 0.6)  # noqa: E711
+    commenter[use_assignee] = assignees[use_assignee]
+
+    # Reply threads: a later comment may answer an earlier one
+    comment_ids = generate_ids(total)
+    parent_pos = first_idx + (rng.random(total) * position).astype(np.int64)
+    is_reply = (position > 0) & (rng.random(total) < REPLY_PROBABILITY)
+
+    return Table({
+        "comment_id": StringColumn.unique(comment_ids),
+        "task_id": StringColumn(fields["task_id"].tolist(), task_idx),
+        "user_id": StringColumn.encode(commenter.tolist()),
+        "parent_comment_id": StringColumn(comment_ids, np.where(is_reply, parent_pos, -1)),
+        "comment_text": comment_text,
+        "comment_type": StringColumn(COMMENT_TYPES, np.zeros(total, dtype=np.int32)),
+        "created_at": created_at,
+    })
+
+def iter_comments(tasks: Table, users: list[dict], use_llm: bool = False, rng: np.random.Generator | None = None,
+                  graph: CollaborationGraph | None = None,
+                  batch_projects: int = GENERATOR_BATCH_PROJECTS) -> Iterator[Table]:
+    """generate_comments for the tasks of batch_projects projects at a time.
+
+    Each batch can be written while the next is made. Tasks are expected
+    grouped by project, as generate_tasks makes them, so per-project text
+    deduplication sees a whole project at once.
+    """
+    if len(tasks) == 0:
+        return
+    rng = rng or default_rng()
+    graph = graph or CollaborationGraph.build(users, rng=rng)
+    projects = tasks.columns["project_id"].codes
+    # Row where each project's run of tasks starts; every batch_projects-th run starts a batch
+    runs = np.flatnonzero(np.diff(projects, prepend=-2) != 0)
+    bounds = np.append(runs[::batch_projects], len(tasks)).tolist()
+    for start, stop in zip(bounds, bounds[1:]):
+        yield generate_comments(tasks.slice(start, stop), users, use_llm=use_llm, rng=rng, graph=graph)
@@ -0,0 +1,84 @@
+"""Task dependencies: acyclic "blocked by" links within and across projects.
+
+All tasks are put in one order by (created_at, task_id) and a task only ever
+depends on tasks before it, so the graph is acyclic by construction, and
+checkable from the two linked rows alone. About DEPENDENCY_RATE of tasks
+depend on one to three of the DEPENDENCY_WINDOW tasks created just before
+them in their project; CROSS_PROJECT_DEPENDENCY_RATE also depend on a recent
+task of another project of the same team. A completed task's blockers were
+completed no later than it: links that would break this are dropped.
+"""
+from utils.table import StringColumn, Table
+from utils.seed import default_rng
+import numpy as np
+
+DEPENDENCY_COLUMNS = ["task_id", "depends_on_id", "created_at"]
+
+DEPENDENCY_RATE = 0.25
+BLOCKER_COUNTS = np.array([1, 2, 3])
+BLOCKER_COUNT_WEIGHTS = np.array([0.65, 0.25, 0.10])
+DEPENDENCY_WINDOW = 8  # Blockers come from the project's last 8 tasks
+CROSS_PROJECT_DEPENDENCY_RATE = 0.03
+CROSS_PROJECT_WINDOW = 200  # ...or, across projects, the team's last 200
+
+def _groups(order: np.ndarray, group: np.ndarray, n_groups: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rows grouped (in `order` within each group), each row's position and its group's first position"""
+    grouped = order[np.argsort(group[order], kind="stable")]
+    position = np.empty(len(order), dtype=np.int64)
+    position[grouped] = np.arange(len(order))
+    indptr = np.zeros(n_groups + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(group, minlength=n_groups))
+    return grouped, position, indptr[group]
+
+def _earlier(rows: np.ndarray, grouped: np.ndarray, position: np.ndarray, start: np.ndarray, window: int,
+             rng: np.random.Generator) -> np.ndarray:
+    """For each row, a random one of the `window` rows before it in its group (-1 for a group's first)"""
+    available = np.minimum(position[rows] - start[rows], window)
+    offset = 1 + (rng.random(len(rows)) * available).astype(np.int64)
+    return np.where(available > 0, grouped[np.maximum(position[rows] - offset, 0)], -1)
+
+def generate_dependencies(tasks: Table, projects: list[dict], rng: np.random.Generator | None = None) -> Table:
+    """Dependency links for a task Table as a columnar Table (see module docstring)"""
+    rng = rng or default_rng()
+    n = len(tasks)
+    if n == 0:
+        return Table({name: StringColumn.nulls(0) for name in DEPENDENCY_COLUMNS})
+    cols = tasks.columns
+    created, completed, completed_at = cols["created_at"], cols["completed"], cols["completed_at"]
+    project = cols["project_id"].codes
+    team_of = {p["project_id"]: p.get("team_id") for p in projects}
+    team_index = {}
+    project_team = np.array([team_index.setdefault(team_of.get(p), len(team_index))
+                             for p in cols["project_id"].values], dtype=np.int64)
+    team = project_team[project]
+
+    # Creation order, ties broken by id: the topological order every link follows
+    ids = np.array(cols["task_id"].take(cols["task_id"].codes).tolist(), dtype="S")
+    order = np.argsort(ids, kind="stable")
+    order = order[np.argsort(created[order], kind="stable")]
+
+    by_project = _groups(order, project, len(cols["project_id"].values))
+    dependents = np.flatnonzero(rng.random(n) < DEPENDENCY_RATE)
+    dependents = dependents.repeat(rng.choice(BLOCKER_COUNTS, size=len(dependents), p=BLOCKER_COUNT_WEIGHTS))
+    blockers = _earlier(dependents, *by_project, DEPENDENCY_WINDOW, rng)
+
+    by_team = _groups(order, team, len(team_index))
+    crossing = np.flatnonzero(rng.random(n) < CROSS_PROJECT_DEPENDENCY_RATE)
+    cross_blockers = _earlier(crossing, *by_team, CROSS_PROJECT_WINDOW, rng)
+    other_project = (cross_blockers >= 0) & (project[np.maximum(cross_blockers, 0)] != project[crossing])
+
+    task = np.concatenate([dependents, crossing[other_project]])
+    blocker = np.concatenate([blockers, cross_blockers[other_project]])
+    keep = blocker >= 0
+    task, blocker = task[keep], blocker[keep]
+    # Done tasks were only blocked by tasks done before them
+    keep = ~completed[task] | (completed[blocker] & (completed_at[blocker] <= completed_at[task]))
+    key = np.unique(task[keep] * n + blocker[keep])
+    task, blocker = key // n, key % n
+
+    task_ids = cols["task_id"]
+    return Table({
+        "task_id": StringColumn(task_ids.values, task_ids.codes[task]),
+        "depends_on_id": StringColumn(task_ids.values, task_ids.codes[blocker]),
+        "created_at": created[task],  # Linked when the dependent task was created
+    })
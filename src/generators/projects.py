@@ -1,11 +1,28 @@
 from utils.id_generator import generate_id
 from utils.date_utils import random_date_between
-from utils.llm_utils import generate_with_llm
-from config import NUM_PROJECTS_PER_TEAM, SIMULATION_CURRENT_DATE
+from utils.llm_utils import generate_with_llm, generate_list_with_llm, record_llm_usage
+from utils.text_pool import TextPool
+from utils.table import StringColumn, Table
+from utils.seed import default_rng
+from utils.dedup import NearDuplicateFilter, diversify
+from config import (NUM_PROJECTS_PER_TEAM, SIMULATION_CURRENT_DATE, LLM_POOL_MODE, LLM_POOL_BATCH_SIZE,
+                    DEDUP_TEXT, DEDUP_MAX_ATTEMPTS, DEDUP_CAPACITY)
 import random
 from datetime import datetime, timedelta
+import numpy as np
 
 PROJECT_COLORS = ["red", "orange", "yellow", "green", "blue", "purple", "pink", "gray"]
+PRIVATE_PROJECT_RATE = 0.15  # Visible only to project members
+
+# Project members: the owner (admin), some of the team and, on cross-functional
+# projects, people from other teams; followers are members plus a few watchers
+PROJECT_MEMBER_ROLES = ["admin", "editor", "commenter", "viewer"]
+MEMBER_ROLE_WEIGHTS = [0.05, 0.70, 0.15, 0.10]
+TEAM_MEMBERS_PER_PROJECT = 6  # Poisson mean, besides the owner
+CROSS_FUNCTIONAL_RATE = 0.3  # Projects with members from other teams
+CROSS_TEAM_MEMBERS = (1, 6)  # Outside members on a cross-functional project
+MEMBER_FOLLOW_RATE = 0.5
+WATCHERS_PER_PROJECT = 2  # Poisson mean of followers who are not members
 
 def generate_project_name_llm(department: str, project_type: str, team_name: str) -> str:
     """Generate realistic project name using LLM"""
@@ -17,8 +34,47 @@ Return only the project name, no explanation."""
     
     return generate_with_llm(prompt, temperature=0.9)
 
-def generate_projects(teams: list[dict], users: list[dict], use_llm: bool = True) -> tuple[list[dict], list[dict]]:
-    """Generate projects and sections"""
+def _project_name_pool_prompt(key: tuple[str, str], n: int) -> str:
+    department, project_type = key
+    return f"""Generate {n} distinct, realistic project names for {department} teams.
+Project type: {project_type}
+Examples for Engineering: "Q1 2026 Sprint 3", "Payment Gateway Integration", "Mobile App Performance"
+Examples for Marketing: "Product Launch Campaign Q1", "SEO Optimization Initiative", "Brand Refresh 2026\""""
+
+# Pooled project names, keyed by (department, project type)
+PROJECT_NAME_POOL = TextPool(_project_name_pool_prompt, temperature=0.9)
+
+def generate_project_descriptions_llm(project_names: list[str], batch_size: int = LLM_POOL_BATCH_SIZE) -> list[str]:
+    """Generate 2-sentence descriptions for many projects, one LLM call per batch.
+
+    Responses must come back as a list aligned with the input; a batch whose
+    length doesn't match falls back to one call per project.
+    """
+    descriptions = []
+    for i in range(0, len(project_names), batch_size):
+        batch = project_names[i:i + batch_size]
+        numbered = "\n".join(f"{n + 1}. {name}" for n, name in enumerate(batch))
+        items = generate_list_with_llm(
+            f"Write a 2-sentence project description for each of these projects, in the same order:\n{numbered}",
+            len(batch)
+        )
+        items = [item.strip() for item in items]
+        if len(items) == len(batch) and all(items):
+            record_llm_usage(served=len(items))
+            descriptions.extend(items)
+        else:
+            descriptions.extend(
+                generate_with_llm(f"Write a 2-sentence project description for: {name}") for name in batch
+            )
+    return descriptions
+
+def generate_projects(teams: list[dict], users: list[dict], use_llm: bool = True,
+                      memberships: list[dict] | None = None) -> tuple[list[dict], list[dict]]:
+    """Generate projects and sections.
+
+    Owners are members of the project's team (of its department when no memberships are given).
+    Near-duplicate names within a team are regenerated, and no team repeats a name exactly.
+    """
     projects = []
     sections = []
     
@@ -29,6 +85,22 @@ def generate_projects(teams: list[dict], users: list[dict], use_llm: bool = True
         "Product & Design": ["Design System", "User Research", "Prototyping", "UX Audit", "Feature Design"]
     }
     
+    def make_name(department: str, project_type: str, team_name: str) -> str:
+        if use_llm and LLM_POOL_MODE:
+            return (PROJECT_NAME_POOL.draw((department, project_type))
+                    or generate_project_name_llm(department, project_type, team_name))
+        if use_llm:
+            return generate_project_name_llm(department, project_type, team_name)
+        base_name = random.choice(PROJECT_NAMES.get(department, ["Project"]))
+        return f"{base_name} {random.randint(1, 5)}"
+    
+    members_by_dept = {}
+    for user in users:
+        members_by_dept.setdefault(user["department"], []).append(user["user_id"])
+    members_by_team = {}
+    for membership in memberships or []:
+        members_by_team.setdefault(membership["team_id"], []).append(membership["user_id"])
+    
     for team in teams:
         department = team["department"]
         num_projects = random.randint(5, NUM_PROJECTS_PER_TEAM)
@@ -48,12 +120,7 @@ def generate_projects(teams: list[dict], users: list[dict], use_llm: bool = True
             else: 
                 project_type = random.choice(["initiative", "ongoing"])
             
-            # Generate name
-            if use_llm:
-                project_name = generate_project_name_llm(department, project_type, team["name"])
-            else:
-                base_name = random.choice(PROJECT_NAMES.get(department, ["Project"]))
-                project_name = f"{base_name} {random.randint(1, 5)}"
+            project_name = make_name(department, project_type, team["name"])
             
             # Status
             status = random.choices(
@@ -76,16 +143,13 @@ def generate_projects(teams: list[dict], users: list[dict], use_llm: bool = True
                 due_date = None
             
             # Owner (random team member)
-            team_members = [u["user_id"] for u in users if u["department"] == department]
+            team_members = members_by_team.get(team["team_id"]) or members_by_dept.get(department, [])
             owner_id = random.choice(team_members) if team_members else None
             
             project_id = generate_id()
             
-            # Generate description
-            if use_llm:
-                description = generate_with_llm(f"Write a 2-sentence project description for: {project_name}")
-            else:
-                description = f"Project for {department} team"
+            # Generate description (with the LLM, once names are final)
+            description = None if use_llm else f"Project for {department} team"
             
             projects.append({
                 "project_id": project_id,
@@ -100,7 +164,7 @@ def generate_projects(teams: list[dict], users: list[dict], use_llm: bool = True
                 "created_at": created_at,
                 "archived_at": None,
                 "color": random.choice(PROJECT_COLORS),
-                "privacy": "public"
+                "privacy": "private" if random.random() < PRIVATE_PROJECT_RATE else "public"
             })
             
             # Generate sections
@@ -120,4 +184,113 @@ def generate_projects(teams: list[dict], users: list[dict], use_llm: bool = True
                     "created_at": created_at
                 })
     
-    return projects, sections
\ No newline at end of file
+    if DEDUP_TEXT:
+        # Names are regenerated within their team, as task names are within their project
+        team_by_id = {team["team_id"]: team for team in teams}
+        def regenerate(k: int) -> str:
+            team = team_by_id[projects[k]["team_id"]]
+            return make_name(team["department"], projects[k]["project_type"], team["name"])
+        names, remaining = diversify([p["name"] for p in projects], regenerate,
+                                     NearDuplicateFilter(capacity=DEDUP_CAPACITY),
+                                     scopes=[p["team_id"] for p in projects], max_attempts=DEDUP_MAX_ATTEMPTS)
+        if remaining:
+            print(f"   {remaining} project names kept as near-duplicates after {DEDUP_MAX_ATTEMPTS} attempts")
+        for project, name in zip(projects, names):
+            project["name"] = name
+    
+    if use_llm and LLM_POOL_MODE:
+        descriptions = generate_project_descriptions_llm([p["name"] for p in projects])
+        for project, description in zip(projects, descriptions):
+            project["description"] = description
+    elif use_llm:
+        for project in projects:
+            project["description"] = generate_with_llm(f"Write a 2-sentence project description for: {project['name']}")
+    
+    return projects, sections
+
+def generate_project_memberships(projects: list[dict], users: list[dict], memberships: list[dict],
+                                 rng: np.random.Generator | None = None) -> tuple[Table, Table]:
+    """Project members and followers as columnar Tables, drawn for all projects at once.
+
+    Every project has its owner as admin and about TEAM_MEMBERS_PER_PROJECT
+    members of its team; cross-functional projects add members who are not in
+    the team. Followers are members (MEMBER_FOLLOW_RATE, owners always) plus,
+    on public projects, a few watchers from anywhere. Rows are sorted by
+    (project, user) and never repeat a pair.
+    """
+    rng = rng or default_rng()
+    now = np.datetime64(SIMULATION_CURRENT_DATE, "s")
+    user_ids = [u["user_id"] for u in users]
+    user_row = {user_id: i for i, user_id in enumerate(user_ids)}
+    n_users, n_projects = len(users), len(projects)
+    
+    # Team -> member rows (CSR), and the (team, user) pairs as sorted keys for membership tests
+    team_index = {}
+    pairs = np.array([(team_index.setdefault(m["team_id"], len(team_index)), user_row[m["user_id"]])
+                      for m in memberships if m["user_id"] in user_row], dtype=np.int64).reshape(-1, 2)
+    order = np.argsort(pairs[:, 0], kind="stable")
+    team_members = pairs[order, 1]
+    team_start = np.concatenate([[0], np.cumsum(np.bincount(pairs[:, 0], minlength=len(team_index)))])
+    team_keys = np.sort(pairs[:, 0] * n_users + pairs[:, 1])
+    
+    project_team = np.array([team_index.get(p["team_id"], -1) for p in projects], dtype=np.int64)
+    team_size = np.append(np.diff(team_start), 0)[project_team]  # -1 (no members) reads the trailing 0
+    start = np.append(team_start[:-1], 0)[project_team]
+    owner = np.array([user_row.get(p["owner_id"], -1) for p in projects], dtype=np.int64)
+    created = np.array([p["created_at"] for p in projects], dtype="datetime64[s]")
+    hired = np.array([u["created_at"] for u in users], dtype="datetime64[s]")
+    private = np.array([p["privacy"] == "private" for p in projects], dtype=bool)
+    
+    # Team members, sampled from the team (repeats dropped below)
+    count = np.where(team_size > 0, rng.poisson(TEAM_MEMBERS_PER_PROJECT, size=n_projects), 0)
+    team_proj = np.repeat(np.arange(n_projects), count)
+    pick = (rng.random(len(team_proj)) * team_size[team_proj]).astype(np.int64)
+    team_user = team_members[start[team_proj] + pick]
+    
+    # Cross-functional members: people from anywhere who are not in the project's team
+    cross = rng.random(n_projects) < CROSS_FUNCTIONAL_RATE
+    count = np.where(cross, rng.integers(CROSS_TEAM_MEMBERS[0], CROSS_TEAM_MEMBERS[1] + 1, size=n_projects), 0)
+    cross_proj = np.repeat(np.arange(n_projects), count)
+    cross_user = rng.integers(0, n_users, size=len(cross_proj))
+    keys = project_team[cross_proj] * n_users + cross_user
+    outside = ~np.isin(keys, team_keys) | (project_team[cross_proj] < 0)
+    cross_proj, cross_user = cross_proj[outside], cross_user[outside]
+    
+    # Owners first, so np.unique keeps their (admin) row when they were drawn again
+    has_owner = np.flatnonzero(owner >= 0)
+    proj = np.concatenate([has_owner, team_proj, cross_proj])
+    user = np.concatenate([owner[has_owner], team_user, cross_user])
+    role = np.concatenate([np.zeros(len(has_owner), dtype=np.int64),
+                           rng.choice(len(PROJECT_MEMBER_ROLES), size=len(team_proj) + len(cross_proj),
+                                      p=MEMBER_ROLE_WEIGHTS)])
+    key, first = np.unique(proj * n_users + user, return_index=True)
+    proj, user, role = key // n_users, key % n_users, role[first]
+    is_owner = first < len(has_owner)
+    
+    # Added when the project was created (owners) or later, once the member had joined the company
+    earliest = np.maximum(created[proj], hired[user])
+    span = np.maximum((now - earliest).astype(np.int64), 0)
+    joined = earliest + (rng.random(len(proj)) * span).astype("timedelta64[s]")
+    added_at = np.where(is_owner, created[proj], joined)
+    members = Table({
+        "project_id": StringColumn([p["project_id"] for p in projects], proj),
+        "user_id": StringColumn(user_ids, user),
+        "role": StringColumn(PROJECT_MEMBER_ROLES, role),
+        "added_at": added_at,
+    })
+    
+    # Followers: members (followed when added) and watchers of public projects
+    follows = is_owner | (rng.random(len(proj)) < MEMBER_FOLLOW_RATE)
+    count = np.where(private, 0, rng.poisson(WATCHERS_PER_PROJECT, size=n_projects))
+    watch_proj = np.repeat(np.arange(n_projects), count)
+    watch_user = rng.integers(0, n_users, size=len(watch_proj))
+    earliest = np.maximum(created[watch_proj], hired[watch_user])
+    span = np.maximum((now - earliest).astype(np.int64), 0)
+    watched_at = earliest + (rng.random(len(watch_proj)) * span).astype("timedelta64[s]")
+    key, first = np.unique(np.concatenate([key[follows], watch_proj * n_users + watch_user]), return_index=True)
+    followers = Table({
+        "project_id": StringColumn([p["project_id"] for p in projects], key // n_users),
+        "user_id": StringColumn(user_ids, key % n_users),
+        "followed_at": np.concatenate([added_at[follows], watched_at])[first],
+    })
+    return members, followers
@@ -0,0 +1,188 @@
+"""Activity log (stories) derived from each task's lifecycle.
+
+Every task gets a "created" story, then the changes that led to its current
+state: assignment (sometimes via an earlier assignee), section moves ending
+in its current section, a due-date edit ending at its current due date, and
+"completed" for done tasks. Values chain, so replaying a task's stories in
+time order reproduces its final assignee, section and due date.
+
+Stories are generated for a slice of tasks at a time (`iter_stories`), so
+the log can be inserted in bounded memory however many tasks there are.
+"""
+from utils.id_generator import generate_ids
+from utils.table import StringColumn, Table
+from utils.seed import default_rng
+from config import SIMULATION_CURRENT_DATE, STORY_CHUNK_TASKS
+import numpy as np
+
+STORY_COLUMNS = ["story_id", "task_id", "actor_id", "story_type", "old_value", "new_value", "created_at"]
+STORY_TYPES = ["created", "assigned", "section_changed", "due_date_changed", "completed"]
+CREATED, ASSIGNED, SECTION_CHANGED, DUE_DATE_CHANGED, COMPLETED = range(len(STORY_TYPES))
+
+REASSIGN_PROBABILITY = 0.15  # Assigned tasks that had a different assignee first
+SECTION_MOVE_CHOICES = np.array([0, 1, 2, 3])
+SECTION_MOVE_WEIGHTS = np.array([0.45, 0.35, 0.15, 0.05])
+DUE_DATE_CHANGE_PROBABILITY = 0.25
+DUE_DATE_SHIFT_DAYS = 14  # Earlier due dates were up to this many days off the final one
+FIRST_ASSIGNMENT_SECONDS = 86400  # First assignment within a day of creation
+
+def _as_table(tasks: list[dict]) -> Table:
+    """The task fields stories need, from dict rows (delta runs) as a Table"""
+    def strings(name):
+        return StringColumn.encode([t.get(name) for t in tasks])
+    def times(name, unit):
+        return np.array([t.get(name) or "NaT" for t in tasks], dtype=f"datetime64[{unit}]")
+    return Table({
+        "task_id": strings("task_id"), "project_id": strings("project_id"), "section_id": strings("section_id"),
+        "assignee_id": strings("assignee_id"), "created_by": strings("created_by"),
+        "completed_by": strings("completed_by"),
+        "created_at": times("created_at", "s"), "completed_at": times("completed_at", "s"),
+        "due_date": times("due_date", "D"),
+        "completed": np.array([bool(t.get("completed")) for t in tasks], dtype=bool),
+    })
+
+def _decode(col: StringColumn) -> np.ndarray:
+    return col.take(col.codes)
+
+def _story_table(task_ids: np.ndarray, task_idx: np.ndarray, actor: np.ndarray, story_type: np.ndarray,
+                 old_value: np.ndarray, new_value: np.ndarray, created_at: np.ndarray) -> Table:
+    """Stories sorted by task, then time (ties in STORY_TYPES order)"""
+    order = np.lexsort((story_type, created_at, task_idx))
+    return Table({
+        # Ascending within a chunk, so primary-key inserts walk the index in order
+        "story_id": StringColumn.unique(sorted(generate_ids(len(order)))),
+        "task_id": StringColumn(task_ids.tolist(), task_idx[order]),
+        "actor_id": StringColumn.encode(actor[order].tolist()),
+        "story_type": StringColumn(STORY_TYPES, story_type[order]),
+        "old_value": StringColumn.encode(old_value[order].tolist()),
+        "new_value": StringColumn.encode(new_value[order].tolist()),
+        "created_at": created_at[order],
+    })
+
+def generate_stories(tasks: Table | list[dict], sections_by_project: dict[str, list[str]], user_ids: list[str],
+                     rng: np.random.Generator | None = None, now: str | None = None) -> Table:
+    """Stories for a batch of tasks as a columnar Table (see module docstring).
+
+    `sections_by_project` maps project_id -> its section ids and `user_ids`
+    supplies earlier assignees; stories fall between each task's creation and
+    its completion (or `now`, the simulation date by default).
+    """
+    rng = rng or default_rng()
+    if not isinstance(tasks, Table):
+        tasks = _as_table(tasks)
+    n = len(tasks)
+    if n == 0:
+        return Table({name: StringColumn.nulls(0) for name in STORY_COLUMNS})
+    cols = tasks.columns
+    now = np.datetime64(now or SIMULATION_CURRENT_DATE, "s")
+
+    task_ids = _decode(cols["task_id"])
+    creator = _decode(cols["created_by"])
+    assignee = _decode(cols["assignee_id"])
+    completer = _decode(cols["completed_by"])
+    completer = np.where(completer == None, creator, completer)  # noqa: E711
+    worker = np.where(assignee == None, creator, assignee)  # noqa: E711
+    created = cols["created_at"].astype("datetime64[s]")
+    completed = cols["completed"].astype(bool)
+    end = np.where(completed, cols["completed_at"].astype("datetime64[s]"), now)
+    end = np.maximum(np.where(np.isnat(end), now, end), created)
+    span = (end - created).astype(np.int64)
+
+    # Each task's project sections, as runs of one flat array, and its final section's place in its run
+    projects = cols["project_id"]
+    project_sections = [sections_by_project.get(p, []) for p in projects.values]
+    flat_sections = np.array([s for run in project_sections for s in run], dtype=object)
+    run_length = np.array([len(run) for run in project_sections] + [0], dtype=np.int64)
+    run_start = np.cumsum(run_length) - run_length
+    n_sections = run_length[projects.codes]
+    first_section = run_start[projects.codes]
+    local = {(p, s): i for p, run in zip(projects.values, project_sections) for i, s in enumerate(run)}
+    section = _decode(cols["section_id"])
+    project = _decode(projects)
+    final_local = np.array([local.get((p, s), 0) for p, s in zip(project.tolist(), section.tolist())],
+                           dtype=np.int64)
+
+    parts = []
+
+    # Assignment: first within a day of creation; reassigned tasks had someone else first
+    assigned = assignee != None  # noqa: E711
+    reassigned = assigned & (rng.random(n) < REASSIGN_PROBABILITY)
+    earlier = np.array(user_ids, dtype=object)[rng.integers(0, len(user_ids), size=n)] if user_ids else assignee
+    first_at = created + (rng.random(n) * np.minimum(span, FIRST_ASSIGNMENT_SECONDS)).astype("timedelta64[s]")
+    idx = np.flatnonzero(assigned)
+    parts.append((idx, creator[idx], ASSIGNED, np.full(len(idx), None, dtype=object),
+                  np.where(reassigned, earlier, assignee)[idx], first_at[idx]))
+    idx = np.flatnonzero(reassigned)
+    handoff_at = first_at[idx] + (rng.random(len(idx)) * (end[idx] - first_at[idx]).astype(np.int64)
+                                  ).astype("timedelta64[s]")
+    parts.append((idx, earlier[idx], ASSIGNED, earlier[idx], assignee[idx], handoff_at))
+
+    # Section moves: sorted in time, chained backwards from the final section so
+    # consecutive sections differ; the created story records the starting section
+    moves = rng.choice(SECTION_MOVE_CHOICES, size=n, p=SECTION_MOVE_WEIGHTS)
+    moves[n_sections < 2] = 0
+    move_task = np.repeat(np.arange(n), moves)
+    offsets = rng.random(len(move_task))
+    offsets = offsets[np.argsort(move_task + offsets, kind="stable")]
+    step = 1 + (rng.random(len(move_task)) * (n_sections[move_task] - 1)).astype(np.int64)
+    group_total = np.bincount(move_task, weights=step, minlength=n).astype(np.int64)
+    group_offset = np.cumsum(group_total) - group_total
+    within = np.cumsum(step) - group_offset[move_task]  # Steps of this and earlier moves of the task
+    after = group_total[move_task] - within  # Steps of the later moves
+    size = np.maximum(n_sections[move_task], 1)
+    new_local = (final_local[move_task] + after) % size
+    old_local = (new_local + step) % size
+    base = first_section[move_task]
+    move_at = created[move_task] + (offsets * span[move_task]).astype("timedelta64[s]")
+    parts.append((move_task, worker[move_task], SECTION_CHANGED, flat_sections[base + old_local],
+                  flat_sections[base + new_local], move_at))
+    start_section = section.copy()
+    has_run = n_sections > 0
+    start_local = (final_local + group_total) % np.maximum(n_sections, 1)
+    start_section[has_run] = flat_sections[first_section[has_run] + start_local[has_run]]
+
+    # Due date edits: an earlier due date moved to the current one
+    due = cols["due_date"].astype("datetime64[D]")
+    idx = np.flatnonzero(~np.isnat(due) & (rng.random(n) < DUE_DATE_CHANGE_PROBABILITY))
+    shift = rng.integers(1, DUE_DATE_SHIFT_DAYS + 1, size=len(idx)) * rng.choice([-1, 1], size=len(idx))
+    parts.append((idx, worker[idx], DUE_DATE_CHANGED,
+                  np.datetime_as_string(due[idx] + shift.astype("timedelta64[D]")).astype(object),
+                  np.datetime_as_string(due[idx]).astype(object),
+                  created[idx] + (rng.random(len(idx)) * span[idx]).astype("timedelta64[s]")))
+
+    # Creation and completion bracket the rest
+    idx = np.arange(n)
+    parts.append((idx, creator, CREATED, np.full(n, None, dtype=object), start_section, created))
+    idx = np.flatnonzero(completed)
+    parts.append((idx, completer[idx], COMPLETED, np.full(len(idx), None, dtype=object),
+                  np.full(len(idx), None, dtype=object), end[idx]))
+
+    return _story_table(
+        task_ids,
+        np.concatenate([p[0] for p in parts]),
+        np.concatenate([p[1] for p in parts]),
+        np.concatenate([np.full(len(p[0]), p[2], dtype=np.int32) for p in parts]),
+        np.concatenate([p[3] for p in parts]),
+        np.concatenate([p[4] for p in parts]),
+        np.concatenate([p[5] for p in parts]),
+    )
+
+def iter_stories(tasks: Table, sections_by_project: dict[str, list[str]], user_ids: list[str],
+                 rng: np.random.Generator | None = None, chunk_size: int = STORY_CHUNK_TASKS):
+    """Story Tables for chunk_size tasks at a time, for streaming inserts"""
+    rng = rng or default_rng()
+    for start in range(0, len(tasks), chunk_size):
+        yield generate_stories(tasks.slice(start, start + chunk_size), sections_by_project, user_ids, rng)
+
+def completion_stories(completions: list[dict]) -> Table:
+    """"completed" stories for tasks closed by a delta run (completed_at/completed_by set)"""
+    n = len(completions)
+    if n == 0:
+        return Table({name: StringColumn.nulls(0) for name in STORY_COLUMNS})
+    task_ids = np.array([t["task_id"] for t in completions], dtype=object)
+    actor = np.array([t["completed_by"] for t in completions], dtype=object)
+    return _story_table(
+        task_ids, np.arange(n), actor, np.full(n, COMPLETED, dtype=np.int32),
+        np.full(n, None, dtype=object), np.full(n, None, dtype=object),
+        np.array([t["completed_at"] for t in completions], dtype="datetime64[s]"),
+    )
@@ -1,8 +1,15 @@
-from utils.id_generator import generate_id
-from utils.date_utils import generate_due_date_realistic, generate_completion_time, random_date_between
+from utils.id_generator import generate_ids
+from utils.date_utils import generate_due_dates, generate_completion_times
 from utils. llm_utils import generate_with_llm
-from config import TASKS_PER_PROJECT_RANGE, SIMULATION_CURRENT_DATE
-from datetime import datetime
+from utils.text_pool import TextPool
+from utils.table import StringColumn, Table
+from utils.seed import default_rng
+from utils.dedup import NearDuplicateFilter, diversify
+from utils.collaboration import CollaborationGraph
+from utils.positions import spaced_keys
+from config import (TASKS_PER_PROJECT_RANGE, SIMULATION_CURRENT_DATE, LLM_POOL_MODE,
+                    DEDUP_TEXT, DEDUP_MAX_ATTEMPTS, DEDUP_CAPACITY, GENERATOR_BATCH_PROJECTS)
+from typing import Iterator
 import random
 import numpy as np
 
@@ -100,26 +107,52 @@ TASK_COMPONENTS = {
     ]
 }
 
+# Realized-distribution targets; validate.py checks generated data against these
+ASSIGNMENT_RATE = 0.85
+COMPLETION_BASE_RATES = {"sprint": 0.75, "ongoing": 0.45}
+DEFAULT_COMPLETION_RATE = 0.65  # campaign, initiative
+COMPLETION_RAMP_DAYS = 30  # Tasks younger than this are less likely to be done
+PARETO_TOP_SHARE = (0.20, 0.50)  # Top 20% of assignees own at least 50% of assigned tasks
+PRIORITIES = ["low", "medium", "high", "urgent"]
+PRIORITY_WEIGHTS = [0.20, 0.50, 0.20, 0.10]
+
+TASK_NAME_EXAMPLES = """Engineering examples: "Implement OAuth2 authentication", "Fix memory leak in user service", "Add unit tests for API endpoints"
+Marketing examples: "Write blog post about Q1 features", "Design email campaign graphics", "Update landing page copy"
+Operations examples: "Review expense policy", "Prepare Q1 budget report", "Update onboarding procedures"
+Product examples: "Design checkout flow mockups", "Conduct user research on mobile app", "Create homepage prototype\""""
+
+def _task_name_pool_prompt(key: tuple[str, str], n: int) -> str:
+    department, project_name = key
+    return f"""Generate {n} distinct, realistic task names for project "{project_name}" in {department} department.
+{TASK_NAME_EXAMPLES}
+Each task name should be specific and different from the others."""
+
+# Pooled task names, keyed by (department, project name)
+TASK_NAME_POOL = TextPool(_task_name_pool_prompt)
+
 def generate_task_name(project_name: str, department:  str, use_llm: bool = True) -> str:
     """Generate realistic task name with LLM and fallback"""
     # Try LLM first (50% of the time if enabled)
     if use_llm and random.random() < 0.5:
-        try:
-            prompt = f"""Generate a realistic task name for project "{project_name}" in {department} department. 
-Engineering examples: "Implement OAuth2 authentication", "Fix memory leak in user service", "Add unit tests for API endpoints"
-Marketing examples: "Write blog post about Q1 features", "Design email campaign graphics", "Update landing page copy"
-Operations examples: "Review expense policy", "Prepare Q1 budget report", "Update onboarding procedures"
-Product examples: "Design checkout flow mockups", "Conduct user research on mobile app", "Create homepage prototype"
-Return only the task name, no explanation or quotes."""
-            
-            name = generate_with_llm(prompt, temperature=0.9)
-            # Validate LLM output
-            if name and len(name) > 5 and len(name) < 150:
-                # Clean up the response
-                name = name.strip().strip('"').strip("'")
+        if LLM_POOL_MODE:
+            # One pooled call serves many tasks of the same project
+            name = TASK_NAME_POOL.draw((department, project_name))
+            if name:
                 return name
-        except Exception as e:
-            print(f"   ⚠️  LLM generation failed: {e}")
+        else:
+            try:
+                prompt = f"""Generate a realistic task name for project "{project_name}" in {department} department. 
+{TASK_NAME_EXAMPLES}
+Return only the task name, no explanation or quotes."""
+                
+                name = generate_with_llm(prompt, temperature=0.9)
+                # Validate LLM output
+                if name and len(name) > 5 and len(name) < 150:
+                    # Clean up the response
+                    name = name.strip().strip('"').strip("'")
+                    return name
+            except Exception as e:
+                print(f"   ⚠️  LLM generation failed: {e}")
     
     # Fallback to templates
     templates = TASK_NAME_TEMPLATES.get(department, TASK_NAME_TEMPLATES["Engineering"])
@@ -180,157 +213,154 @@ Acceptance Criteria:
 • Documentation updated
 • Code review completed"""
 
-def generate_tasks(projects: list[dict], sections: list[dict], users: list[dict], use_llm: bool = True) -> list[dict]:
-    """Generate tasks for all projects"""
-    tasks = []
-    
-    # Group sections by project
+def generate_tasks(projects: list[dict], sections: list[dict], users: list[dict], use_llm: bool = True,
+                   rng: np.random.Generator | None = None, graph: CollaborationGraph | None = None) -> Table:
+    """Generate tasks for all projects as a columnar Table.
+
+    Creation dates, sections, assignees, due dates, completion and priority
+    are drawn for every task at once; only LLM names/descriptions are made
+    per task. Creators are members of the project's team and assignees their
+    collaborators in `graph` (built from `users` alone if not given). Names
+    that are near-duplicates of another name in the same project are
+    regenerated (see `utils.dedup`). Ids repeated across tasks (project,
+    section, users) are stored once in dictionary-encoded columns.
+    """
+    print(f"   Generating tasks for {len(projects)} projects...")
+    tasks = _generate_tasks(projects, sections, users, use_llm, rng, graph, *_user_lookups(users))
+    print(f"   ✓ Generated {len(tasks)} tasks total")
+    return tasks
+
+def iter_tasks(projects: list[dict], sections: list[dict], users: list[dict], use_llm: bool = True,
+               rng: np.random.Generator | None = None, graph: CollaborationGraph | None = None,
+               batch_projects: int = GENERATOR_BATCH_PROJECTS) -> Iterator[Table]:
+    """generate_tasks for batch_projects projects at a time, so a batch can be written while the next is made"""
+    rng = rng or default_rng()
+    graph = graph or (CollaborationGraph.build(users, rng=rng) if users else None)
+    user_ids, user_departments = _user_lookups(users)  # Shared by every batch
     sections_by_project = {}
     for section in sections:
-        pid = section["project_id"]
-        if pid not in sections_by_project:
-            sections_by_project[pid] = []
-        sections_by_project[pid].append(section)
+        sections_by_project.setdefault(section["project_id"], []).append(section)
+    print(f"   Generating tasks for {len(projects)} projects, {batch_projects} at a time...")
+    for start in range(0, len(projects), batch_projects):
+        batch = projects[start:start + batch_projects]
+        batch_sections = [s for p in batch for s in sections_by_project.get(p["project_id"], [])]
+        yield _generate_tasks(batch, batch_sections, users, use_llm, rng, graph, user_ids, user_departments)
+
+def _user_lookups(users: list[dict]) -> tuple[list[str], dict[str, str]]:
+    """User ids, and user id -> department"""
+    return [u["user_id"] for u in users], {u["user_id"]: u["department"] for u in users}
+
+def _generate_tasks(projects: list[dict], sections: list[dict], users: list[dict], use_llm: bool,
+                    rng: np.random.Generator | None, graph: CollaborationGraph | None,
+                    user_ids: list[str], user_departments: dict[str, str]) -> Table:
+    rng = rng or default_rng()
+    now = np.datetime64(SIMULATION_CURRENT_DATE, "s")
     
-    # Group users by department
-    users_by_dept = {}
-    for user in users:
-        dept = user["department"]
-        if dept not in users_by_dept:
-            users_by_dept[dept] = []
-        users_by_dept[dept].append(user)
+    # Sections of each project, as runs of one flat index array
+    section_ids = [s["section_id"] for s in sections]
+    sections_by_project = {}
+    for i, section in enumerate(sections):
+        sections_by_project.setdefault(section["project_id"], []).append(i)
+    projects = [p for p in projects if sections_by_project.get(p["project_id"])]
     
-    print(f"   Generating tasks for {len(projects)} projects...")
+    if not projects or not users:
+        return Table({})
+    graph = graph or CollaborationGraph.build(users, rng=rng)
     
-    for idx, project in enumerate(projects):
-        if idx % 10 == 0:
-            print(f"   Progress: {idx}/{len(projects)} projects processed")
-        
-        project_id = project["project_id"]
-        project_sections = sections_by_project.get(project_id, [])
-        
-        if not project_sections:
-            continue
-        
-        # Number of tasks
-        num_tasks = random. randint(*TASKS_PER_PROJECT_RANGE)
-        
-        # Get department and team users
-        department = get_department_from_project(project, users)
-        team_users = users_by_dept.get(department, [])
-        
-        # Fallback to all users if no team users found
-        if not team_users: 
-            team_users = users
-        
-        if not team_users:
-            print(f"   ⚠️  No users available for project {project['name']}")
-            continue
-
-        for _ in range(num_tasks):
-            # Created date within project lifetime
-            created_at = random_date_between(project["created_at"], SIMULATION_CURRENT_DATE)
-            
-            # Section assignment (distribute across sections)
-            section = random.choice(project_sections)
-            
-            # Assignee (85% assigned, Pareto distribution)
-            assignee_id = None
-            if team_users and random.random() < 0.85:
-                assignee_ids = [u["user_id"] for u in team_users]
-                if len(assignee_ids) == 1:
-                    assignee_id = assignee_ids[0]
-                else: 
-                    assignee_id = np.random.choice(
-                        assignee_ids,
-                        p=generate_pareto_weights(len(assignee_ids))
-                    )
-            
-            # Due date
-            due_date = generate_due_date_realistic(created_at)
-            
-            # Completion status
-            task_age_days = (datetime.fromisoformat(SIMULATION_CURRENT_DATE) - datetime.fromisoformat(created_at)).days
-            
-            # Completion probability:  older tasks more likely complete
-            if project["project_type"] == "sprint":  
-                base_completion_rate = 0.75
-            elif project["project_type"] == "ongoing":
-                base_completion_rate = 0.45
-            else:
-                base_completion_rate = 0.65
-            
-            # Age factor: older = more likely done
-            age_factor = min(1.0, max(0, task_age_days) / 30)
-            completion_prob = base_completion_rate * (0.5 + 0.5 * age_factor)
-            
-            completed = random. random() < completion_prob
-            
-            if completed:
-                completed_at = generate_completion_time(created_at)
-                completed_by = assignee_id
-            else: 
-                completed_at = None
-                completed_by = None
-            
-            # Priority
-            priority = random.choices(
-                ["low", "medium", "high", "urgent"],
-                weights=[0.20, 0.50, 0.20, 0.10]
-            )[0]
-            
-            # Generate content
-            if use_llm:
-                task_name = generate_task_name(project["name"], department)
-                task_description = generate_task_description(task_name)
-            else:
-                task_name = f"Task {random.randint(1, 1000)}"
-                task_description = f"Description for {project['name']}"
-            
-            # Creator
-            created_by = random.choice(team_users)["user_id"]
-            
-            tasks.append({
-                "task_id": generate_id(),
-                "project_id": project_id,
-                "section_id": section["section_id"],
-                "parent_task_id": None,  # Top-level task
-                "name":  task_name,
-                "description": task_description,
-                "assignee_id": assignee_id,
-                "due_date": due_date,
-                "start_date": None,
-                "created_at": created_at,
-                "created_by":  created_by,
-                "completed": completed,
-                "completed_at": completed_at,
-                "completed_by": completed_by,
-                "priority": priority,
-                "num_likes": random.randint(0, 5) if random.random() < 0.3 else 0,
-                "num_subtasks":  0,
-                "num_comments": 0
-            })
+    departments = [get_department_from_project(p, user_departments) for p in projects]
+    counts = np.array([random.randint(*TASKS_PER_PROJECT_RANGE) for _ in projects])
+    n = int(counts.sum())
+    project_idx = np.repeat(np.arange(len(projects)), counts)
     
-    print(f"   ✓ Generated {len(tasks)} tasks total")
+    # Created date: whole days after the project's creation, up to the simulation date
+    project_created = np.array([p["created_at"] for p in projects], dtype="datetime64[s]")
+    span_days = np.maximum((now - project_created) // np.timedelta64(1, "D"), 0)
+    days = (rng.random(n) * (span_days[project_idx] + 1)).astype(np.int64)
+    created_at = project_created[project_idx] + (days * 86400).astype("timedelta64[s]")
+    
+    # Section: uniform over the project's sections
+    section_order = np.concatenate([sections_by_project[p["project_id"]] for p in projects])
+    section_counts = np.array([len(sections_by_project[p["project_id"]]) for p in projects])
+    section_start = np.cumsum(section_counts) - section_counts
+    section_code = section_order[
+        section_start[project_idx] + (rng.random(n) * section_counts[project_idx]).astype(np.int64)
+    ]
+    
+    # Creator: a member of the project's team (the owner's team if it has none); assignee (85%):
+    # one of the creator's collaborators, so work stays mostly in-team and skews to active members
+    team = graph.teams([p.get("team_id") for p in projects])
+    owner = graph.rows([p.get("owner_id") for p in projects])
+    team = np.where(team >= 0, team, np.where(owner >= 0, graph.home[np.maximum(owner, 0)], -1))
+    creator_code = graph.sample_members(team[project_idx], rng).astype(np.int32)
+    assigned = rng.random(n) < ASSIGNMENT_RATE
+    assignee_code = np.where(assigned, graph.sample(creator_code, rng), -1).astype(np.int32)
+    
+    # Board order within each section: oldest first, on evenly spaced fractional keys
+    by_section = np.lexsort((created_at, section_code))
+    section_size = np.bincount(section_code, minlength=len(section_ids))
+    rank = np.empty(n, dtype=np.int64)
+    rank[by_section] = np.arange(n) - np.repeat(np.cumsum(section_size) - section_size, section_size)
+    position = spaced_keys(rank, section_size[section_code])
+    
+    due_date = generate_due_dates(created_at, rng)
+    
+    # Completion: older tasks more likely done; work finishing after the simulation date is open
+    base_rate = np.array([COMPLETION_BASE_RATES.get(p["project_type"], DEFAULT_COMPLETION_RATE) for p in projects])
+    age_days = np.maximum((now - created_at) // np.timedelta64(1, "D"), 0)
+    age_factor = np.minimum(1.0, age_days / COMPLETION_RAMP_DAYS)
+    completion_prob = base_rate[project_idx] * (0.5 + 0.5 * age_factor)
+    completed_at = generate_completion_times(created_at, rng)
+    completed = (rng.random(n) < completion_prob) & (completed_at <= now)
+    completed_at[~completed] = np.datetime64("NaT")
+    completed_by = np.where(completed, assignee_code, -1)
+    
+    priority = rng.choice(len(PRIORITIES), size=n, p=PRIORITY_WEIGHTS)
+    num_likes = np.where(rng.random(n) < 0.3, rng.integers(0, 6, size=n), 0)
+    
+    # Content: task names, with near-duplicates in the same project regenerated
+    def make_name(k: int) -> str:
+        i = project_idx[k]
+        return generate_task_name(projects[i]["name"], departments[i], use_llm=use_llm)
+    names = [make_name(k) for k in range(n)]
+    if DEDUP_TEXT:
+        names, remaining = diversify(names, make_name, NearDuplicateFilter(capacity=DEDUP_CAPACITY),
+                                     scopes=project_idx.tolist(), max_attempts=DEDUP_MAX_ATTEMPTS)
+        if remaining:
+            print(f"   {remaining} task names kept as near-duplicates after {DEDUP_MAX_ATTEMPTS} attempts")
+    name = StringColumn.encode(names)
+    if use_llm:
+        description = StringColumn.encode([generate_task_description(task_name) for task_name in names])
+    else:
+        description = StringColumn([f"Description for {p['name']}" for p in projects], project_idx)
+    
+    tasks = Table({
+        "task_id": StringColumn.unique(generate_ids(n)),
+        "project_id": StringColumn([p["project_id"] for p in projects], project_idx),
+        "section_id": StringColumn(section_ids, section_code),
+        "position": StringColumn.encode(np.char.decode(position, "ascii").tolist()),
+        "parent_task_id": StringColumn.nulls(n),  # Top-level tasks
+        "name": name,
+        "description": description,
+        "assignee_id": StringColumn(user_ids, assignee_code),
+        "due_date": due_date,
+        "start_date": np.full(n, np.datetime64("NaT"), dtype="datetime64[D]"),
+        "created_at": created_at,
+        "created_by": StringColumn(user_ids, creator_code),
+        "completed": completed,
+        "completed_at": completed_at,
+        "completed_by": StringColumn(user_ids, completed_by),
+        "priority": StringColumn(PRIORITIES, priority),
+        "num_likes": num_likes.astype(np.int32),
+        "num_subtasks": np.zeros(n, dtype=np.int32),
+        "num_comments": np.zeros(n, dtype=np.int32)
+    })
     return tasks
 
-def get_department_from_project(project: dict, users: list) -> str:
-    """Get department from project owner"""
+def get_department_from_project(project: dict, user_departments: dict[str, str]) -> str:
+    """Get department from project owner (user_departments: user_id -> department)"""
     owner_id = project.get("owner_id")
-    if owner_id:
-        owner = next((u for u in users if u["user_id"] == owner_id), None)
-        if owner:
-            return owner["department"]
+    if owner_id in user_departments:
+        return user_departments[owner_id]
     
     # Fallback to Engineering if no owner found
     return "Engineering"
-
-def generate_pareto_weights(n: int) -> np.ndarray:
-    """Generate Pareto distribution (80/20 rule)"""
-    if n <= 0:
-        return np.array([])
-    if n == 1:
-        return np. array([1.0])
-    
-    weights = np.array([1.0 / (i + 1) ** 1.5 for i in range(n)])
-    return weights / weights.sum()
\ No newline at end of file
@@ -1,9 +1,8 @@
-from utils.id_generator import generate_id
-from utils.date_utils import random_date_between
-from scrapers.names import generate_realistic_name
+from utils.id_generator import generate_ids
+from utils.seed import default_rng
+from scrapers.names import generate_names, generate_unique_emails
 from config import TARGET_EMPLOYEE_COUNT, COMPANY_FOUNDING_DATE, SIMULATION_CURRENT_DATE, DEPT_DISTRIBUTION
-import random
-from datetime import datetime, timedelta
+import numpy as np
 
 JOB_TITLES = {
     "Engineering": [
@@ -30,91 +29,112 @@ JOB_TITLES = {
     ]
 }
 
-def generate_users(org_id:   str, company_domain: str, teams: list, target_count: int = TARGET_EMPLOYEE_COUNT):
-    """Generate users and team memberships"""
-    users = []
-    memberships = []
-    email_counter = {}  # Track email usage to prevent duplicates
+# Team memberships: every user has a home team; the number of teams per user is
+# heavy-tailed (Zipf), extra teams mostly in the user's own department
+TEAMS_PER_USER_ZIPF = 2.5  # P(k teams) ~ k ** -2.5: ~75% in one team, a few in many
+MAX_TEAMS_PER_USER = 8
+SAME_DEPARTMENT_SHARE = 0.7  # Extra teams in the user's department
+TEAM_ADMIN_RATE = 0.1
+
+# Last active: (share of users, days before the simulation date)
+LAST_ACTIVE_BUCKETS = [(0.90, (0, 7)), (0.05, (8, 30)), (0.05, (31, 90))]
+
+def generate_users(org_id: str, company_domain: str, teams: list, target_count: int = TARGET_EMPLOYEE_COUNT,
+                   rng: np.random.Generator | None = None) -> tuple[list[dict], list[dict]]:
+    """Generate users and team memberships.
+
+    Users are spread over their department's teams as home teams; extra
+    memberships (see TEAMS_PER_USER_ZIPF) are drawn for all users at once.
+    Each user's home membership comes first in the memberships list.
+    """
+    rng = rng or default_rng()
     
     # Group teams by department
     teams_by_dept = {}
-    for team in teams:  
-        dept = team["department"]
-        if dept not in teams_by_dept:
-            teams_by_dept[dept] = []
-        teams_by_dept[dept]. append(team)
+    for i, team in enumerate(teams):
+        teams_by_dept.setdefault(team["department"], []).append(i)
     
     print(f"   Generating {target_count} users across departments...")
     
-    # Generate users distributed across departments
+    # Users per team for each department
+    dept_plan = {}
     for department, team_list in teams_by_dept.items():
-        dept_percentage = DEPT_DISTRIBUTION[department]
-        dept_user_count = int(target_count * dept_percentage)
-        
-        if not team_list:
-            print(f"   ⚠️  No teams found for {department}")
-            continue
-        
-        users_per_team = max(1, dept_user_count // len(team_list))
-        
+        dept_user_count = int(target_count * DEPT_DISTRIBUTION[department])
+        dept_plan[department] = max(1, dept_user_count // len(team_list))
         print(f"   {department}: {dept_user_count} users across {len(team_list)} teams")
-        
-        for team in team_list: 
-            for _ in range(users_per_team):
-                first_name, last_name = generate_realistic_name()
-                user_id = generate_id()
-                
-                # Generate unique email
-                base_email = f"{first_name.lower()}.{last_name.lower()}@{company_domain}"
-                
-                # Check if email already exists
-                if base_email in email_counter:
-                    email_counter[base_email] += 1
-                    email = f"{first_name.lower()}.{last_name.lower()}{email_counter[base_email]}@{company_domain}"
-                else:
-                    email_counter[base_email] = 0
-                    email = base_email
-                
-                # Hiring date distribution
-                hiring_date = random_date_between(
-                    COMPANY_FOUNDING_DATE,
-                    SIMULATION_CURRENT_DATE
-                )
-                
-                # Last active:    90% within last week
-                rand = random.random()
-                now = datetime.fromisoformat(SIMULATION_CURRENT_DATE)
-                if rand < 0.90:
-                    last_active = now - timedelta(days=random.randint(0, 7))
-                elif rand < 0.95:
-                    last_active = now - timedelta(days=random.randint(8, 30))
-                else:
-                    last_active = now - timedelta(days=random.randint(31, 90))
-                
-                users.append({
-                    "user_id": user_id,
-                    "org_id": org_id,
-                    "email": email,  # Use unique email
-                    "first_name":   first_name,
-                    "last_name": last_name,
-                    "job_title":  random.choice(JOB_TITLES[department]),
-                    "department":  department,
-                    "profile_photo_url":  f"https://i.pravatar.cc/150?u={user_id}",
-                    "created_at": hiring_date,
-                    "last_active":  last_active.  isoformat(),
-                    "is_active":  True
-                })
-                
-                # Add team membership
-                memberships.append({
-                    "membership_id": generate_id(),
-                    "team_id": team["team_id"],
-                    "user_id": user_id,
-                    "role": "member" if random.random() > 0.1 else "admin",
-                    "joined_at": hiring_date
-                })
     
+    # Home team of every user, in department then team order
+    home = np.concatenate([np.repeat(team_list, dept_plan[dept]) for dept, team_list in teams_by_dept.items()])
+    n = len(home)
+    departments = [team["department"] for team in teams]
+    
+    # Draw every name up front and resolve email collisions in one pass
+    first_names, last_names = generate_names(n)
+    emails = generate_unique_emails(first_names, last_names, company_domain)
+    user_ids = generate_ids(n)
+    
+    # Hiring date (whole days since founding) and last activity before the simulation date
+    now = np.datetime64(SIMULATION_CURRENT_DATE, "D")
+    founded = np.datetime64(COMPANY_FOUNDING_DATE, "D")
+    hired = founded + rng.integers(0, (now - founded).astype(np.int64) + 1, size=n).astype("timedelta64[D]")
+    bucket = rng.choice(len(LAST_ACTIVE_BUCKETS), size=n, p=[share for share, _ in LAST_ACTIVE_BUCKETS])
+    low = np.array([days[0] for _, days in LAST_ACTIVE_BUCKETS])[bucket]
+    high = np.array([days[1] for _, days in LAST_ACTIVE_BUCKETS])[bucket]
+    last_active = now - rng.integers(low, high + 1).astype("timedelta64[D]")
+    hired_at = np.datetime_as_string(hired.astype("datetime64[s]")).tolist()
+    last_active_at = np.datetime_as_string(last_active.astype("datetime64[s]")).tolist()
+    user_departments = [departments[t] for t in home.tolist()]
+    titles = [JOB_TITLES[d][int(r * len(JOB_TITLES[d]))] for d, r in zip(user_departments, rng.random(n).tolist())]
+    
+    users = [{
+        "user_id": user_ids[i],
+        "org_id": org_id,
+        "email": emails[i],  # Use unique email
+        "first_name": first_names[i],
+        "last_name": last_names[i],
+        "job_title": titles[i],
+        "department": user_departments[i],
+        "profile_photo_url": f"https://i.pravatar.cc/150?u={user_ids[i]}",
+        "created_at": hired_at[i],
+        "last_active": last_active_at[i],
+        "is_active": True
+    } for i in range(n)]
+    
+    # Extra teams: same department (SAME_DEPARTMENT_SHARE) or any team, never the home team twice
+    dept_index = {dept: k for k, dept in enumerate(teams_by_dept)}
+    dept_teams = np.concatenate(list(teams_by_dept.values()))
+    dept_size = np.array([len(t) for t in teams_by_dept.values()])
+    dept_start = np.cumsum(dept_size) - dept_size
+    user_dept = np.array([dept_index[d] for d in departments])[home]
+    extra = np.minimum(rng.zipf(TEAMS_PER_USER_ZIPF, size=n), MAX_TEAMS_PER_USER) - 1
+    member = np.repeat(np.arange(n), extra)
+    same = rng.random(len(member)) < SAME_DEPARTMENT_SHARE
+    local = (rng.random(len(member)) * dept_size[user_dept[member]]).astype(np.int64)
+    team = np.where(same, dept_teams[dept_start[user_dept[member]] + local],
+                    rng.integers(0, len(teams), size=len(member)))
+    keep = team != home[member]
+    key = np.unique(member[keep] * len(teams) + team[keep])
+    member, team = np.concatenate([np.arange(n), key // len(teams)]), np.concatenate([home, key % len(teams)])
+    
+    # Joined when hired for the home team, otherwise between hiring (or the team's creation) and now
+    team_created = np.array([t["created_at"] for t in teams], dtype="datetime64[s]")
+    earliest = np.maximum(hired.astype("datetime64[s]")[member], team_created[team])
+    span = np.maximum((now.astype("datetime64[s]") - earliest).astype(np.int64), 0)
+    joined = earliest + (rng.random(len(member)) * span).astype("timedelta64[s]")
+    joined[:n] = hired.astype("datetime64[s]")
+    joined_at = np.datetime_as_string(joined).tolist()
+    admin = (rng.random(len(member)) < TEAM_ADMIN_RATE).tolist()
+    membership_ids = generate_ids(len(member))
+    memberships = [{
+        "membership_id": membership_ids[k],
+        "team_id": teams[t]["team_id"],
+        "user_id": user_ids[u],
+        "role": "admin" if admin[k] else "member",
+        "joined_at": joined_at[k]
+    } for k, (u, t) in enumerate(zip(member.tolist(), team.tolist()))]
+    
+    multi = len(set(member[n:].tolist()))
     print(f"   ✓ Generated {len(users)} users")
-    print(f"   ✓ Generated {len(memberships)} team memberships")
+    print(f"   ✓ Generated {len(memberships)} team memberships ({multi} users in more than one team)")
     
-    return users, memberships
\ No newline at end of file
+    return users, memberships
@@ -1,20 +1,93 @@
+import argparse
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add src to path
 sys. path.insert(0, str(Path(__file__).parent))
 
-from database import Database
-from config import DB_PATH, TARGET_EMPLOYEE_COUNT
+from writer import DatabaseWriter
+from aggregates import build_aggregates, install_triggers
+from search import build_search_index
+from dependencies import build_dependency_summary
+from build_cache import BuildCache, stage_keys, database_key
+from utils.seed import seed_stage
+from utils.collaboration import CollaborationGraph
+from utils.table import Table
+from config import DB_PATH, TARGET_EMPLOYEE_COUNT, SIMULATION_CURRENT_DATE, SEARCH_INDEX, SEED, BUILD_CACHE
 from generators.organizations import generate_organization
 from generators.teams import generate_teams
 from generators. users import generate_users
-from generators.projects import generate_projects
-from generators.tasks import generate_tasks
-from generators.comments import generate_comments
+from generators.projects import generate_projects, generate_project_memberships
+from generators.tasks import iter_tasks
+from generators.comments import iter_comments
+from generators.stories import iter_stories
+from generators.dependencies import generate_dependencies
+
+def report_llm_health(result: tuple[bool, str]) -> bool:
+    """Print the outcome of the background API check; True if LLM can be used"""
+    ok, message = result
+    print("🔑 OpenAI API connection check...")
+    if ok:
+        print(f"   ✓ API connection successful!  Response: '{message[: 50]}'")
+        print("   ✓ LLM features ENABLED")
+    else:
+        print(f"   ❌ API connection failed: {message}")
+        print("   ⚠️  LLM features will be DISABLED (using templates only)")
+    print()
+    return ok
+
+def run_stage(name: str, build, cache: BuildCache | None, keys: dict, seed: int | None):
+    """A stage's output from the build cache when its key matches, else built (seeded per stage) and cached"""
+    if cache is not None:
+        cached = cache.load_object(keys[name])
+        if cached is not None:
+            print(f"   ♻️  Loaded {name} from build cache")
+            return cached
+    seed_stage(seed, name)
+    result = build()
+    if cache is not None:
+        cache.store_object(keys[name], result)
+    return result
+
+def restore_database(cache: BuildCache, keys: dict) -> bool:
+    """Restore the finished database from the build cache when its key matches"""
+    db_key = database_key(keys)
+    if not cache.restore_file(db_key, DB_PATH):
+        return False
+    print(f"♻️  Restored database from build cache ({db_key})")
+    print("🎉 All done! Database ready at:", DB_PATH)
+    return True
+
+def stream_stage(name: str, table: str, build, writer: DatabaseWriter, cache: BuildCache | None, keys: dict,
+                 seed: int | None) -> Table:
+    """run_stage for a stage built as a stream of Tables, each queued for writing as soon as it is made"""
+    if cache is not None:
+        cached = cache.load_object(keys[name])
+        if cached is not None:
+            print(f"   ♻️  Loaded {name} from build cache")
+            writer.write_stream(table, [cached])
+            return cached
+    seed_stage(seed, name)
+    chunks = []
+    def produced():
+        for chunk in build():
+            chunks.append(chunk)
+            yield chunk
+    writer.write_stream(table, produced())
+    result = Table.concat(chunks)
+    if cache is not None:
+        cache.store_object(keys[name], result)
+    return result
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate the Asana seed database")
+    parser.add_argument("--seed", type=int, default=SEED, help=f"Random seed (default {SEED})")
+    parser.add_argument("--no-cache", action="store_true", help="Regenerate every stage and skip the build cache")
+    args = parser.parse_args()
+    seed = args.seed
+    
     print("=" * 60)
     print("ASANA RL ENVIRONMENT - SEED DATA GENERATOR")
     print("=" * 60)
@@ -24,6 +97,7 @@ def main():
     print("🔑 Checking OpenAI API configuration...")
     api_key = os.getenv("OPENAI_API_KEY")
     
+    health_check = None
     if not api_key: 
         print("   ❌ OPENAI_API_KEY not found in environment variables")
         print("   ⚠️  LLM features will be DISABLED")
@@ -35,57 +109,77 @@ def main():
         key_preview = f"{api_key[:10]}... {api_key[-4:]}" if len(api_key) > 14 else "***"
         print(f"   ✓ OpenAI API key found: {key_preview}")
         
-        # Test API connection with a simple call
-        try:
-            from utils. llm_utils import generate_with_llm
-            print("   🧪 Testing OpenAI API connection...")
-            test_response = generate_with_llm("Say 'OK'", temperature=0.5)
-            
-            if test_response: 
-                print(f"   ✓ API connection successful!  Response: '{test_response[: 50]}'")
-                print("   ✓ LLM features ENABLED")
-                use_llm = True
-            else:
-                print("   ⚠️  API returned empty response")
-                print("   ⚠️  LLM features will be DISABLED (using templates only)")
-                use_llm = False
-        except Exception as e:
-            print(f"   ❌ API connection failed: {str(e)[:100]}")
-            print("   ⚠️  LLM features will be DISABLED (using templates only)")
-            use_llm = False
-    print()
-    
-    # Initialize database
+        # Test the API connection in the background while the early,
+        # LLM-free stages (org, teams, users) run; wait only before projects
+        from utils.llm_utils import check_llm_connection
+        print("   🧪 Testing OpenAI API connection in the background...")
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-health")
+        health_check = executor.submit(check_llm_connection)
+        executor.shutdown(wait=False)
+        use_llm = False
+    print()
+    
+    # Build cache: only seeded runs are reproducible, so only they are cached. Later stage keys
+    # depend on whether the LLM is used; the organization, teams and users keys do not, so while
+    # the health check runs those stages are keyed as if it had failed, and everything after is
+    # keyed once it resolves
+    cache, keys = None, {}
+    if BUILD_CACHE and not args.no_cache and seed is not None:
+        cache = BuildCache()
+        keys = stage_keys(seed, use_llm)
+        if health_check is None and restore_database(cache, keys):
+            return
+    
+    # Initialize database; from here on a background thread owns the connection and
+    # writes each stage's rows while the next stage is generated
     print("📦 Initializing database...")
-    db = Database(DB_PATH)
-    db.connect()
-    db.initialize_schema()
+    writer = DatabaseWriter(DB_PATH).start()
+    writer.run(lambda db: db.initialize_schema())
     print()
     
     # Generate organization
     print("🏢 Generating organization...")
-    org = generate_organization()
-    db.insert_batch("organizations", [org])
+    with writer.stage("organization"):
+        org = run_stage("organization", generate_organization, cache, keys, seed)
+        writer.write("organizations", [org])
     print(f"   Company: {org['name']}")
     print(f"   Domain: {org['domain']}")
     print()
     
     # Generate teams
     print("👥 Generating teams...")
-    teams = generate_teams(org["org_id"])
-    db.insert_batch("teams", teams)
+    with writer.stage("teams"):
+        teams = run_stage("teams", lambda: generate_teams(org["org_id"]), cache, keys, seed)
+        writer.write("teams", teams)
     print(f"   ✓ Created {len(teams)} teams across departments")
     print()
     
     # Generate users and memberships
     print("🧑‍💼 Generating users and team memberships...")
-    users, memberships = generate_users(org["org_id"], org["domain"], teams, TARGET_EMPLOYEE_COUNT)
-    db.insert_batch("users", users)
-    db.insert_batch("team_memberships", memberships)
+    with writer.stage("users"):
+        users, memberships = run_stage(
+            "users", lambda: generate_users(org["org_id"], org["domain"], teams, TARGET_EMPLOYEE_COUNT),
+            cache, keys, seed
+        )
+        writer.write("users", users)
+        writer.write("team_memberships", memberships)
+        # Who works with whom: drives task creators, assignees and commenters
+        seed_stage(seed, "collaboration")
+        graph = CollaborationGraph.build(users, memberships)
     print(f"   ✓ Created {len(users)} users")
     print(f"   ✓ Created {len(memberships)} team memberships")
     print()
     
+    if health_check is not None:
+        use_llm = report_llm_health(health_check.result())
+        if cache is not None:
+            keys = stage_keys(seed, use_llm)
+            if database_key(keys) in cache:
+                # The finished database is cached after all: drop the partial build and restore it
+                writer.close()
+                if restore_database(cache, keys):
+                    return
+    
     # Generate projects and sections
     print("📁 Generating projects and sections...")
     if use_llm:
@@ -93,11 +187,21 @@ def main():
     else:
         print("   📝 Using templates for project name generation...")
     
-    projects, sections = generate_projects(teams, users, use_llm=use_llm)
-    db.insert_batch("projects", projects)
-    db.insert_batch("sections", sections)
+    def build_projects():
+        projects, sections = generate_projects(teams, users, use_llm=use_llm, memberships=memberships)
+        return (projects, sections) + generate_project_memberships(projects, users, memberships)
+    
+    with writer.stage("projects"):
+        projects, sections, project_members, project_followers = run_stage(
+            "projects", build_projects, cache, keys, seed
+        )
+        writer.write("projects", projects)
+        writer.write("sections", sections)
+        writer.write("project_memberships", project_members)
+        writer.write("project_followers", project_followers)
     print(f"   ✓ Created {len(projects)} projects")
     print(f"   ✓ Created {len(sections)} sections")
+    print(f"   ✓ Created {len(project_members)} project memberships and {len(project_followers)} followers")
     print()
     
     # Generate tasks
@@ -107,18 +211,66 @@ def main():
     else:
         print("   📝 Using templates for task generation...")
     
-    tasks = generate_tasks(projects, sections, users, use_llm=use_llm)
-    db.insert_batch("tasks", tasks)
+    # Tasks and comments are made a batch of projects at a time, each batch written while the next is made
+    with writer.stage("tasks"):
+        tasks = stream_stage(
+            "tasks", "tasks", lambda: iter_tasks(projects, sections, users, use_llm=use_llm, graph=graph),
+            writer, cache, keys, seed
+        )
     print(f"   ✓ Created {len(tasks)} tasks")
     print()
     
     # Generate comments
     print("💬 Generating comments...")
-    comments = generate_comments(tasks, users)
-    db.insert_batch("comments", comments)
-    print(f"   ✓ Created {len(comments)} comments")
+    with writer.stage("comments"):
+        comments = stream_stage(
+            "comments", "comments", lambda: iter_comments(tasks, users, use_llm=use_llm, graph=graph),
+            writer, cache, keys, seed
+        )
+        num_comments = len(comments)
+    print(f"   ✓ Created {num_comments} comments")
+    print()
+    
+    # Activity log, streamed a chunk of tasks at a time rather than held in memory
+    print("📜 Generating activity log...")
+    with writer.stage("stories"):
+        seed_stage(seed, "stories")
+        sections_by_project = {}
+        for section in sections:
+            sections_by_project.setdefault(section["project_id"], []).append(section["section_id"])
+        num_stories = writer.write_stream(
+            "stories", iter_stories(tasks, sections_by_project, [u["user_id"] for u in users])
+        )
+    print(f"   ✓ Created {num_stories} stories")
+    print()
+    
+    # Blocked-by links between tasks, acyclic by creation order
+    print("🔗 Generating task dependencies...")
+    with writer.stage("dependencies"):
+        seed_stage(seed, "dependencies")
+        num_dependencies = writer.write("task_dependencies", generate_dependencies(tasks, projects))
+    print(f"   ✓ Created {num_dependencies} task dependencies")
+    print()
+    
+    # Record the simulated "now" so delta runs know where to continue from
+    writer.call(lambda db: db.set_meta("simulation_current_date", SIMULATION_CURRENT_DATE))
+    
+    # Dashboard summaries and task counters, kept current by triggers from here on
+    print("📊 Building task summaries...")
+    writer.run(lambda db: (build_aggregates(db.conn), install_triggers(db.conn)))
+    print("   ✓ Built user/project/section/team summaries and installed triggers")
+    writer.run(lambda db: build_dependency_summary(db.conn))
+    print("   ✓ Built dependency critical paths")
     print()
     
+    # Full-text search, bulk-loaded once now that all text is in place
+    if SEARCH_INDEX:
+        print("🔎 Building full-text search index...")
+        writer.run(lambda db: build_search_index(db.conn))
+        print("   ✓ Indexed task, project and comment text (FTS5)")
+        print()
+    writer.close()
+    
     # Summary
     print("=" * 60)
     print("✨ GENERATION COMPLETE")
@@ -130,17 +282,39 @@ def main():
     print(f"   Users: {len(users)}")
     print(f"   Projects: {len(projects)}")
     print(f"   Tasks: {len(tasks)}")
-    print(f"   Comments: {len(comments)}")
+    print(f"   Comments: {num_comments}")
+    print(f"   Stories: {num_stories}")
+    print(f"   Dependencies: {num_dependencies}")
+    print()
+    
+    # How much of each stage's write time ran alongside generation
+    print("⏱️  Write pipeline (writes overlapped with generation):")
+    for row in writer.report():
+        share = f"{row['overlapped'] / row['write']:4.0%}" if row["write"] >= 0.01 else "   -"
+        waited = f", waited {row['blocked']:.2f}s on a full queue" if row["blocked"] >= 0.01 else ""
+        print(f"   {row['stage']:<13} generate {row['produce']:6.2f}s   write {row['write']:6.2f}s"
+              f"   overlapped {share}{waited}")
     print()
     
     if use_llm:
+        from utils.llm_utils import llm_call_report
+        from generators.tasks import TASK_NAME_POOL
+        from generators.projects import PROJECT_NAME_POOL
+        from generators.comments import COMMENT_POOL
+        TASK_NAME_POOL.close()
+        PROJECT_NAME_POOL.close()
+        COMMENT_POOL.close()
         print("✓ Generated with LLM assistance for higher quality")
+        print(f"   LLM usage: {llm_call_report()}")
     else:
         print("⚠️  Generated with templates only")
         print("   For better quality, set OPENAI_API_KEY in .env file")
     print()
     
-    db.close()
+    if cache is not None:
+        db_key = database_key(keys)
+        cache.store_file(db_key, DB_PATH)
+        print(f"♻️  Stored database in build cache ({db_key})")
     
     print("🎉 All done! Database ready at:", DB_PATH)
 
@@ -0,0 +1,101 @@
+"""Build the bundled name/company frequency tables in scrapers/data/.
+
+Sources, in order of preference:
+  - US Census 2010 surname file (Names_2010Census.csv: name,rank,count,...)
+  - SSA baby-name files (yobYYYY.txt: name,sex,count), several years summed
+  - Faker's en_US person provider's weighted first/last name tables (used
+    when no files are given; the bundled tables were built this way)
+
+Usage:
+    python src/scrapers/build_datasets.py [--census-surnames CSV] [--ssa-names TXT ...]
+"""
+import argparse
+import csv
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers.frequency_table import write_table
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# Real B2B SaaS company name patterns, the head of the company vocabulary
+COMPANY_PREFIXES = [
+    "Stream", "Data", "Cloud", "Sync", "Flow", "Pulse", "Wave", "Grid",
+    "Stack", "Link", "Nexus", "Prism", "Quantum", "Vertex", "Zenith"
+]
+
+COMPANY_SUFFIXES = [
+    "Flow", "Core", "Base", "Sync", "Works", "Labs", "Tech", "Systems",
+    "Solutions", "Platform", "Hub", "Space", "Forge", "Dynamics"
+]
+
+def load_census_surnames(path: str, limit: int = 20000) -> Counter:
+    """Top surnames by count from the Census 2010 surname CSV"""
+    counts = Counter()
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            name = row["name"].strip()
+            if name and name != "ALL OTHER NAMES" and row["count"].isdigit():
+                counts[name.title()] += int(row["count"])
+    return Counter(dict(counts.most_common(limit)))
+
+def load_ssa_first_names(paths: list[str], limit: int = 20000) -> Counter:
+    """First-name counts summed over SSA yobYYYY.txt files (both sexes)"""
+    counts = Counter()
+    for path in paths:
+        with open(path, newline="") as f:
+            for name, _sex, count in csv.reader(f):
+                counts[name] += int(count)
+    return Counter(dict(counts.most_common(limit)))
+
+def load_faker_names() -> tuple[Counter, Counter]:
+    """Weighted first/last names from Faker's en_US tables"""
+    from faker.providers.person.en_US import Provider
+
+    first = Counter()
+    for table in (Provider.first_names_female, Provider.first_names_male):
+        total = sum(table.values())
+        for name, weight in table.items():
+            first[name] += weight / total  # Equal weight to each sex
+    return first, Counter(Provider.last_names)
+
+def load_company_words() -> tuple[Counter, Counter]:
+    """Prefix/suffix vocabulary for B2B SaaS-style company names"""
+    from faker.providers.company.en_US import Provider
+
+    # Curated patterns are the most common; single-word tech nouns fill the tail
+    prefixes = Counter({p: 5.0 for p in COMPANY_PREFIXES})
+    for word in Provider.catch_phrase_words[2]:
+        if word.isalpha() and 3 <= len(word) <= 9:
+            prefixes[word.title()] += 1.0
+    suffixes = Counter({s: 5.0 for s in COMPANY_SUFFIXES})
+    for suffix in ["Analytics", "Cloud", "Io", "Logic", "Metrics", "Networks", "Ops", "Soft", "Stack", "Ware"]:
+        suffixes[suffix] += 1.0
+    return prefixes, suffixes
+
+def write_counter(name: str, counts: Counter):
+    names = sorted(counts, key=lambda n: -counts[n])
+    path = write_table(DATA_DIR / f"{name}.bin", names, [counts[n] for n in names])
+    print(f"✓ Wrote {len(names)} entries to {path} ({path.stat().st_size:,} bytes)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--census-surnames", help="Census 2010 surname CSV")
+    parser.add_argument("--ssa-names", nargs="*", default=[], help="SSA yobYYYY.txt files")
+    args = parser.parse_args()
+
+    faker_first, faker_last = load_faker_names()
+    first = load_ssa_first_names(args.ssa_names) if args.ssa_names else faker_first
+    last = load_census_surnames(args.census_surnames) if args.census_surnames else faker_last
+    prefixes, suffixes = load_company_words()
+
+    write_counter("first_names", first)
+    write_counter("last_names", last)
+    write_counter("company_prefixes", prefixes)
+    write_counter("company_suffixes", suffixes)
+
+if __name__ == "__main__":
+    main()
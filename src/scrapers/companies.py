@@ -1,22 +1,31 @@
-import random
+from pathlib import Path
+import numpy as np
+from scrapers.frequency_table import FrequencyTable
+from utils.seed import default_rng
 
-# Real B2B SaaS company name patterns
-COMPANY_PREFIXES = [
-    "Stream", "Data", "Cloud", "Sync", "Flow", "Pulse", "Wave", "Grid",
-    "Stack", "Link", "Nexus", "Prism", "Quantum", "Vertex", "Zenith"
-]
-
-COMPANY_SUFFIXES = [
-    "Flow", "Core", "Base", "Sync", "Works", "Labs", "Tech", "Systems",
-    "Solutions", "Platform", "Hub", "Space", "Forge", "Dynamics"
-]
+# Weighted B2B SaaS-style prefix/suffix vocabulary built by scrapers/build_datasets.py
+DATA_DIR = Path(__file__).parent / "data"
+PREFIX_TABLE = FrequencyTable(DATA_DIR / "company_prefixes.bin")
+SUFFIX_TABLE = FrequencyTable(DATA_DIR / "company_suffixes.bin")
 
 def generate_company_name() -> str:
     """Generate realistic B2B SaaS company name"""
-    prefix = random.choice(COMPANY_PREFIXES)
-    suffix = random.choice(COMPANY_SUFFIXES)
-    return f"{prefix}{suffix}"
+    return generate_company_names(1)[0]
+
+def generate_company_names(n: int, rng: np.random.Generator | None = None) -> list[str]:
+    """Generate n distinct company names for multi-org runs"""
+    rng = rng or default_rng()
+    max_unique = len(PREFIX_TABLE) * len(SUFFIX_TABLE)
+    if n > max_unique:
+        raise ValueError(f"Only {max_unique} distinct company names available, requested {n}")
+    names = {}
+    while len(names) < n:
+        batch = 2 * (n - len(names))
+        for prefix, suffix in zip(PREFIX_TABLE.sample(batch, rng), SUFFIX_TABLE.sample(batch, rng)):
+            if prefix != suffix:
+                names.setdefault(f"{prefix}{suffix}", None)
+    return list(names)[:n]
 
 def generate_domain(company_name: str) -> str:
     """Generate company domain"""
-    return company_name.lower().replace(" ", "") + ".com"
\ No newline at end of file
+    return company_name.lower().replace(" ", "") + ".com"
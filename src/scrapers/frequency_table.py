@@ -0,0 +1,104 @@
+"""Compact on-disk frequency tables with alias-method sampling.
+
+File layout (little-endian):
+    header   b"FRQ1", uint32 count, uint32 blob_len, uint32 reserved
+    prob     float32[count]   alias-table acceptance probabilities
+    alias    uint32[count]    alias-table fallback indices
+    weight   float32[count]   normalized frequencies (for reporting/validation)
+    offsets  uint32[count+1]  byte offsets of each name in the blob
+    blob     utf-8 bytes      all names concatenated
+
+Tables are memory-mapped on first use, so importing a scraper costs nothing
+and sampling n names is two array lookups per name.
+"""
+import struct
+from pathlib import Path
+import numpy as np
+from utils.seed import default_rng
+
+MAGIC = b"FRQ1"
+_HEADER = struct.Struct("<4sIII")
+
+def build_alias_table(weights) -> tuple[np.ndarray, np.ndarray]:
+    """Vose's alias method: O(n) build, O(1) draw"""
+    w = np.asarray(weights, dtype=np.float64)
+    n = len(w)
+    scaled = w / w.sum() * n
+    prob = np.ones(n, dtype=np.float64)
+    alias = np.arange(n, dtype=np.uint32)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    return prob.astype(np.float32), alias
+
+def write_table(path: str | Path, names: list[str], weights) -> Path:
+    """Write names and their frequencies as a frequency table file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    w = np.asarray(weights, dtype=np.float64)
+    w = w / w.sum()
+    prob, alias = build_alias_table(w)
+    encoded = [name.encode("utf-8") for name in names]
+    offsets = np.zeros(len(names) + 1, dtype=np.uint32)
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    blob = b"".join(encoded)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(names), len(blob), 0))
+        f.write(prob.astype("<f4").tobytes())
+        f.write(alias.astype("<u4").tobytes())
+        f.write(w.astype("<f4").tobytes())
+        f.write(offsets.astype("<u4").tobytes())
+        f.write(blob)
+    return path
+
+class FrequencyTable:
+    """Lazily memory-mapped frequency table with vectorized weighted sampling"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._names = None
+
+    def _load(self):
+        data = np.memmap(self.path, dtype=np.uint8, mode="r")
+        magic, count, blob_len, _ = _HEADER.unpack(data[:_HEADER.size].tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a frequency table")
+        pos = _HEADER.size
+        self.prob = np.frombuffer(data, dtype="<f4", count=count, offset=pos)
+        pos += 4 * count
+        self.alias = np.frombuffer(data, dtype="<u4", count=count, offset=pos)
+        pos += 4 * count
+        self.weights = np.frombuffer(data, dtype="<f4", count=count, offset=pos)
+        pos += 4 * count
+        offsets = np.frombuffer(data, dtype="<u4", count=count + 1, offset=pos)
+        pos += 4 * (count + 1)
+        blob = data[pos:pos + blob_len].tobytes()
+        self._names = np.array(
+            [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)], dtype=object
+        )
+
+    @property
+    def names(self) -> np.ndarray:
+        if self._names is None:
+            self._load()
+        return self._names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def sample_indices(self, n: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        """Draw n frequency-weighted indices (alias method, fully vectorized)"""
+        names = self.names
+        rng = rng or default_rng()
+        i = rng.integers(0, len(names), size=n)
+        accept = rng.random(n) < self.prob[i]
+        return np.where(accept, i, self.alias[i])
+
+    def sample(self, n: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        """Draw n frequency-weighted names"""
+        return self.names[self.sample_indices(n, rng)]
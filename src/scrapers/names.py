@@ -1,24 +1,47 @@
-from faker import Faker
-import random
+from pathlib import Path
+import re
+import numpy as np
+from scrapers.frequency_table import FrequencyTable
+from utils.seed import default_rng
 
-fake = Faker()
+# Weighted first names (690) and surnames (1,000) from Faker's en_US person
+# provider, built by scrapers/build_datasets.py (which can rebuild them from
+# Census/SSA files instead) and memory-mapped on first use
+DATA_DIR = Path(__file__).parent / "data"
+FIRST_NAMES = FrequencyTable(DATA_DIR / "first_names.bin")
+LAST_NAMES = FrequencyTable(DATA_DIR / "last_names.bin")
 
-# US Census top 1000 first names and surnames (simplified here)
-FIRST_NAMES = [
-    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
-    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
-    "Thomas", "Sarah", "Charles", "Karen", "Christopher", "Nancy", "Daniel", "Lisa",
-    "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra", "Donald", "Ashley",
-    # Add more from census data... 
-]
+def generate_realistic_name() -> tuple[str, str]:
+    """Return (first_name, last_name) drawn by frequency from the bundled tables"""
+    first, last = generate_names(1)
+    return (first[0], last[0])
 
-LAST_NAMES = [
-    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
-    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
-    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Thompson", "White",
-    # Add more from census data...
-]
+def generate_names(n: int, rng: np.random.Generator | None = None) -> tuple[list[str], list[str]]:
+    """Draw n frequency-weighted (first, last) name pairs in one batch"""
+    rng = rng or default_rng()
+    return FIRST_NAMES.sample(n, rng).tolist(), LAST_NAMES.sample(n, rng).tolist()
 
-def generate_realistic_name() -> tuple[str, str]:
-    """Return (first_name, last_name) from census distribution"""
-    return (random.choice(FIRST_NAMES), random.choice(LAST_NAMES))
\ No newline at end of file
+def generate_unique_emails(first_names: list[str], last_names: list[str], domain: str,
+                           taken: set[str] | None = None) -> list[str]:
+    """Build first.last@domain emails, suffixing repeats (john.smith2@) so none collide.
+
+    `taken` holds emails already in use (e.g. from an existing database); it is
+    updated in place with the new addresses.
+    """
+    taken = taken if taken is not None else set()
+    clean = {}  # Names repeat heavily; normalize each distinct one once
+    for name in set(first_names) | set(last_names):
+        clean[name] = re.sub("[^a-z0-9]", "", name.lower())
+    bases = [f"{clean[f]}.{clean[l]}" for f, l in zip(first_names, last_names)]
+    seen = {}  # base -> number of times used so far
+    emails = []
+    for base in bases:
+        count = seen.get(base, 0)
+        email = f"{base}@{domain}" if count == 0 else f"{base}{count + 1}@{domain}"
+        while email in taken:
+            count += 1
+            email = f"{base}{count + 1}@{domain}"
+        seen[base] = count + 1
+        taken.add(email)
+        emails.append(email)
+    return emails
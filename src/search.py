@@ -0,0 +1,180 @@
+"""FTS5 full-text search over task, project and comment text.
+
+The *_fts tables are external-content FTS5 indexes: they store only the
+inverted index and read the text back from tasks/projects/comments by rowid,
+so nothing is duplicated. They are bulk-loaded once after generation with
+FTS5's 'rebuild' command (much faster than indexing row by row during the
+inserts) and then kept in sync by triggers, so delta runs stay searchable.
+
+The content tables have TEXT primary keys, so their rowids are implicit and
+a VACUUM may renumber them, leaving the index pointing at the wrong rows.
+The build records ANCHORS rowid -> id pairs spread over each content table
+in workspace_meta. `search_index_stale` looks them up without writing;
+`verify_search_index` rebuilds the indexes when any moved. It runs after
+`Database.vacuum`, on the first `Database.search` of a connection that finds
+the index stale, and from the command line:
+
+Usage: python src/search.py [--db PATH]
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# fts table -> (content table, indexed columns)
+FTS_TABLES = {
+    "tasks_fts": ("tasks", ["name", "description"]),
+    "projects_fts": ("projects", ["name", "description"]),
+    "comments_fts": ("comments", ["comment_text"]),
+}
+
+ANCHORS = 64  # Rows per content table whose rowid -> id pair is recorded to detect renumbering
+
+# Result kind -> (fts table, id column, title expression, column weights for bm25)
+SEARCH_KINDS = {
+    "task": ("tasks_fts", "task_id", "c.name", (10.0, 1.0)),
+    "project": ("projects_fts", "project_id", "c.name", (10.0, 1.0)),
+    "comment": ("comments_fts", "comment_id", "(SELECT name FROM tasks WHERE task_id = c.task_id)", (1.0,)),
+}
+
+def _fts_triggers(fts: str, table: str, columns: list[str]) -> str:
+    """Triggers mirroring inserts/updates/deletes on table into its external-content index"""
+    cols = ", ".join(columns)
+    new = ", ".join(f"NEW.{c}" for c in columns)
+    old = ", ".join(f"OLD.{c}" for c in columns)
+    return f"""
+CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+    INSERT INTO {fts}(rowid, {cols}) VALUES (NEW.rowid, {new});
+END;
+CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', OLD.rowid, {old});
+END;
+CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {cols} ON {table} BEGIN
+    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', OLD.rowid, {old});
+    INSERT INTO {fts}(rowid, {cols}) VALUES (NEW.rowid, {new});
+END;
+"""
+
+def _id_column(fts: str) -> str:
+    return next(id_col for table, id_col, _, _ in SEARCH_KINDS.values() if table == fts)
+
+def _anchors(conn: sqlite3.Connection) -> dict[str, list]:
+    """ANCHORS (rowid, id) pairs per content table, evenly spread over its rowid range"""
+    anchors = {}
+    for fts, (table, _) in FTS_TABLES.items():
+        low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {table}").fetchone()
+        pairs = []
+        if low is not None:
+            for target in sorted({low + (high - low) * i // (ANCHORS - 1) for i in range(ANCHORS)}):
+                row = conn.execute(f"SELECT rowid, {_id_column(fts)} FROM {table} WHERE rowid >= ? LIMIT 1",
+                                   (target,)).fetchone()
+                pairs.append(list(row))
+        anchors[table] = pairs
+    return anchors
+
+def _record_anchors(conn: sqlite3.Connection):
+    conn.execute("INSERT OR REPLACE INTO workspace_meta (key, value) VALUES ('search_anchors', ?)",
+                 (json.dumps(_anchors(conn)),))
+
+def build_search_index(conn: sqlite3.Connection):
+    """Create the FTS5 indexes, bulk-load them from the content tables and install sync triggers"""
+    for fts, (table, columns) in FTS_TABLES.items():
+        conn.execute(f"DROP TABLE IF EXISTS {fts}")
+        conn.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({', '.join(columns)}, "
+            f"content='{table}', content_rowid='rowid', tokenize='porter unicode61')"
+        )
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+        conn.executescript(_fts_triggers(fts, table, columns))
+    _record_anchors(conn)
+    conn.commit()
+
+def search_index_stale(conn: sqlite3.Connection) -> bool:
+    """Whether the content tables' rowids moved since the indexes were built (read-only)"""
+    if not has_search_index(conn):
+        return False
+    row = conn.execute("SELECT value FROM workspace_meta WHERE key = 'search_anchors'").fetchone()
+    anchors = json.loads(row[0]) if row else {}
+    # Databases indexed before anchors were recorded count as stale
+    if any(table not in anchors for table, _ in FTS_TABLES.values()):
+        return True
+    for fts, (table, _) in FTS_TABLES.items():
+        for rowid, id_value in anchors[table]:
+            found = conn.execute(f"SELECT {_id_column(fts)} FROM {table} WHERE rowid = ?", (rowid,)).fetchone()
+            if found is None or found[0] != id_value:
+                return True
+    return False
+
+def verify_search_index(conn: sqlite3.Connection) -> bool:
+    """Rebuild the indexes if the content tables' rowids moved since they were built; returns whether it did"""
+    if not search_index_stale(conn):
+        return False
+    with conn:
+        for fts in FTS_TABLES:
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        _record_anchors(conn)
+    return True
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'").fetchone()
+    return row is not None
+
+def to_match_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix"""
+    terms = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+def search(conn: sqlite3.Connection, text: str, kinds: tuple[str, ...] = ("task", "project", "comment"),
+           limit: int = 20, raw: bool = False) -> list[dict]:
+    """Ranked matches for text across the requested kinds, best (lowest bm25) first.
+
+    Each result has kind, id, title (the task name for comments), a snippet
+    with the matched terms in [brackets] and its bm25 score. With raw=True,
+    text is passed to MATCH as-is (FTS5 query syntax: AND/OR/NEAR, "phrases",
+    column filters).
+    """
+    query = text if raw else to_match_query(text)
+    if not query:
+        return []
+    results = []
+    for kind in kinds:
+        fts, id_col, title_sql, weights = SEARCH_KINDS[kind]
+        table = FTS_TABLES[fts][0]
+        bm25 = f"bm25({fts}, {', '.join(map(str, weights))})"
+        rows = conn.execute(f"""
+            SELECT c.{id_col}, {title_sql}, snippet({fts}, -1, '[', ']', '…', 12), {bm25} AS score
+            FROM {fts} JOIN {table} c ON c.rowid = {fts}.rowid
+            WHERE {fts} MATCH ?
+            ORDER BY score
+            LIMIT ?
+        """, (query, limit)).fetchall()
+        results.extend(
+            {"kind": kind, "id": row[0], "title": row[1], "snippet": row[2], "score": row[3]} for row in rows
+        )
+    results.sort(key=lambda r: r["score"])
+    return results[:limit]
+
+def main():
+    sys.path.insert(0, str(Path(__file__).parent))
+    from config import DB_PATH
+    parser = argparse.ArgumentParser(description="Rebuild the search index if a VACUUM renumbered its rows")
+    parser.add_argument("--db", default=DB_PATH, help="Generated database")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    start = time.perf_counter()
+    if not has_search_index(conn):
+        print(f"No search index in {args.db}")
+    elif verify_search_index(conn):
+        print(f"✓ Rebuilt the search index of {args.db} in {time.perf_counter() - start:.2f}s")
+    else:
+        print(f"✓ Search index of {args.db} is current")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
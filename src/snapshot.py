@@ -0,0 +1,327 @@
+"""Memory-mapped snapshot of a generated workspace, for instant environment startup.
+
+`export` writes every table of a generated database as column files that
+workers map zero-copy (and share through the OS page cache) instead of
+querying SQLite and building Python objects:
+  - INTEGER/REAL/BOOLEAN columns -> <table>.<column>.npy (int64/float64/bool;
+    integers with NULLs become float64 with NaN)
+  - DATE/TIMESTAMP columns -> datetime64[D] / datetime64[s] .npy (NaT for NULL)
+  - foreign keys -> int32 row numbers in the referenced table (-1 for NULL)
+  - other TEXT columns -> dictionary-encoded like `utils.table.StringColumn`:
+    int32 codes (-1 for NULL) plus the distinct values, stored as one
+    fixed-width bytes array when they all have the same length (ids) or as
+    uint64 offsets into a UTF-8 blob otherwise
+  - text primary keys also get a sorted copy and its permutation, so ids
+    resolve to rows with a binary search
+  - every foreign key gets a CSR adjacency index parent row -> child rows
+    (`<child>.<column>`: project -> tasks is "tasks.project_id", task ->
+    comments "comments.task_id"), children in created_at order when they have one
+
+manifest.json lists tables, columns and their kinds. The directory is written
+beside the target and renamed into place, so readers never see a partial one.
+
+Usage: python src/snapshot.py [--db PATH] [--out DIR]
+"""
+import argparse
+import json
+import shutil
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+from config import DB_PATH, SNAPSHOT_DIR
+from utils.table import StringColumn
+
+FORMAT_VERSION = 1
+MAX_FIXED_WIDTH = 64  # Longest equal-length strings stored as a fixed-width array
+
+def _tables(conn: sqlite3.Connection) -> list[str]:
+    """Ordinary tables in schema order (full-text indexes and their shadow tables excluded)"""
+    rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'").fetchall()
+    virtual = [name for name, sql in rows if sql.upper().startswith("CREATE VIRTUAL")]
+    return [name for name, _ in rows if name not in virtual and not any(name.startswith(f"{v}_") for v in virtual)]
+
+def _kind(declared: str) -> str:
+    declared = declared.upper()
+    if declared.startswith("INT"):
+        return "int"
+    if declared in ("REAL", "FLOAT", "DOUBLE"):
+        return "float"
+    if declared == "BOOLEAN":
+        return "bool"
+    if declared == "DATE":
+        return "date"
+    if declared in ("TIMESTAMP", "DATETIME"):
+        return "timestamp"
+    return "text"
+
+def _save(out: Path, name: str, array: np.ndarray):
+    np.save(out / f"{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+
+def _save_strings(out: Path, name: str, values: list[str]) -> dict:
+    """Write distinct values; fixed-width when possible, else offsets + blob"""
+    encoded = [v.encode("utf-8") for v in values]
+    widths = {len(e) for e in encoded}
+    if len(widths) == 1 and 0 < max(widths) <= MAX_FIXED_WIDTH:
+        _save(out, f"{name}.values", np.array(encoded, dtype=f"S{widths.pop()}"))
+        return {"values": "fixed"}
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    _save(out, f"{name}.offsets", offsets)
+    (out / f"{name}.blob").write_bytes(b"".join(encoded))
+    return {"values": "blob"}
+
+def _row_order(conn: sqlite3.Connection, table: str) -> str:
+    """ORDER BY terms fixing a table's row numbering: rowid, or the primary key of WITHOUT ROWID tables"""
+    try:
+        conn.execute(f"SELECT rowid FROM {table} LIMIT 0")
+        return "rowid"
+    except sqlite3.OperationalError:
+        pk = sorted((col[5], col[1]) for col in conn.execute(f"PRAGMA table_info({table})") if col[5])
+        return ", ".join(name for _, name in pk)
+
+def _column_values(conn: sqlite3.Connection, table: str, column: str) -> list:
+    return [row[0] for row in conn.execute(f"SELECT {column} FROM {table} ORDER BY {_row_order(conn, table)}")]
+
+def _to_array(values: list, kind: str) -> np.ndarray:
+    if kind == "bool":
+        return np.array([bool(v) for v in values], dtype=bool)
+    if kind == "float" or (kind == "int" and None in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if kind == "int":
+        return np.array(values, dtype=np.int64)
+    unit = "D" if kind == "date" else "s"
+    return np.array([v or "NaT" for v in values], dtype="datetime64[us]").astype(f"datetime64[{unit}]")
+
+def _key_lookup(ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted keys and their row numbers"""
+    order = np.argsort(ids, kind="stable")
+    return ids[order], order.astype(np.int32)
+
+def _resolve(keys: np.ndarray, rows: np.ndarray, values: list) -> np.ndarray:
+    """Row numbers of values in a sorted key array (-1 for NULL or missing)"""
+    if len(keys) == 0:
+        return np.full(len(values), -1, dtype=np.int32)
+    probe = np.array([v.encode("utf-8") if isinstance(v, str) else b"" for v in values], dtype=keys.dtype)
+    pos = np.minimum(np.searchsorted(keys, probe), len(keys) - 1)
+    found = (keys[pos] == probe) & np.array([v is not None for v in values], dtype=bool)
+    return np.where(found, rows[pos], -1).astype(np.int32)
+
+def export(source: str, out: str) -> dict:
+    """Write the snapshot of database source to directory out; returns the manifest"""
+    conn = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    out_path = Path(out)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    tables = _tables(conn)
+    info = {t: conn.execute(f"PRAGMA table_info({t})").fetchall() for t in tables}
+    foreign = {t: {fk[3]: (fk[2], fk[4]) for fk in conn.execute(f"PRAGMA foreign_key_list({t})")} for t in tables}
+
+    # Text primary keys first: foreign keys resolve against them
+    lookups = {}
+    for table in tables:
+        pk = [col for col in info[table] if col[5]]
+        if len(pk) == 1 and _kind(pk[0][2]) == "text":
+            ids = _column_values(conn, table, pk[0][1])
+            width = max((len(i.encode("utf-8")) for i in ids), default=1)
+            lookups[(table, pk[0][1])] = _key_lookup(np.array([i.encode("utf-8") for i in ids], dtype=f"S{width}"))
+
+    manifest = {"version": FORMAT_VERSION, "source": str(source), "tables": {}, "relations": {}}
+    for table in tables:
+        columns = {}
+        n = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for _, column, declared, _, _, pk in info[table]:
+            name = f"{table}.{column}"
+            kind = _kind(declared)
+            values = _column_values(conn, table, column)
+            parent = foreign[table].get(column)
+            if parent and (parent[0], parent[1] or column) in lookups:
+                parent_table, parent_column = parent[0], parent[1] or column
+                _save(tmp, name, _resolve(*lookups[(parent_table, parent_column)], values))
+                columns[column] = {"kind": "ref", "table": parent_table}
+            elif kind == "text":
+                encoded = StringColumn.encode(values)
+                _save(tmp, f"{name}.codes", encoded.codes)
+                columns[column] = {"kind": "text", **_save_strings(tmp, name, encoded.values)}
+                if (table, column) in lookups:
+                    keys, rows = lookups[(table, column)]
+                    _save(tmp, f"{name}.sorted", keys)
+                    _save(tmp, f"{name}.order", rows)
+                    columns[column]["key"] = True
+            else:
+                _save(tmp, name, _to_array(values, kind))
+                columns[column] = {"kind": kind}
+        manifest["tables"][table] = {"rows": n, "columns": columns}
+
+    # Adjacency: parent row -> child rows for every resolved foreign key
+    for table, spec in manifest["tables"].items():
+        created = np.load(tmp / f"{table}.created_at.npy") if spec["columns"].get("created_at", {}).get("kind") \
+            == "timestamp" else None
+        for column, col in spec["columns"].items():
+            if col["kind"] != "ref":
+                continue
+            parent_rows = np.load(tmp / f"{table}.{column}.npy")
+            keys = (created, parent_rows) if created is not None else (parent_rows,)
+            order = np.lexsort(keys)
+            order = order[parent_rows[order] >= 0].astype(np.int32)
+            counts = np.bincount(parent_rows[order], minlength=manifest["tables"][col["table"]]["rows"])
+            indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum(counts)
+            relation = f"{table}.{column}"
+            _save(tmp, f"{relation}.indptr", indptr)
+            _save(tmp, f"{relation}.indices", order)
+            manifest["relations"][relation] = {"parent": col["table"], "child": table}
+    conn.close()
+
+    (tmp / "manifest.json").write_text(json.dumps(manifest, indent=1))
+    shutil.rmtree(out_path, ignore_errors=True)
+    tmp.rename(out_path)
+    return manifest
+
+class SnapshotStrings:
+    """Dictionary-encoded string column read through memory maps; values decoded on access"""
+
+    def __init__(self, codes: np.ndarray, values: np.ndarray | None = None,
+                 offsets: np.ndarray | None = None, blob: np.ndarray | None = None):
+        self.codes = codes
+        self._values, self._offsets, self._blob = values, offsets, blob
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def value(self, code: int) -> str | None:
+        """Distinct value by code"""
+        if code < 0:
+            return None
+        if self._values is not None:
+            return self._values[code].decode("utf-8")
+        start, end = self._offsets[code], self._offsets[code + 1]
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def __getitem__(self, row: int) -> str | None:
+        return self.value(int(self.codes[row]))
+
+    def decode(self, rows: np.ndarray) -> list[str | None]:
+        return [self.value(int(code)) for code in self.codes[rows]]
+
+class SnapshotTable:
+    """Columns of one table in a snapshot, mapped on first access"""
+
+    def __init__(self, snapshot: "Snapshot", name: str, spec: dict):
+        self.snapshot = snapshot
+        self.name = name
+        self.spec = spec
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return self.spec["rows"]
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.spec["columns"])
+
+    def column(self, name: str) -> np.ndarray | SnapshotStrings:
+        """NumPy array (numbers, dates, row numbers for foreign keys) or SnapshotStrings for text"""
+        if name not in self._columns:
+            col = self.spec["columns"][name]
+            load = self.snapshot._load
+            base = f"{self.name}.{name}"
+            if col["kind"] != "text":
+                self._columns[name] = load(base)
+            elif col["values"] == "fixed":
+                self._columns[name] = SnapshotStrings(load(f"{base}.codes"), values=load(f"{base}.values"))
+            else:
+                blob = self.snapshot.path / f"{base}.blob"
+                # np.memmap cannot map an empty file (a column of only NULLs or empty strings)
+                blob = np.memmap(blob, dtype=np.uint8, mode="r") if blob.stat().st_size else np.zeros(0, np.uint8)
+                self._columns[name] = SnapshotStrings(load(f"{base}.codes"), offsets=load(f"{base}.offsets"),
+                                                      blob=blob)
+        return self._columns[name]
+
+    def row_of(self, key: str, column: str | None = None) -> int:
+        """Row number of a primary-key value, or -1"""
+        column = column or next(c for c, spec in self.spec["columns"].items() if spec.get("key"))
+        keys = self.snapshot._load(f"{self.name}.{column}.sorted")
+        probe = np.array(key.encode("utf-8"), dtype=keys.dtype)
+        pos = int(np.searchsorted(keys, probe))
+        if pos < len(keys) and keys[pos] == probe:
+            return int(self.snapshot._load(f"{self.name}.{column}.order")[pos])
+        return -1
+
+    def record(self, row: int) -> dict:
+        """One row as a dict of Python values (foreign keys as referenced ids)"""
+        result = {}
+        for name, col in self.spec["columns"].items():
+            value = self.column(name)[row]
+            if col["kind"] == "ref":
+                value = self.snapshot.key_of(col["table"], int(value))
+            elif isinstance(value, np.datetime64):
+                value = None if np.isnat(value) else str(value)
+            elif isinstance(value, np.generic):
+                value = value.item()
+            result[name] = value
+        return result
+
+class Snapshot:
+    """Read-only, zero-copy view of an exported workspace snapshot"""
+
+    def __init__(self, path: str = SNAPSHOT_DIR):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text())
+        if self.manifest["version"] != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: snapshot format {self.manifest['version']}, expected {FORMAT_VERSION}")
+        self._arrays = {}
+        self._tables = {}
+
+    def _load(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+        return self._arrays[name]
+
+    @property
+    def tables(self) -> list[str]:
+        return list(self.manifest["tables"])
+
+    def table(self, name: str) -> SnapshotTable:
+        if name not in self._tables:
+            self._tables[name] = SnapshotTable(self, name, self.manifest["tables"][name])
+        return self._tables[name]
+
+    def key_of(self, table: str, row: int) -> str | None:
+        """Primary-key value of a row (None for -1)"""
+        if row < 0:
+            return None
+        spec = self.table(table)
+        column = next(c for c, col in spec.spec["columns"].items() if col.get("key"))
+        return spec.column(column)[row]
+
+    def children(self, relation: str, row: int) -> np.ndarray:
+        """Child rows of a parent row, e.g. children("tasks.project_id", project_row)"""
+        indptr = self._load(f"{relation}.indptr")
+        return self._load(f"{relation}.indices")[indptr[row]:indptr[row + 1]]
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a generated database as a memory-mapped snapshot")
+    parser.add_argument("--db", default=DB_PATH, help="Generated database")
+    parser.add_argument("--out", default=SNAPSHOT_DIR, help="Snapshot directory to write (replaced if present)")
+    args = parser.parse_args()
+
+    print(f"📸 Exporting {args.db} to {args.out}...")
+    start = time.perf_counter()
+    manifest = export(args.db, args.out)
+    elapsed = time.perf_counter() - start
+    size = sum(p.stat().st_size for p in Path(args.out).iterdir())
+    for table, spec in manifest["tables"].items():
+        if spec["rows"]:
+            print(f"   ✓ {table}: {spec['rows']}")
+    print(f"   ✓ {len(manifest['relations'])} adjacency indexes")
+    print(f"   Done in {elapsed:.2f}s ({size / 2**20:.1f} MiB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Collaboration graph: who works with whom, for choosing creators, assignees and commenters.
+
+Users are linked to COLLAB_TEAM_NEIGHBORS teammates (all of them in smaller
+teams), to COLLAB_DEPARTMENT_NEIGHBORS random colleagues in their department
+and to COLLAB_ORG_NEIGHBORS anywhere in the organization. An edge u -> v weighs its proximity (team,
+department or organization weight) times v's activity, a Pareto weight by
+v's rank within their home team, so a few people per team do most of the work.
+
+The graph is stored as a CSR adjacency (`indptr`, `indices`, `weights`) with
+an alias table per row, so `sample` draws neighbors for any number of users
+with two array lookups each, however large the organization. Users without a
+team membership are grouped by department.
+"""
+import numpy as np
+from utils.seed import default_rng
+from config import (COLLAB_TEAM_WEIGHT, COLLAB_DEPARTMENT_WEIGHT, COLLAB_ORG_WEIGHT, COLLAB_TEAM_NEIGHBORS,
+                    COLLAB_DEPARTMENT_NEIGHBORS, COLLAB_ORG_NEIGHBORS)
+
+ACTIVITY_EXPONENT = 1.5  # Activity of a team's k-th member ~ 1 / k ** 1.5 (top 20% do most of the work)
+
+def _runs(keys: np.ndarray, n_groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices sorted by key and the CSR offsets of each key's run"""
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(n_groups + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(keys, minlength=n_groups))
+    return order, indptr
+
+def _row_alias_tables(indptr: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vose alias tables for every CSR row at once (weights sorted ascending within rows).
+
+    Per row, the remaining entries are a window [lo, hi] of the sorted
+    weights; each step settles one small entry against the largest one, so
+    all rows finish in max-degree vectorized steps.
+    """
+    degree = np.diff(indptr)
+    row = np.repeat(np.arange(len(degree)), degree)
+    totals = np.bincount(row, weights=weights, minlength=len(degree))
+    scaled = weights / np.where(totals > 0, totals, 1.0)[row] * degree[row]
+    prob = np.ones(len(weights), dtype=np.float64)
+    alias = np.arange(len(weights), dtype=np.int64)
+    lo, hi = indptr[:-1].copy(), indptr[1:] - 1
+    active = np.flatnonzero(degree > 1)
+    while len(active):
+        l, h = lo[active], hi[active]
+        top_small = scaled[h] < 1.0  # The largest entry was used up: settle it against the next largest
+        left_small = ~top_small & (scaled[l] < 1.0)
+        small = np.where(top_small, h, l)
+        large = np.where(top_small, h - 1, h)
+        moving = top_small | left_small
+        small, large = small[moving], large[moving]
+        prob[small] = scaled[small]
+        alias[small] = large
+        scaled[large] -= 1.0 - scaled[small]
+        hi[active[top_small]] -= 1
+        lo[active[left_small]] += 1
+        active = active[moving]
+        active = active[lo[active] < hi[active]]
+    return np.minimum(prob, 1.0).astype(np.float32), alias
+
+class CollaborationGraph:
+    """Weighted user -> collaborator graph with constant-time neighbor sampling"""
+
+    def __init__(self, user_ids: list[str], indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 team_ids: list[str], team_indptr: np.ndarray, team_members: np.ndarray, home: np.ndarray):
+        self.user_ids = user_ids
+        self.indptr, self.indices, self.weights = indptr, indices, weights
+        self.team_ids = team_ids
+        self.team_indptr, self.team_members = team_indptr, team_members
+        self.home = home  # First team index of each user
+        self._row = {user_id: i for i, user_id in enumerate(user_ids)}
+        self._team = {team_id: i for i, team_id in enumerate(team_ids)}
+        self._prob, alias = _row_alias_tables(indptr, weights.astype(np.float64))
+        self._alias = indices[alias]
+
+    @classmethod
+    def build(cls, users: list[dict], memberships: list[dict] | None = None,
+              rng: np.random.Generator | None = None) -> "CollaborationGraph":
+        """Graph over users (rows in list order) from team memberships (see module docstring)"""
+        rng = rng or default_rng()
+        user_ids = [u["user_id"] for u in users]
+        row = {user_id: i for i, user_id in enumerate(user_ids)}
+        n = len(users)
+
+        # Teams and their members; users without one join a group for their department
+        pairs, team_index = [], {}
+        for m in memberships or []:
+            if m["user_id"] in row:
+                pairs.append((team_index.setdefault(m["team_id"], len(team_index)), row[m["user_id"]]))
+        team_ids = list(team_index)
+        homed = {u for _, u in pairs}
+        departments = {d: i for i, d in enumerate(sorted({u.get("department") or "" for u in users}))}
+        dept_of = np.array([departments[u.get("department") or ""] for u in users], dtype=np.int64)
+        for i in range(n):
+            if i not in homed:
+                pairs.append((len(team_ids) + int(dept_of[i]), i))
+        team_ids += [f"department:{d}" for d in departments]
+        pair_team = np.array([t for t, _ in pairs], dtype=np.int64)
+        pair_user = np.array([u for _, u in pairs], dtype=np.int64)
+        order, team_indptr = _runs(pair_team, len(team_ids))
+        team_members = pair_user[order].astype(np.int32)
+
+        # Activity: Pareto by rank within the user's first (home) team
+        first = np.unique(pair_user, return_index=True)[1]
+        home = np.empty(n, dtype=np.int64)
+        home[pair_user[first]] = pair_team[first]
+        home_order, home_indptr = _runs(home, len(team_ids))
+        rank = np.empty(n, dtype=np.int64)
+        rank[home_order] = np.arange(n) - np.repeat(home_indptr[:-1], np.diff(home_indptr))
+        activity = 1.0 / (rank + 1.0) ** ACTIVITY_EXPONENT
+
+        # Edges: teammates, then random colleagues in the department and the organization
+        src, dst, proximity = [], [], []
+        def link(a, b, weight):
+            keep = a != b
+            src.append(a[keep])
+            dst.append(b[keep])
+            proximity.append(np.full(int(keep.sum()), weight))
+        for t in range(len(team_ids)):
+            members = team_members[team_indptr[t]:team_indptr[t + 1]].astype(np.int64)
+            size = len(members)
+            if size <= COLLAB_TEAM_NEIGHBORS + 1:
+                link(np.repeat(members, size), np.tile(members, size), COLLAB_TEAM_WEIGHT)
+            else:
+                link(np.repeat(members, COLLAB_TEAM_NEIGHBORS),
+                     members[rng.integers(0, size, size=size * COLLAB_TEAM_NEIGHBORS)], COLLAB_TEAM_WEIGHT)
+        dept_order, dept_indptr = _runs(dept_of, len(departments))
+        dept_start = dept_indptr[dept_of]
+        dept_size = np.diff(dept_indptr)[dept_of]
+        k = COLLAB_DEPARTMENT_NEIGHBORS
+        picks = dept_start.repeat(k) + (rng.random(n * k) * dept_size.repeat(k)).astype(np.int64)
+        link(np.arange(n).repeat(k), dept_order[picks], COLLAB_DEPARTMENT_WEIGHT)
+        link(np.arange(n).repeat(COLLAB_ORG_NEIGHBORS), rng.integers(0, n, size=n * COLLAB_ORG_NEIGHBORS),
+             COLLAB_ORG_WEIGHT)
+
+        # Merge repeated edges (summing proximity), rows with the lightest edges first for the alias build
+        stride = max(n, 1)
+        key = np.concatenate(src) * stride + np.concatenate(dst)
+        key, inverse = np.unique(key, return_inverse=True)
+        proximity = np.bincount(inverse, weights=np.concatenate(proximity), minlength=len(key))
+        edge_src, edge_dst = key // stride, key % stride
+        weights = proximity * activity[edge_dst]
+        order = np.argsort(weights)
+        order = order[np.argsort(edge_src[order], kind="stable")]  # Two sorts: much faster than lexsort here
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(edge_src, minlength=n))
+        return cls(user_ids, indptr, edge_dst[order].astype(np.int32), weights[order].astype(np.float32),
+                   team_ids, team_indptr, team_members, home)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def rows(self, user_ids) -> np.ndarray:
+        """Rows of user ids (-1 for None or unknown)"""
+        return np.fromiter((self._row.get(u, -1) for u in user_ids), dtype=np.int64, count=len(user_ids))
+
+    def teams(self, team_ids) -> np.ndarray:
+        """Team indexes of team ids (-1 for None or unknown)"""
+        return np.fromiter((self._team.get(t, -1) for t in team_ids), dtype=np.int64, count=len(team_ids))
+
+    def neighbors(self, row: int) -> tuple[np.ndarray, np.ndarray]:
+        """Collaborator rows of a user and their edge weights"""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def sample(self, rows: np.ndarray, rng: np.random.Generator | None = None) -> np.ndarray:
+        """One weighted collaborator per row (alias method); -1 or isolated rows draw any user"""
+        rng = rng or default_rng()
+        rows = np.asarray(rows, dtype=np.int64)
+        anyone = rng.integers(0, len(self), size=len(rows))
+        known = np.where(rows >= 0, rows, 0)
+        degree = self.indptr[known + 1] - self.indptr[known]
+        k = self.indptr[known] + (rng.random(len(rows)) * degree).astype(np.int64)
+        k = np.minimum(k, max(self.num_edges - 1, 0))
+        if self.num_edges == 0:
+            return anyone
+        picked = np.where(rng.random(len(rows)) < self._prob[k], self.indices[k], self._alias[k])
+        return np.where((rows >= 0) & (degree > 0), picked, anyone)
+
+    def sample_members(self, teams: np.ndarray, rng: np.random.Generator | None = None) -> np.ndarray:
+        """One member per team index, uniformly; -1 or empty teams draw any user"""
+        rng = rng or default_rng()
+        teams = np.asarray(teams, dtype=np.int64)
+        anyone = rng.integers(0, len(self), size=len(teams))
+        known = np.where(teams >= 0, teams, 0)
+        size = self.team_indptr[known + 1] - self.team_indptr[known]
+        k = self.team_indptr[known] + (rng.random(len(teams)) * size).astype(np.int64)
+        if len(self.team_members) == 0:
+            return anyone
+        picked = self.team_members[np.minimum(k, len(self.team_members) - 1)]
+        return np.where((teams >= 0) & (size > 0), picked, anyone)
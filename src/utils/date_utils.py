@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+import math
 import random
 import numpy as np
 
@@ -23,6 +24,15 @@ def random_business_date(start_date: str, end_date: str) -> str:
     
     return date_obj.date().isoformat()
 
+# Due-date mix: (bucket, share of tasks, days after creation); None = no due date
+DUE_DATE_BUCKETS = [
+    ("no_due_date", 0.25, None),
+    ("within_week", 0.20, (1, 7)),
+    ("within_month", 0.35, (8, 30)),
+    ("one_to_three_months", 0.15, (31, 90)),
+    ("overdue", 0.05, (-14, -1)),
+]
+
 def generate_due_date_realistic(created_at: str) -> str | None:
     """
     Generate realistic due date based on research:
@@ -35,16 +45,15 @@ def generate_due_date_realistic(created_at: str) -> str | None:
     rand = random.random()
     created = datetime.fromisoformat(created_at)
     
-    if rand < 0.25:
+    cumulative = 0.0
+    for _, share, days_range in DUE_DATE_BUCKETS:
+        cumulative += share
+        if rand < cumulative:
+            break
+    
+    if days_range is None:
         return None  # No due date
-    elif rand < 0.45:  # Within 1 week
-        days = random.randint(1, 7)
-    elif rand < 0.80:  # Within 1 month
-        days = random.randint(8, 30)
-    elif rand < 0.95:  # 1-3 months
-        days = random.randint(31, 90)
-    else:  # Overdue
-        days = random.randint(-14, -1)
+    days = random.randint(*days_range)
     
     due_date = created + timedelta(days=days)
     
@@ -54,11 +63,53 @@ def generate_due_date_realistic(created_at: str) -> str | None:
     
     return due_date.date().isoformat()
 
+def _weekday(days: np.ndarray) -> np.ndarray:
+    """Monday=0 weekday of datetime64[D] values (1970-01-01 was a Thursday)"""
+    return (days.astype(np.int64) + 3) % 7
+
+def generate_due_dates(created_at: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Vectorized generate_due_date_realistic: datetime64[D] due dates (NaT = no due date)"""
+    n = len(created_at)
+    shares = np.array([share for _, share, _ in DUE_DATE_BUCKETS])
+    bucket = np.minimum(np.searchsorted(np.cumsum(shares), rng.random(n), side="right"), len(shares) - 1)
+    due = np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")
+    created_days = created_at.astype("datetime64[D]")
+    for i, (_, _, days_range) in enumerate(DUE_DATE_BUCKETS):
+        if days_range is None:
+            continue
+        mask = bucket == i
+        days = rng.integers(days_range[0], days_range[1] + 1, size=int(mask.sum()))
+        due[mask] = created_days[mask] + days.astype("timedelta64[D]")
+
+    # Avoid weekends
+    weekday = _weekday(due)
+    weekend = ~np.isnat(due) & (weekday >= 5) & (rng.random(n) < 0.9)
+    due[weekend] -= (weekday[weekend] - 4).astype("timedelta64[D]")
+    return due
+
+# Cycle time (days from creation to completion) is log-normal: mean 5 days, std 3 days
+CYCLE_TIME_LOG_MEAN = 1.6
+CYCLE_TIME_LOG_SIGMA = 0.6
+MAX_CYCLE_DAYS = 30
+
 def generate_completion_time(created_at: str) -> str:
     """Generate realistic completion time using log-normal distribution"""
     created = datetime.fromisoformat(created_at)
     # Log-normal:  mean 5 days, std 3 days (cycle time research)
-    days = np.random.lognormal(mean=1.6, sigma=0.6)
-    days = max(0.1, min(days, 30))  # Clamp between 2 hours and 30 days
+    days = np.random.lognormal(mean=CYCLE_TIME_LOG_MEAN, sigma=CYCLE_TIME_LOG_SIGMA)
+    days = max(0.1, min(days, MAX_CYCLE_DAYS))  # Clamp between 2 hours and 30 days
     completed = created + timedelta(days=days)
-    return completed.isoformat()
\ No newline at end of file
+    return completed.isoformat()
+
+def generate_completion_times(created_at: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Vectorized generate_completion_time: datetime64[s] completion timestamps"""
+    days = rng.lognormal(mean=CYCLE_TIME_LOG_MEAN, sigma=CYCLE_TIME_LOG_SIGMA, size=len(created_at))
+    seconds = np.clip(days, 0.1, MAX_CYCLE_DAYS) * 86400
+    return created_at.astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+
+def cycle_time_cdf(days: np.ndarray) -> np.ndarray:
+    """P(cycle time <= days) under the log-normal cycle-time model (vectorized)"""
+    days = np.asarray(days, dtype=np.float64)
+    z = (np.log(np.maximum(days, 1e-9)) - CYCLE_TIME_LOG_MEAN) / (CYCLE_TIME_LOG_SIGMA * math.sqrt(2))
+    cdf = 0.5 * (1 + np.vectorize(math.erf, otypes=[np.float64])(z))
+    return np.where(days <= 0, 0.0, cdf)
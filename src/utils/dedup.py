@@ -0,0 +1,215 @@
+"""Streaming near-duplicate detection for generated text (MinHash-LSH).
+
+Each text is lowercased, whitespace-normalized and cut into byte 3-grams;
+a MinHash signature of `bands * rows` values is computed for a whole batch
+at once with NumPy and split into `bands` band keys. Two texts are
+near-duplicates when any band key matches, i.e. roughly when their 3-gram
+Jaccard similarity exceeds (1 / bands) ** (1 / rows) (~0.72 by default).
+
+Band keys of accepted texts are remembered in a Bloom filter rather than
+stored, so memory is fixed by `capacity`: once that many texts have been
+accepted the filter rotates, keeping one previous generation. An optional
+scope per text (project id, task id, ...) restricts matches to texts with
+the same scope. Numbers are significant: texts whose digit runs differ
+("Q1 Sprint 3", "Q1 Sprint 4") are never near-duplicates of each other.
+"""
+import re
+import zlib
+import numpy as np
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+_NUMBER = re.compile(r"\d+")
+
+def _number_hashes(texts: list[str]) -> np.ndarray:
+    """Hash of each text's digit runs (0 for texts without any)"""
+    return np.array(
+        [zlib.crc32(" ".join(numbers).encode()) * 0xC2B2AE3D27D4EB4F & 0xFFFFFFFFFFFFFFFF
+         if (numbers := _NUMBER.findall(t)) else 0 for t in texts], dtype=np.uint64
+    )
+
+def _scope_hashes(scopes, n: int) -> np.ndarray:
+    if scopes is None:
+        return np.zeros(n, dtype=np.uint64)
+    cache = {}
+    return np.array(
+        [cache.setdefault(s, zlib.crc32(repr(s).encode()) * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF)
+         for s in scopes], dtype=np.uint64
+    )
+
+class NearDuplicateFilter:
+    """Fixed-memory MinHash-LSH filter over a stream of texts"""
+
+    def __init__(self, capacity: int = 500_000, bands: int = 10, rows: int = 7,
+                 bits_per_key: int = 24, hashes: int = 4, seed: int = 0, chunk_size: int = 256):
+        rng = np.random.default_rng(seed)
+        self.bands, self.rows = bands, rows
+        self.capacity = capacity
+        self.hashes = hashes
+        self.chunk_size = chunk_size
+        # Universal hashing (a * x + b) mod 2^32 per permutation, a odd
+        self._a = rng.integers(1, 2**32, size=bands * rows, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**32, size=bands * rows, dtype=np.uint64)
+        self._row_mix = rng.integers(1, 2**63, size=rows, dtype=np.uint64) | np.uint64(1)
+        self._band_mix = rng.integers(1, 2**63, size=bands, dtype=np.uint64)
+        self._probe_mix = rng.integers(1, 2**63, size=hashes, dtype=np.uint64) | np.uint64(1)
+        self._bits = int(capacity * bands * bits_per_key) | 1
+        self._current = np.zeros((self._bits + 63) // 64, dtype=np.uint64)
+        self._previous = None
+        self._count = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    def band_keys(self, texts: list[str], scopes=None) -> tuple[np.ndarray, np.ndarray]:
+        """(n, bands) uint64 band keys and a mask of texts long enough to compare"""
+        # Signatures are computed once per distinct text (templated text repeats a lot)
+        distinct = {}
+        index = np.fromiter((distinct.setdefault(t, len(distinct)) for t in texts), dtype=np.int64, count=len(texts))
+        distinct = list(distinct)
+        keys = np.zeros((len(distinct), self.bands), dtype=np.uint64)
+        valid = np.zeros(len(distinct), dtype=bool)
+        for start in range(0, len(distinct), self.chunk_size):
+            chunk = [" ".join(t.lower().split()) if t else "" for t in distinct[start:start + self.chunk_size]]
+            keys[start:start + len(chunk)], valid[start:start + len(chunk)] = self._chunk_keys(chunk)
+        keys ^= _number_hashes(distinct)[:, None]
+        return keys[index] ^ _scope_hashes(scopes, len(texts))[:, None], valid[index]
+
+    def _chunk_keys(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        encoded = [t.encode() for t in texts]
+        lengths = np.array([len(b) for b in encoded], dtype=np.int64)
+        valid = lengths >= 3
+        keys = np.zeros((len(texts), self.bands), dtype=np.uint64)
+        if not valid.any():
+            return keys, valid
+
+        # Byte 3-grams of every valid text, from one concatenated buffer
+        data = np.frombuffer(b"".join(b for b, ok in zip(encoded, valid) if ok), dtype=np.uint8).astype(np.uint64)
+        grams = (data[:-2] << np.uint64(16)) | (data[1:-1] << np.uint64(8)) | data[2:]
+        ends = np.cumsum(lengths[valid])
+        starts = ends - lengths[valid]
+        counts = lengths[valid] - 2
+        gram_idx = np.repeat(starts, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+        grams = grams[gram_idx] * np.uint64(0x9E3779B1) & _MASK32
+
+        # MinHash: min over each text's grams of every permutation
+        hashed = (grams[:, None] * self._a + self._b) & _MASK32
+        signature = np.minimum.reduceat(hashed, np.cumsum(counts) - counts, axis=0)
+
+        # Band keys: mix the rows of each band into one 64-bit value
+        banded = signature.reshape(-1, self.bands, self.rows)
+        keys[valid] = (banded * self._row_mix).sum(axis=2) ^ self._band_mix
+        return keys, valid
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        """Bloom filter bit positions, shape keys.shape + (hashes,)"""
+        mixed = keys[..., None] * self._probe_mix
+        mixed ^= mixed >> np.uint64(29)
+        return (mixed % np.uint64(self._bits)).astype(np.int64)
+
+    @staticmethod
+    def _test(bits: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        words = bits[positions >> 6]
+        return ((words >> (positions & 63).astype(np.uint64)) & np.uint64(1)).astype(bool).all(axis=-1)
+
+    def _seen(self, keys: np.ndarray) -> np.ndarray:
+        positions = self._positions(keys)
+        seen = self._test(self._current, positions)
+        if self._previous is not None:
+            seen |= self._test(self._previous, positions)
+        return seen.any(axis=1)
+
+    def add_keys(self, keys: np.ndarray):
+        """Remember band keys of accepted texts, rotating the filter at capacity"""
+        if self._count + len(keys) > self.capacity:
+            self._previous, self._current = self._current, np.zeros_like(self._current)
+            self._count = 0
+        positions = self._positions(keys).ravel()
+        np.bitwise_or.at(self._current, positions >> 6, np.uint64(1) << (positions & 63).astype(np.uint64))
+        self._count += len(keys)
+
+    def duplicates(self, texts: list[str], scopes=None) -> tuple[np.ndarray, np.ndarray]:
+        """Near-duplicate mask (vs accepted texts and earlier texts in the batch) and band keys"""
+        keys, valid = self.band_keys(texts, scopes)
+        dup = np.zeros(len(texts), dtype=bool)
+        if valid.any():
+            index = np.flatnonzero(valid)
+            valid_keys = keys[index]
+            repeat = np.zeros(len(index), dtype=bool)
+            for band in range(self.bands):
+                _, first = np.unique(valid_keys[:, band], return_index=True)
+                later = np.ones(len(index), dtype=bool)
+                later[first] = False
+                repeat |= later
+            dup[index] = repeat | self._seen(valid_keys)
+        return dup, keys
+
+    def filter(self, texts: list[str], scopes=None) -> np.ndarray:
+        """Keep mask for a batch: texts that are not near-duplicates, which are then remembered"""
+        dup, keys = self.duplicates(texts, scopes)
+        keep = ~dup
+        self.add_keys(keys[keep])
+        self.accepted += int(keep.sum())
+        self.rejected += int(dup.sum())
+        return keep
+
+    @property
+    def nbytes(self) -> int:
+        return self._current.nbytes + (self._previous.nbytes if self._previous is not None else 0)
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+def make_distinct(texts: list[str], regenerate, scopes=None, max_attempts: int = 100,
+                  disambiguate=None) -> tuple[list[str], int]:
+    """Replace exact repeats (ignoring case and whitespace) within a scope.
+
+    A repeat is regenerated by regenerate(i) up to max_attempts times; one
+    still repeating then becomes disambiguate(text, n), n = 2, 3, ... when
+    given. Returns the texts and how many repeats were kept.
+    """
+    seen, last = set(), {}
+    distinct, kept = [], 0
+    for i, text in enumerate(texts):
+        scope = scopes[i] if scopes is not None else None
+        key = (scope, _normalize(text))
+        for _ in range(max_attempts):
+            if key not in seen:
+                break
+            text = regenerate(i)
+            key = (scope, _normalize(text))
+        if key in seen and disambiguate is not None:
+            # The n-th copy tries n = (last n used for this text) + 1 onwards
+            repeat, n, original = key, last.get(key, 1), text
+            while key in seen:
+                n += 1
+                text = disambiguate(original, n)
+                key = (scope, _normalize(text))
+            last[repeat] = n
+        kept += key in seen
+        seen.add(key)
+        distinct.append(text)
+    return distinct, kept
+
+def diversify(texts: list[str], regenerate, dedup: NearDuplicateFilter, scopes=None,
+              max_attempts: int = 3, distinct_attempts: int = 100, disambiguate=None) -> tuple[list[str], int]:
+    """Replace near-duplicates by regenerate(i) -> str, retrying up to max_attempts.
+
+    Texts still near-duplicates after the last attempt are kept, unless they
+    repeat another text of their scope exactly: those are regenerated further
+    (see `make_distinct`). Returns the texts and how many were kept after the
+    last attempt as near-duplicates, plus exact repeats kept.
+    """
+    texts = list(texts)
+    scopes = list(scopes) if scopes is not None else None
+    pending = np.arange(len(texts))
+    keep = dedup.filter(texts, scopes)
+    pending = pending[~keep]
+    for _ in range(max_attempts):
+        if len(pending) == 0:
+            break
+        for i in pending.tolist():
+            texts[i] = regenerate(i)
+        retry = dedup.filter([texts[i] for i in pending], [scopes[i] for i in pending] if scopes else None)
+        pending = pending[~retry]
+    texts, repeats = make_distinct(texts, regenerate, scopes, distinct_attempts, disambiguate)
+    return texts, len(pending) + repeats
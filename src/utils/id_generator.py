@@ -1,5 +1,20 @@
 import uuid
+import numpy as np
+from utils.seed import random_bytes
 
 def generate_id() -> str:
     """Generate UUID similar to Asana's GID format"""
-    return str(uuid. uuid4())
\ No newline at end of file
+    return str(uuid.UUID(bytes=random_bytes(16), version=4))
+
+def generate_ids(n: int) -> list[str]:
+    """Generate n UUID4 strings from a single random read (bulk generators)"""
+    if n <= 0:
+        return []
+    raw = np.frombuffer(random_bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.tobytes().hex()
+    return [
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+        for i in range(0, 32 * n, 32)
+    ]
@@ -1,14 +1,38 @@
-import openai
+import json
+import re
+import threading
 from config import OPENAI_API_KEY, LLM_MODEL, LLM_TEMPERATURE
 
-openai.api_key = OPENAI_API_KEY
 _HAS_KEY = bool(OPENAI_API_KEY)
+_openai = None
+_openai_lock = threading.Lock()
 
 _FALLBACK_WORDS = [
     "Project", "Task", "Update", "Plan", "Draft", "Review", "Spec", "Checklist",
     "Iteration", "Milestone", "Deliverable", "Idea", "Sprint", "Backlog"
 ]
 
+# Round trips made vs. generated strings actually used, for the end-of-run report
+_stats_lock = threading.Lock()
+LLM_STATS = {"calls": 0, "served": 0}
+
+def record_llm_usage(calls: int = 0, served: int = 0):
+    """Count LLM round trips and the generated strings handed to generators"""
+    with _stats_lock:
+        LLM_STATS["calls"] += calls
+        LLM_STATS["served"] += served
+
+def _get_openai():
+    """Import and configure the openai client on first use (the import alone takes ~0.5s)"""
+    global _openai
+    if _openai is None:
+        with _openai_lock:
+            if _openai is None:
+                import openai
+                openai.api_key = OPENAI_API_KEY
+                _openai = openai
+    return _openai
+
 def _fallback_text(prompt: str) -> str:
     # Deterministic short text when no LLM is available
     h = abs(hash(prompt))
@@ -16,12 +40,17 @@ def _fallback_text(prompt: str) -> str:
     w2 = _FALLBACK_WORDS[(h // len(_FALLBACK_WORDS)) % len(_FALLBACK_WORDS)]
     return f"{w1} {w2}"
 
+def _fallback_list(prompt: str, n: int) -> str:
+    # Offline stand-in for a pooled call: a JSON list, parsed like a real response
+    return json.dumps([f"{_fallback_text(f'{prompt}#{i}')} {i + 1}" for i in range(n)])
+
 def generate_with_llm(prompt: str, temperature: float = LLM_TEMPERATURE) -> str:
     """Generate text using OpenAI API, or a local fallback if no API key is configured."""
+    record_llm_usage(calls=1, served=1)
     if not _HAS_KEY:
         return _fallback_text(prompt)
     try:
-        response = openai.chat.completions.create(
+        response = _get_openai().chat.completions.create(
             model=LLM_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=temperature,
@@ -32,6 +61,79 @@ def generate_with_llm(prompt: str, temperature: float = LLM_TEMPERATURE) -> str:
         print(f"LLM generation error: {e}")
         return _fallback_text(prompt)
 
+def check_llm_connection() -> tuple[bool, str]:
+    """Make one tiny live completion; returns (ok, response text or error message).
+
+    Unlike generate_with_llm this does not fall back to local text, so a bad
+    key or network failure is reported as a failure.
+    """
+    if not _HAS_KEY:
+        return False, "OPENAI_API_KEY not set"
+    try:
+        response = _get_openai().chat.completions.create(
+            model=LLM_MODEL,
+            messages=[{"role": "user", "content": "Say 'OK'"}],
+            temperature=0.5,
+            max_tokens=5,
+            timeout=15
+        )
+        text = (response.choices[0].message.content or "").strip()
+        return (True, text) if text else (False, "API returned empty response")
+    except Exception as e:
+        return False, str(e)[:100]
+
+def parse_llm_list(raw: str) -> list[str]:
+    """Parse a JSON array of strings out of an LLM response.
+
+    Tolerates code fences and surrounding chatter; falls back to one item per
+    line (with bullets/numbering stripped) when the JSON is malformed.
+    """
+    if not raw:
+        return []
+    start, end = raw.find("["), raw.rfind("]")
+    if start != -1 and end > start:
+        try:
+            items = json.loads(raw[start:end + 1])
+            if isinstance(items, list):
+                return [str(item) for item in items if isinstance(item, (str, int, float))]
+        except json.JSONDecodeError:
+            pass
+    lines = [re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", line) for line in raw.splitlines()]
+    return [line for line in lines if line and not line.startswith("```")]
+
+def generate_list_with_llm(prompt: str, n: int, temperature: float = LLM_TEMPERATURE) -> list[str]:
+    """Request n candidates in a single call, returned as a parsed JSON list."""
+    full_prompt = f"""{prompt}
+Return exactly {n} items as a JSON array of strings, with no explanation."""
+    record_llm_usage(calls=1)
+    if not _HAS_KEY:
+        return parse_llm_list(_fallback_list(prompt, n))
+    try:
+        response = _get_openai().chat.completions.create(
+            model=LLM_MODEL,
+            messages=[{"role": "user", "content": full_prompt}],
+            temperature=temperature,
+            max_tokens=min(4000, 60 * n + 50)
+        )
+        items = parse_llm_list(response.choices[0].message.content)
+    except Exception as e:
+        print(f"LLM generation error: {e}")
+        items = parse_llm_list(_fallback_list(prompt, n))
+    return items
+
+def clean_llm_name(text: str, min_len: int = 5, max_len: int = 150) -> str | None:
+    """Strip quotes/whitespace from a generated name; None if it fails validation"""
+    name = text.strip().strip('"').strip("'").strip()
+    if min_len < len(name) < max_len and "\n" not in name:
+        return name
+    return None
+
+def llm_call_report() -> str:
+    """One-line summary of LLM round trips and calls saved by pooling"""
+    with _stats_lock:
+        calls, served = LLM_STATS["calls"], LLM_STATS["served"]
+    return f"{calls} LLM calls for {served} generated strings ({max(0, served - calls)} calls saved)"
+
 def generate_batch_with_llm(prompts: list[str]) -> list[str]:
     """Generate multiple items efficiently."""
-    return [generate_with_llm(p) for p in prompts]
\ No newline at end of file
+    return [generate_with_llm(p) for p in prompts]
@@ -0,0 +1,145 @@
+"""Fractional-index position keys for ordering tasks within a section.
+
+A key is a variable-length integer part followed by an optional fraction,
+all in base 62 ("0-9A-Za-z", which sort in ASCII order), so comparing keys
+as plain strings compares their values and `ORDER BY position` is the board
+order. The integer part's first character gives its length ("a" one digit,
+"b" two, ... "z" 26; "Z", "Y", ... likewise for the negative side below
+"a0"), so keys grow by one character per 62x more appends at the bottom (or
+prepends at the top), not one per few. There is always a key strictly
+between two others (`key_between`): a task is inserted or moved by writing
+its own key only, never renumbering siblings. A fraction never ends in "0";
+between two neighbours it grows by about one digit per six inserts into the
+same gap.
+
+Generated boards use evenly spaced integer keys of POSITION_DIGITS digits
+(`spaced_keys`), built for all tasks at once.
+"""
+import numpy as np
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+POSITION_DIGITS = 3  # 62 ** 3 ~ 238k integer slots per section for generated keys ("c" + 3 digits)
+SMALLEST_INTEGER = "A" + "0" * 26
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"Invalid position key head {head!r}")
+
+def _split(key: str) -> tuple[str, str]:
+    """(integer part, fraction) of a key"""
+    n = _integer_length(key[0])
+    if len(key) < n or key == SMALLEST_INTEGER or key[n:].endswith("0"):
+        raise ValueError(f"Invalid position key {key!r}")
+    return key[:n], key[n:]
+
+def _increment(integer: str) -> str | None:
+    """The next integer part (None past the largest)"""
+    head, digits = integer[0], list(integer[1:])
+    for i in range(len(digits) - 1, -1, -1):
+        d = DIGITS.index(digits[i]) + 1
+        if d < BASE:
+            digits[i] = DIGITS[d]
+            return head + "".join(digits)
+        digits[i] = "0"
+    # Every digit carried: one digit longer (or, on the negative side, shorter)
+    if head == "Z":
+        return "a0"
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    digits = digits + ["0"] if head > "a" else digits[:-1]
+    return head + "".join(digits)
+
+def _decrement(integer: str) -> str | None:
+    """The previous integer part (None below the smallest)"""
+    head, digits = integer[0], list(integer[1:])
+    for i in range(len(digits) - 1, -1, -1):
+        d = DIGITS.index(digits[i]) - 1
+        if d >= 0:
+            digits[i] = DIGITS[d]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    digits = digits + [DIGITS[-1]] if head < "Z" else digits[:-1]
+    return head + "".join(digits)
+
+def _midpoint(a: str, b: str | None) -> str:
+    """Fraction digits strictly between fractions a and b (b None = 1), a < b, neither ending in "0" """
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+def key_between(a: str | None, b: str | None) -> str:
+    """A key after a and before b (None = no bound on that side)"""
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"Position keys out of order: {a!r} >= {b!r}")
+    if a is None and b is None:
+        return "a0"
+    if a is None:
+        integer, fraction = _split(b)
+        if integer == SMALLEST_INTEGER:
+            return integer + _midpoint("", fraction)
+        if fraction:
+            return integer
+        previous = _decrement(integer)
+        if previous is None:
+            raise ValueError("Position keys exhausted at the top")
+        return previous
+    integer, fraction = _split(a)
+    if b is None:
+        following = _increment(integer)
+        return integer + _midpoint(fraction, None) if following is None else following
+    integer_b, fraction_b = _split(b)
+    if integer == integer_b:
+        return integer + _midpoint(fraction, fraction_b)
+    following = _increment(integer)
+    if following is not None and following < b:
+        return following
+    return integer + _midpoint(fraction, None)
+
+def keys_between(a: str | None, b: str | None, n: int) -> list[str]:
+    """n ascending keys between a and b: consecutive integers at either open end, else bisecting the gap"""
+    if n == 0:
+        return []
+    if b is None:
+        keys = [key_between(a, None)]
+        while len(keys) < n:
+            keys.append(key_between(keys[-1], None))
+        return keys
+    if a is None:
+        keys = [key_between(None, b)]
+        while len(keys) < n:
+            keys.append(key_between(None, keys[-1]))
+        return keys[::-1]
+    mid = key_between(a, b)
+    return keys_between(a, mid, n // 2) + [mid] + keys_between(mid, b, n - n // 2 - 1)
+
+def spaced_keys(rank: np.ndarray, count: np.ndarray) -> np.ndarray:
+    """Keys for the rank-th of count items of a group, evenly spaced integers, as a bytes array"""
+    slots = BASE ** POSITION_DIGITS
+    value = (rank.astype(np.int64) + 1) * slots // (count.astype(np.int64) + 1)
+    digits = np.empty((len(value), POSITION_DIGITS + 1), dtype=np.uint8)
+    digits[:, 0] = ord("a") + POSITION_DIGITS - 1
+    alphabet = np.frombuffer(DIGITS.encode(), dtype=np.uint8)
+    for k in range(POSITION_DIGITS, 0, -1):
+        value, digits[:, k] = np.divmod(value, BASE)
+        digits[:, k] = alphabet[digits[:, k]]
+    return digits.view(f"S{POSITION_DIGITS + 1}").ravel()
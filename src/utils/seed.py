@@ -0,0 +1,40 @@
+"""Reproducible builds: one seed drives every random source a generator uses.
+
+`seed_stage` reseeds `random`, NumPy's global state and a shared Generator
+(returned by `default_rng`, and used for ids) from (seed, stage name). Seeding
+per stage rather than once per run makes a stage's output independent of
+whether the stages before it were generated or loaded from the build cache.
+Without a seed every source stays unseeded, as before.
+"""
+import os
+import random
+import zlib
+import numpy as np
+
+_shared = None
+_stage_seed = None
+
+def seed_stage(seed: int | None, stage: str):
+    """Reseed all random sources for one build stage (no-op when seed is None)"""
+    global _shared, _stage_seed
+    if seed is None:
+        _shared = _stage_seed = None
+        return
+    stage_seed = _stage_seed = zlib.crc32(f"{seed}:{stage}".encode())
+    random.seed(stage_seed)
+    np.random.seed(stage_seed)
+    _shared = np.random.default_rng(stage_seed)
+
+def default_rng() -> np.random.Generator:
+    """The seeded stage Generator, or a fresh unseeded one"""
+    return _shared if _shared is not None else np.random.default_rng()
+
+def derived_random(*key) -> random.Random:
+    """A private random.Random for key (e.g. for a worker thread): seeded from the stage and key when seeded"""
+    if _stage_seed is None:
+        return random.Random()
+    return random.Random(f"{_stage_seed}:{':'.join(map(str, key))}")
+
+def random_bytes(n: int) -> bytes:
+    """n random bytes: from the stage Generator when seeded, else os.urandom"""
+    return _shared.bytes(n) if _shared is not None else os.urandom(n)
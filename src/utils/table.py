@@ -0,0 +1,176 @@
+"""Columnar in-memory tables for bulk generator output.
+
+A `Table` holds one typed column per field instead of a dict per row:
+  - numeric/bool columns are NumPy arrays
+  - dates and timestamps are datetime64 arrays (NaT for NULL), formatted as
+    ISO strings only when written ("D" -> YYYY-MM-DD, "s" -> YYYY-MM-DDTHH:MM:SS)
+  - string columns are dictionary-encoded (`StringColumn`): each distinct
+    value is stored once and rows hold int32 codes, so ids repeated across
+    rows (project_id, assignee_id, ...) and template texts cost 4 bytes a row
+
+`Database.write_rows` writes a Table in chunks straight from the columns.
+Code that wants rows can index or iterate the table to get `Row` views,
+which read through to the columns and support `row["name"]`, `.get()` and
+`.keys()` like the dict rows they replace.
+"""
+import sys
+from typing import Iterator
+import numpy as np
+
+class StringColumn:
+    """Dictionary-encoded strings: distinct values stored once, int32 codes per row (-1 = None)"""
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values: list[str], codes: np.ndarray):
+        self.values = values
+        self.codes = np.asarray(codes, dtype=np.int32)
+
+    @classmethod
+    def encode(cls, items: list[str | None]) -> "StringColumn":
+        """Encode a list of strings, interning repeats"""
+        index = {}
+        codes = np.fromiter(
+            (-1 if v is None else index.setdefault(v, len(index)) for v in items), dtype=np.int32, count=len(items)
+        )
+        return cls(list(index), codes)
+
+    @classmethod
+    def unique(cls, items: list[str]) -> "StringColumn":
+        """Column of distinct strings (ids), one code per value"""
+        return cls(items, np.arange(len(items), dtype=np.int32))
+
+    @classmethod
+    def nulls(cls, n: int) -> "StringColumn":
+        return cls([], np.full(n, -1, dtype=np.int32))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str | None:
+        code = self.codes[i]
+        return None if code < 0 else self.values[code]
+
+    def take(self, codes: np.ndarray) -> np.ndarray:
+        """Decode codes to an object array (None for -1)"""
+        lookup = np.empty(len(self.values) + 1, dtype=object)
+        lookup[:-1] = self.values
+        return lookup[codes]
+
+    def tolist(self, start: int = 0, stop: int | None = None) -> list:
+        return self.take(self.codes[start:stop]).tolist()
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sys.getsizeof(self.values) + sum(sys.getsizeof(v) for v in self.values)
+
+def _datetime_unit(array: np.ndarray) -> str:
+    return np.datetime_data(array.dtype)[0]
+
+def _to_python(array: np.ndarray) -> list:
+    """NumPy slice -> list of SQLite-ready Python values"""
+    if array.dtype.kind == "M":
+        strings = np.datetime_as_string(array, unit=_datetime_unit(array)).astype(object)
+        strings[np.isnat(array)] = None
+        return strings.tolist()
+    return array.tolist()
+
+class Row:
+    """Read-through view of one table row"""
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "Table", index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, name: str):
+        return self._table.value(name, self._index)
+
+    def get(self, name: str, default=None):
+        return self[name] if name in self._table.columns else default
+
+    def keys(self) -> list[str]:
+        return self._table.names
+
+    def __repr__(self) -> str:
+        return f"Row({ {name: self[name] for name in self.keys()} })"
+
+class Table:
+    """Equal-length named columns (NumPy arrays or StringColumns)"""
+
+    def __init__(self, columns: dict[str, np.ndarray | StringColumn]):
+        lengths = {len(col) for col in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {lengths}")
+        self.columns = columns
+        self._length = lengths.pop() if lengths else 0
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: int | str):
+        """table[i] -> Row view; table["name"] -> column as a list of Python values"""
+        if isinstance(key, str):
+            return self.column(key)
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError(key)
+        return Row(self, key)
+
+    def __iter__(self) -> Iterator[Row]:
+        return (Row(self, i) for i in range(self._length))
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> list:
+        """Decoded values of one column (ISO strings for dates, None for NULL)"""
+        col = self.columns[name]
+        if isinstance(col, StringColumn):
+            return col.tolist(start, stop)
+        return _to_python(col[start:stop])
+
+    def value(self, name: str, i: int):
+        col = self.columns[name]
+        if isinstance(col, StringColumn):
+            return col[i]
+        return _to_python(col[i:i + 1])[0]
+
+    def slice(self, start: int, stop: int) -> "Table":
+        """Rows [start, stop) as a Table sharing this table's string dictionaries"""
+        return Table({
+            name: StringColumn(col.values, col.codes[start:stop]) if isinstance(col, StringColumn) else col[start:stop]
+            for name, col in self.columns.items()
+        })
+
+    @classmethod
+    def concat(cls, tables: list["Table"]) -> "Table":
+        """Rows of the non-empty tables in order, as one Table; string dictionaries that differ are merged"""
+        rows = [t for t in tables if len(t)]
+        if len(rows) <= 1:
+            return rows[0] if rows else (tables[0] if tables else cls({}))
+        tables = rows
+        columns = {}
+        for name in tables[0].names:
+            parts = [t.columns[name] for t in tables]
+            if not isinstance(parts[0], StringColumn):
+                columns[name] = np.concatenate(parts)
+            elif all(p.values is parts[0].values or p.values == parts[0].values for p in parts):
+                columns[name] = StringColumn(parts[0].values, np.concatenate([p.codes for p in parts]))
+            else:
+                index, codes = {}, []
+                for p in parts:
+                    remap = np.array([index.setdefault(v, len(index)) for v in p.values] + [-1], dtype=np.int32)
+                    codes.append(remap[p.codes])  # -1 (None) reads the trailing -1
+                columns[name] = StringColumn(list(index), np.concatenate(codes))
+        return cls(columns)
+
+    def chunks(self, size: int = 50_000) -> Iterator[dict[str, list]]:
+        """Decoded column slices of at most size rows, for bounded-memory inserts"""
+        for start in range(0, self._length, size):
+            yield {name: self.column(name, start, start + size) for name in self.columns}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.columns.values())
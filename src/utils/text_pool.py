@@ -0,0 +1,93 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.llm_utils import generate_list_with_llm, clean_llm_name, record_llm_usage
+from utils.dedup import NearDuplicateFilter
+from utils.seed import derived_random
+from config import LLM_POOL_BATCH_SIZE, LLM_POOL_LOW_WATERMARK, LLM_POOL_WORKERS, DEDUP_TEXT, DEDUP_CAPACITY
+
+class TextPool:
+    """Per-key pools of LLM-generated strings, refilled in the background.
+
+    One pooled call returns `batch_size` candidates for a key such as
+    (department, project); generators draw from the pool and a refill is
+    scheduled on a worker thread once it drops to `low_watermark`. With
+    `dedup`, candidates that are near-duplicates of anything already pooled
+    for the same key are dropped, so a key's pool stays varied across refills.
+    """
+
+    def __init__(self, build_prompt, batch_size: int = LLM_POOL_BATCH_SIZE,
+                 low_watermark: int = LLM_POOL_LOW_WATERMARK, temperature: float = 0.9,
+                 validate=clean_llm_name, dedup: bool = DEDUP_TEXT):
+        self.build_prompt = build_prompt
+        self.batch_size = batch_size
+        self.low_watermark = low_watermark
+        self.temperature = temperature
+        self.validate = validate
+        self._pools = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._dedup = None
+        self.dedup = dedup
+        self._refills = {}
+
+    def _refill(self, key):
+        """Fetch one batch for key, keeping only valid, not-yet-seen (or near-duplicate) candidates"""
+        items = []
+        try:
+            raw = generate_list_with_llm(self.build_prompt(key, self.batch_size), self.batch_size, self.temperature)
+            seen = set()
+            for text in raw:
+                name = self.validate(text)
+                if name and name.lower() not in seen:
+                    seen.add(name.lower())
+                    items.append(name)
+            if self.dedup and items:
+                with self._lock:
+                    if self._dedup is None:
+                        self._dedup = NearDuplicateFilter(capacity=DEDUP_CAPACITY)
+                    keep = self._dedup.filter(items, [key] * len(items))
+                items = [item for item, ok in zip(items, keep) if ok]
+            # A private generator per refill: worker threads never draw from the global
+            # stream the (seeded) generators on the main thread use
+            with self._lock:
+                self._refills[key] = self._refills.get(key, 0) + 1
+                rng = derived_random("text-pool", self.build_prompt.__name__, key, self._refills[key])
+            rng.shuffle(items)
+        finally:
+            with self._lock:
+                self._pools.setdefault(key, deque()).extend(items)
+                self._pending.pop(key, None)
+        return len(items)
+
+    def _schedule_refill(self, key):
+        # Caller holds the lock
+        if key in self._pending:
+            return self._pending[key]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=LLM_POOL_WORKERS, thread_name_prefix="llm-pool")
+        future = self._executor.submit(self._refill, key)
+        self._pending[key] = future
+        return future
+
+    def draw(self, key) -> str | None:
+        """Take one string for key; None if the LLM produced nothing usable"""
+        for _ in range(2):
+            with self._lock:
+                pool = self._pools.setdefault(key, deque())
+                if len(pool) <= self.low_watermark:
+                    future = self._schedule_refill(key)
+                if pool:
+                    record_llm_usage(served=1)
+                    return pool.popleft()
+            # Pool is empty: wait for the refill that was just scheduled
+            if future.result() == 0:
+                break
+        return None
+
+    def close(self):
+        """Stop background refills (pending ones finish first)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,455 @@
+"""Programmatic validation of a generated database.
+
+Checks foreign keys, temporal ordering and uniqueness, and compares realized
+distributions against the targets the generators encode (date_utils due-date
+buckets, tasks.py completion/assignment rates and Pareto skew). Each table is
+scanned once: every check for a table is folded into a single aggregate query
+whose foreign-key probes hit primary-key indexes.
+
+Usage: python src/validate.py [db_path]   (exits 1 if any check fails)
+"""
+import math
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DB_PATH, SIMULATION_CURRENT_DATE, VALIDATION_TOLERANCE
+from utils.date_utils import DUE_DATE_BUCKETS
+from generators.tasks import (
+    ASSIGNMENT_RATE, COMPLETION_BASE_RATES, DEFAULT_COMPLETION_RATE,
+    COMPLETION_RAMP_DAYS, PARETO_TOP_SHARE
+)
+
+WEEKEND_SHIFT_DAYS = 2  # Due dates on weekends are moved back to Friday
+
+def _result(name: str, ok: bool, detail: str = "") -> dict:
+    return {"check": name, "ok": bool(ok), "detail": detail}
+
+def _zero_checks(counts: dict, labels: dict) -> list[dict]:
+    """One result per violation counter that must be zero"""
+    return [
+        _result(label, not counts[key], f"{counts[key]} violating rows" if counts[key] else "")
+        for key, label in labels.items()
+    ]
+
+def _share_check(name: str, realized: int, total: int, target: float, tolerance: float) -> dict:
+    """Compare a realized share against a target, allowing for sampling noise"""
+    if total == 0:
+        return _result(name, True, "no rows")
+    share = realized / total
+    allowed = max(tolerance, 3 * math.sqrt(target * (1 - target) / total))
+    return _result(
+        name, abs(share - target) <= allowed,
+        f"{share:.1%} vs target {target:.1%} (±{allowed:.1%}, n={total})"
+    )
+
+def _due_bucket(due_days: int | None) -> str:
+    """Map a due-date offset (days after creation) to its DUE_DATE_BUCKETS name"""
+    for name, _, days_range in DUE_DATE_BUCKETS:
+        if days_range is None:
+            if due_days is None:
+                return name
+        elif due_days is not None and days_range[0] - WEEKEND_SHIFT_DAYS <= due_days <= days_range[1]:
+            return name
+    return "other"
+
+def _completion_rate_sql() -> str:
+    """CASE expression giving each project type's base completion rate"""
+    cases = " ".join(f"WHEN '{t}' THEN {rate}" for t, rate in COMPLETION_BASE_RATES.items())
+    return f"CASE p.project_type {cases} ELSE {DEFAULT_COMPLETION_RATE} END"
+
+def check_tasks(conn: sqlite3.Connection, now: str, tolerance: float, totals: dict | None = None) -> list[dict]:
+    """Single scan of tasks: FKs, temporal order, completion/due/assignment distributions.
+
+    Table-wide counters are copied into `totals` for the aggregate checks.
+    """
+    # Grouping by (project type, due offset) keeps the output to a few hundred
+    # rows while evaluating the date arithmetic once per task
+    rows = conn.execute(f"""
+        SELECT p.project_type AS project_type,
+               CAST(julianday(t.due_date) - julianday(date(t.created_at)) AS INTEGER) AS due_days,
+               COUNT(*) AS tasks,
+               SUM(p.project_id IS NULL) AS bad_project,
+               SUM(t.section_id IS NOT NULL AND NOT EXISTS (
+                   SELECT 1 FROM sections s WHERE s.section_id = t.section_id AND s.project_id = t.project_id
+               )) AS bad_section,
+               SUM(t.assignee_id IS NOT NULL AND NOT EXISTS (
+                   SELECT 1 FROM users u WHERE u.user_id = t.assignee_id)) AS bad_assignee,
+               SUM(NOT EXISTS (SELECT 1 FROM users u WHERE u.user_id = t.created_by)) AS bad_creator,
+               SUM(t.completed_by IS NOT NULL AND NOT EXISTS (
+                   SELECT 1 FROM users u WHERE u.user_id = t.completed_by)) AS bad_completer,
+               SUM(t.parent_task_id IS NOT NULL AND NOT EXISTS (
+                   SELECT 1 FROM tasks pt WHERE pt.task_id = t.parent_task_id)) AS bad_parent,
+               SUM(t.created_at > :now) AS created_after_now,
+               SUM(t.completed_at < t.created_at) AS completed_before_created,
+               SUM(t.completed_at > :now) AS completed_after_now,
+               SUM((t.completed_at IS NOT NULL) <> (t.completed = 1)) AS completion_mismatch,
+               SUM(t.completed = 1) AS completed,
+               SUM({_completion_rate_sql()} * (0.5 + 0.5 * MIN(1.0,
+                   MAX(0, julianday(:now) - julianday(t.created_at)) / {COMPLETION_RAMP_DAYS}))) AS expected_completed,
+               SUM(t.assignee_id IS NOT NULL) AS assigned,
+               SUM(t.completed = 0 AND t.due_date < date(:now)) AS overdue,
+               SUM(t.num_comments) AS num_comments,
+               SUM(t.num_subtasks) AS num_subtasks,
+               SUM(t.parent_task_id IS NOT NULL) AS subtasks
+        FROM tasks t
+        LEFT JOIN projects p ON p.project_id = t.project_id
+        GROUP BY 1, 2
+    """, {"now": now}).fetchall()
+
+    totals = {} if totals is None else totals
+    by_type = {}
+    due_buckets = {}
+    for row in rows:
+        type_totals = by_type.setdefault(row["project_type"], {})
+        for key in row.keys()[2:]:
+            totals[key] = totals.get(key, 0) + (row[key] or 0)
+            type_totals[key] = type_totals.get(key, 0) + (row[key] or 0)
+        bucket = _due_bucket(row["due_days"])
+        due_buckets[bucket] = due_buckets.get(bucket, 0) + row["tasks"]
+    if not totals:
+        return [_result("tasks present", False, "tasks table is empty")]
+
+    results = _zero_checks(totals, {
+        "bad_project": "tasks.project_id → projects",
+        "bad_section": "tasks.section_id → sections (same project)",
+        "bad_assignee": "tasks.assignee_id → users",
+        "bad_creator": "tasks.created_by → users",
+        "bad_completer": "tasks.completed_by → users",
+        "bad_parent": "tasks.parent_task_id → tasks",
+        "created_after_now": "tasks created on or before simulation date",
+        "completed_before_created": "tasks completed after creation",
+        "completed_after_now": "tasks completed on or before simulation date",
+        "completion_mismatch": "tasks.completed matches completed_at",
+    })
+
+    # Completion rate by project type vs. the expected rate for the tasks' ages
+    for project_type, counts in sorted(by_type.items(), key=lambda item: str(item[0])):
+        if project_type is None or not counts["tasks"]:
+            continue
+        target = counts["expected_completed"] / counts["tasks"]
+        results.append(_share_check(
+            f"completion rate ({project_type})", counts["completed"], counts["tasks"], target, tolerance
+        ))
+
+    results.append(_share_check("assignment rate", totals["assigned"], totals["tasks"], ASSIGNMENT_RATE, tolerance))
+    for name, share, _ in DUE_DATE_BUCKETS:
+        results.append(_share_check(
+            f"due date bucket ({name})", due_buckets.get(name, 0), totals["tasks"], share, tolerance
+        ))
+    return results
+
+def check_positions(conn: sqlite3.Connection) -> list[dict]:
+    """Board positions: every sectioned task has a well-formed key, unique within its section (index walk)"""
+    # A key's first character gives the length of its integer part ("a" 2 characters, "b" 3, ..., "Z" 2, "Y" 3, ...)
+    counts = conn.execute("""
+        SELECT SUM(section_id IS NOT NULL AND position IS NULL) AS missing,
+               SUM(length IS NULL OR length(position) < length OR (length(position) > length AND position GLOB '*0')
+                   OR position GLOB '*[^0-9A-Za-z]*') AS malformed
+        FROM (
+            SELECT section_id, position, CASE
+                WHEN substr(position, 1, 1) BETWEEN 'a' AND 'z' THEN unicode(position) - unicode('a') + 2
+                WHEN substr(position, 1, 1) BETWEEN 'A' AND 'Z' THEN unicode('Z') - unicode(position) + 2
+            END AS length
+            FROM tasks
+        )
+    """).fetchone()
+    duplicates = conn.execute("""
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM tasks WHERE section_id IS NOT NULL AND position IS NOT NULL
+            GROUP BY section_id, position HAVING COUNT(*) > 1
+        )
+    """).fetchone()[0]
+    counts = {"missing": counts["missing"] or 0, "malformed": counts["malformed"] or 0, "duplicates": duplicates}
+    return _zero_checks(counts, {
+        "missing": "sectioned tasks have a board position",
+        "malformed": "position keys are base-62 integer part + fraction (no trailing 0)",
+        "duplicates": "unique task positions per section",
+    })
+
+def check_comments(conn: sqlite3.Connection, now: str) -> list[dict]:
+    """Single scan of comments: FKs, reply threads and task-lifetime bounds"""
+    counts = conn.execute("""
+        SELECT COUNT(*) AS comments,
+               SUM(t.task_id IS NULL) AS bad_task,
+               SUM(NOT EXISTS (SELECT 1 FROM users u WHERE u.user_id = c.user_id)) AS bad_user,
+               SUM(c.parent_comment_id IS NOT NULL AND NOT EXISTS (
+                   SELECT 1 FROM comments pc
+                   WHERE pc.comment_id = c.parent_comment_id AND pc.task_id = c.task_id
+                     AND pc.created_at <= c.created_at
+               )) AS bad_parent,
+               SUM(c.created_at < t.created_at) AS before_task,
+               SUM(c.created_at > COALESCE(t.completed_at, :now)) AS after_task
+        FROM comments c
+        LEFT JOIN tasks t ON t.task_id = c.task_id
+    """, {"now": now}).fetchone()
+    return _zero_checks(dict(counts), {
+        "bad_task": "comments.task_id → tasks",
+        "bad_user": "comments.user_id → users",
+        "bad_parent": "comment replies follow a comment on the same task",
+        "before_task": "comments after task creation",
+        "after_task": "comments before task completion / simulation date",
+    })
+
+def check_stories(conn: sqlite3.Connection, now: str, totals: dict) -> list[dict]:
+    """Single scan of the activity log: FKs, task-lifetime bounds, one created/completed story per task"""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'stories'").fetchone():
+        return []
+    counts = conn.execute("""
+        SELECT SUM(t.task_id IS NULL) AS bad_task,
+               SUM(s.actor_id IS NOT NULL AND NOT EXISTS (
+                   SELECT 1 FROM users u WHERE u.user_id = s.actor_id)) AS bad_actor,
+               SUM(s.created_at < t.created_at) AS before_task,
+               SUM(s.created_at > COALESCE(t.completed_at, :now)) AS after_task,
+               SUM(s.story_type = 'created') AS created,
+               SUM(s.story_type = 'completed') AS completed
+        FROM stories s
+        LEFT JOIN tasks t ON t.task_id = s.task_id
+    """, {"now": now}).fetchone()
+    counts = {key: counts[key] or 0 for key in counts.keys()}
+    results = _zero_checks(counts, {
+        "bad_task": "stories.task_id → tasks",
+        "bad_actor": "stories.actor_id → users",
+        "before_task": "stories after task creation",
+        "after_task": "stories before task completion / simulation date",
+    })
+    for story_type, total in (("created", "tasks"), ("completed", "completed")):
+        expected = totals.get(total, 0)
+        results.append(_result(
+            f"one '{story_type}' story per {'task' if total == 'tasks' else 'completed task'}",
+            counts[story_type] == expected, f"{counts[story_type]} vs {expected}"
+        ))
+    return results
+
+def check_people_and_structure(conn: sqlite3.Connection) -> list[dict]:
+    """FKs and uniqueness for the smaller tables, one scan each"""
+    users = conn.execute("""
+        SELECT SUM(NOT EXISTS (SELECT 1 FROM organizations o WHERE o.org_id = u.org_id)) AS bad_org,
+               COUNT(*) - COUNT(DISTINCT email) AS duplicate_emails
+        FROM users u
+    """).fetchone()
+    teams = conn.execute("""
+        SELECT SUM(NOT EXISTS (SELECT 1 FROM organizations o WHERE o.org_id = t.org_id)) AS bad_org
+        FROM teams t
+    """).fetchone()
+    memberships = conn.execute("""
+        SELECT SUM(NOT EXISTS (SELECT 1 FROM teams t WHERE t.team_id = m.team_id)) AS bad_team,
+               SUM(NOT EXISTS (SELECT 1 FROM users u WHERE u.user_id = m.user_id)) AS bad_user
+        FROM team_memberships m
+    """).fetchone()
+    projects = conn.execute("""
+        SELECT SUM(NOT EXISTS (SELECT 1 FROM teams t WHERE t.team_id = p.team_id)) AS bad_team,
+               SUM(p.owner_id IS NOT NULL AND NOT EXISTS (
+                   SELECT 1 FROM users u WHERE u.user_id = p.owner_id)) AS bad_owner
+        FROM projects p
+    """).fetchone()
+    sections = conn.execute("""
+        SELECT SUM(NOT EXISTS (SELECT 1 FROM projects p WHERE p.project_id = s.project_id)) AS bad_project,
+               COUNT(*) - COUNT(DISTINCT project_id || ':' || position) AS duplicate_positions
+        FROM sections s
+    """).fetchone()
+
+    counts = {
+        "users_org": users["bad_org"], "duplicate_emails": users["duplicate_emails"],
+        "teams_org": teams["bad_org"],
+        "memberships_team": memberships["bad_team"], "memberships_user": memberships["bad_user"],
+        "projects_team": projects["bad_team"], "projects_owner": projects["bad_owner"],
+        "sections_project": sections["bad_project"], "duplicate_positions": sections["duplicate_positions"],
+    }
+    counts = {key: value or 0 for key, value in counts.items()}
+    return _zero_checks(counts, {
+        "users_org": "users.org_id → organizations",
+        "duplicate_emails": "unique user emails",
+        "teams_org": "teams.org_id → organizations",
+        "memberships_team": "team_memberships.team_id → teams",
+        "memberships_user": "team_memberships.user_id → users",
+        "projects_team": "projects.team_id → teams",
+        "projects_owner": "projects.owner_id → users",
+        "sections_project": "sections.project_id → projects",
+        "duplicate_positions": "unique section positions per project",
+    })
+
+def check_project_members(conn: sqlite3.Connection) -> list[dict]:
+    """Project members and followers: FKs, and every owner an admin member of their project"""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'project_memberships'").fetchone():
+        return []
+    members = conn.execute("""
+        SELECT SUM(NOT EXISTS (SELECT 1 FROM projects p WHERE p.project_id = m.project_id)) AS bad_project,
+               SUM(NOT EXISTS (SELECT 1 FROM users u WHERE u.user_id = m.user_id)) AS bad_user
+        FROM project_memberships m
+    """).fetchone()
+    followers = conn.execute("""
+        SELECT SUM(NOT EXISTS (SELECT 1 FROM projects p WHERE p.project_id = f.project_id)) AS bad_project,
+               SUM(NOT EXISTS (SELECT 1 FROM users u WHERE u.user_id = f.user_id)) AS bad_user
+        FROM project_followers f
+    """).fetchone()
+    owners = conn.execute("""
+        SELECT SUM(NOT EXISTS (
+            SELECT 1 FROM project_memberships m
+            WHERE m.project_id = p.project_id AND m.user_id = p.owner_id AND m.role = 'admin'
+        )) AS not_admin
+        FROM projects p WHERE p.owner_id IS NOT NULL
+    """).fetchone()
+
+    counts = {
+        "members_project": members["bad_project"], "members_user": members["bad_user"],
+        "followers_project": followers["bad_project"], "followers_user": followers["bad_user"],
+        "owner_not_admin": owners["not_admin"],
+    }
+    counts = {key: value or 0 for key, value in counts.items()}
+    return _zero_checks(counts, {
+        "members_project": "project_memberships.project_id → projects",
+        "members_user": "project_memberships.user_id → users",
+        "followers_project": "project_followers.project_id → projects",
+        "followers_user": "project_followers.user_id → users",
+        "owner_not_admin": "project owners are admin members",
+    })
+
+def check_dependencies(conn: sqlite3.Connection) -> list[dict]:
+    """Dependency links: FKs, creation order (hence no cycles), completion order, critical-path summary"""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'task_dependencies'").fetchone():
+        return []
+    links = conn.execute("""
+        SELECT SUM(t.task_id IS NULL) AS bad_task,
+               SUM(b.task_id IS NULL) AS bad_blocker,
+               SUM((b.created_at, b.task_id) >= (t.created_at, t.task_id)) AS out_of_order,
+               SUM(t.completed = 1 AND (b.completed = 0 OR b.completed_at > t.completed_at)) AS done_while_blocked
+        FROM task_dependencies d
+        LEFT JOIN tasks t ON t.task_id = d.task_id
+        LEFT JOIN tasks b ON b.task_id = d.depends_on_id
+    """).fetchone()
+    summary = conn.execute("""
+        SELECT SUM(s.depth != COALESCE((
+                   SELECT MAX(b.depth) + 1 FROM task_dependencies d
+                   JOIN task_dependency_summary b ON b.task_id = d.depends_on_id AND b.project_id = s.project_id
+                   WHERE d.task_id = s.task_id), 0)) AS bad_depth,
+               SUM(s.critical_blocker_id IS NOT NULL AND NOT EXISTS (
+                   SELECT 1 FROM task_dependencies d
+                   JOIN task_dependency_summary b ON b.task_id = d.depends_on_id AND b.project_id = s.project_id
+                   WHERE d.task_id = s.task_id AND d.depends_on_id = s.critical_blocker_id
+                     AND b.depth = s.depth - 1)) AS bad_critical,
+               COUNT(*) AS rows
+        FROM task_dependency_summary s
+    """).fetchone()
+    linked = conn.execute("""
+        SELECT COUNT(*) FROM (SELECT task_id FROM task_dependencies UNION SELECT depends_on_id FROM task_dependencies)
+    """).fetchone()[0]
+
+    counts = {key: links[key] or 0 for key in links.keys()}
+    counts.update(bad_depth=summary["bad_depth"] or 0, bad_critical=summary["bad_critical"] or 0)
+    results = _zero_checks(counts, {
+        "bad_task": "task_dependencies.task_id → tasks",
+        "bad_blocker": "task_dependencies.depends_on_id → tasks",
+        "out_of_order": "blockers created before their dependents (acyclic)",
+        "done_while_blocked": "completed tasks' blockers completed first",
+        "bad_depth": "dependency depth is the longest same-project blocker chain",
+        "bad_critical": "critical blocker lies on the longest chain",
+    })
+    results.append(_result("one dependency summary row per linked task", summary["rows"] == linked,
+                           f"{summary['rows']} vs {linked}"))
+    return results
+
+def check_aggregates(conn: sqlite3.Connection, totals: dict) -> list[dict]:
+    """Summary tables and task counters agree with the tasks scan"""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'project_task_summary'").fetchone():
+        return []
+    expected = (totals.get("tasks", 0), totals.get("completed", 0), totals.get("overdue", 0))
+    results = []
+    for table in ("project_task_summary", "team_task_summary"):
+        row = conn.execute(
+            f"SELECT SUM(total_tasks), SUM(completed_tasks), SUM(overdue_tasks) FROM {table}"
+        ).fetchone()
+        actual = tuple(value or 0 for value in row)
+        results.append(_result(f"{table} matches tasks", actual == expected, f"{actual} vs {expected}"))
+    row = conn.execute("SELECT SUM(open_tasks), SUM(completed_tasks) FROM user_task_summary").fetchone()
+    assigned_completed = conn.execute(
+        "SELECT COUNT(*) FROM tasks WHERE assignee_id IS NOT NULL AND completed = 1"
+    ).fetchone()[0]
+    actual = tuple(value or 0 for value in row)
+    expected_users = (totals.get("assigned", 0) - assigned_completed, assigned_completed)
+    results.append(_result("user_task_summary matches tasks", actual == expected_users, f"{actual} vs {expected_users}"))
+
+    num_comments = conn.execute("SELECT COUNT(*) FROM comments").fetchone()[0]
+    results.append(_result(
+        "tasks.num_comments matches comments", totals.get("num_comments", 0) == num_comments,
+        f"{totals.get('num_comments', 0)} vs {num_comments}"
+    ))
+    results.append(_result(
+        "tasks.num_subtasks matches subtasks", totals.get("num_subtasks", 0) == totals.get("subtasks", 0),
+        f"{totals.get('num_subtasks', 0)} vs {totals.get('subtasks', 0)}"
+    ))
+    return results
+
+def check_assignee_skew(conn: sqlite3.Connection) -> list[dict]:
+    """Pareto skew: the busiest 20% of users hold at least half of assigned tasks.
+
+    Reads only idx_tasks_assignee (index-only GROUP BY).
+    """
+    top_fraction, min_share = PARETO_TOP_SHARE
+    num_users = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+    counts = [row[0] for row in conn.execute("""
+        SELECT COUNT(*) AS n FROM tasks WHERE assignee_id IS NOT NULL
+        GROUP BY assignee_id ORDER BY n DESC
+    """)]
+    assigned = sum(counts)
+    if not assigned or not num_users:
+        return [_result("assignee Pareto skew", True, "no assigned tasks")]
+    top_k = max(1, math.ceil(top_fraction * num_users))
+    share = sum(counts[:top_k]) / assigned
+    return [_result(
+        "assignee Pareto skew", share >= min_share,
+        f"top {top_fraction:.0%} of users hold {share:.1%} of assigned tasks (target ≥{min_share:.0%})"
+    )]
+
+def validate_database(db_path: str = DB_PATH, tolerance: float = VALIDATION_TOLERANCE) -> list[dict]:
+    """Run every check; returns a list of {check, ok, detail} results"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    # Delta runs advance the workspace past the configured simulation date
+    now = SIMULATION_CURRENT_DATE
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'workspace_meta'").fetchone():
+        row = conn.execute("SELECT value FROM workspace_meta WHERE key = 'simulation_current_date'").fetchone()
+        now = row[0] if row else now
+    now = datetime.fromisoformat(now).isoformat()
+    # Index probes dominate; keep the pages they touch mapped and cached
+    conn.execute("PRAGMA mmap_size = 1073741824")
+    conn.execute("PRAGMA cache_size = -262144")
+    try:
+        totals = {}
+        return (
+            check_people_and_structure(conn)
+            + check_project_members(conn)
+            + check_tasks(conn, now, tolerance, totals)
+            + check_positions(conn)
+            + check_comments(conn, now)
+            + check_stories(conn, now, totals)
+            + check_dependencies(conn)
+            + check_aggregates(conn, totals)
+            + check_assignee_skew(conn)
+        )
+    finally:
+        conn.close()
+
+def main() -> int:
+    db_path = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    print(f"🔍 Validating {db_path}...")
+    start = time.perf_counter()
+    results = validate_database(db_path)
+    elapsed = time.perf_counter() - start
+
+    for r in results:
+        mark = "✓" if r["ok"] else "❌"
+        detail = f" — {r['detail']}" if r["detail"] else ""
+        print(f"   {mark} {r['check']}{detail}")
+
+    failed = [r for r in results if not r["ok"]]
+    print()
+    print(f"{len(results) - len(failed)}/{len(results)} checks passed in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Background database writer: overlap generation with SQLite writes.
+
+Generators hand rows (dict lists or Tables) to `DatabaseWriter.write`, which
+splits them into chunks of WRITER_CHUNK_ROWS on a bounded queue; a dedicated
+thread owning the SQLite connection drains it, committing every
+WRITER_TRANSACTION_ROWS rows. When the writer falls WRITER_QUEUE_CHUNKS
+chunks behind, `write` blocks (backpressure) so memory stays bounded.
+
+Other database work (schema setup, summaries, search index) runs on the
+writer thread too, in queue order, via `call` / `run`. The writer times every
+chunk it writes and the producer marks its stages, so `report()` can say how
+much of each stage's write time was hidden behind generation.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+
+from database import Database
+from config import WRITER_QUEUE_CHUNKS, WRITER_CHUNK_ROWS, WRITER_TRANSACTION_ROWS
+
+_STOP = object()
+
+def _subtract(intervals: list[tuple[float, float]], holes: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """Parts of intervals not covered by holes"""
+    result = []
+    for start, end in intervals:
+        pieces = [(start, end)]
+        for h_start, h_end in holes:
+            pieces = [
+                piece for s, e in pieces
+                for piece in ((s, min(e, h_start)), (max(s, h_end), e)) if piece[1] > piece[0]
+            ]
+        result += pieces
+    return result
+
+def _overlap(a: list[tuple[float, float]], b: list[tuple[float, float]]) -> float:
+    """Total length of the intersection of two interval lists (each non-overlapping)"""
+    return sum(max(0.0, min(e1, e2) - max(s1, s2)) for s1, e1 in a for s2, e2 in b)
+
+class DatabaseWriter:
+    """A thread owning one SQLite connection, fed through a bounded queue"""
+
+    def __init__(self, db_path: str, max_pending: int = WRITER_QUEUE_CHUNKS, chunk_rows: int = WRITER_CHUNK_ROWS,
+                 transaction_rows: int = WRITER_TRANSACTION_ROWS):
+        self.db_path = db_path
+        self.chunk_rows = chunk_rows
+        self.transaction_rows = transaction_rows
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._error = None
+        self._stage = None
+        self._stages = {}  # Stage -> producer (start, end) intervals
+        self._blocked = []  # Producer intervals spent waiting on a full queue, with their stage
+        self._writes = []  # Writer (stage, start, end) per chunk or call
+
+    def start(self) -> "DatabaseWriter":
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    # Writer thread
+
+    def _run(self):
+        db = Database(self.db_path)
+        db.connect()
+        db.conn.execute("PRAGMA cache_size = -262144")
+        pending = 0  # Rows written since the last commit
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                kind, stage, payload, future = item
+                start = time.perf_counter()
+                if kind == "rows":
+                    table, data = payload
+                    pending += db.write_rows(table, data)
+                    if pending >= self.transaction_rows:
+                        db.conn.commit()
+                        pending = 0
+                else:
+                    db.conn.commit()
+                    pending = 0
+                    try:
+                        future.set_result(payload(db) if kind == "call" else None)
+                    except Exception as e:
+                        future.set_exception(e)
+                        raise
+                self._writes.append((stage, start, time.perf_counter()))
+        except Exception as e:
+            self._error = e
+            # Fail anything still queued so the producer never waits forever
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP and item[3] is not None and not item[3].done():
+                    item[3].set_exception(e)
+        finally:
+            if self._error is None:
+                db.conn.commit()
+            db.close()
+
+    # Producer side
+
+    def _check(self):
+        if self._error is not None:
+            raise RuntimeError(f"Database writer failed: {self._error}") from self._error
+
+    def _put(self, item):
+        start = time.perf_counter()
+        while True:
+            self._check()
+            try:
+                self._queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        end = time.perf_counter()
+        if end - start > 1e-4:
+            self._blocked.append((self._stage, start, end))
+
+    @contextmanager
+    def stage(self, name: str):
+        """Attribute the producer's work and the writes it queues to a named stage"""
+        previous, self._stage = self._stage, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages.setdefault(name, []).append((start, time.perf_counter()))
+            self._stage = previous
+
+    def write(self, table: str, data) -> int:
+        """Queue dict rows or a Table for insertion (blocks while the queue is full); returns the row count"""
+        for start in range(0, len(data), self.chunk_rows):
+            chunk = data.slice(start, start + self.chunk_rows) if hasattr(data, "slice") \
+                else data[start:start + self.chunk_rows]
+            self._put(("rows", self._stage, (table, chunk), None))
+        return len(data)
+
+    def write_stream(self, table: str, chunks) -> int:
+        """Queue a stream of Tables as one bulk load: the table's secondary indexes are rebuilt after it"""
+        indexes = self.call(lambda db: db.drop_indexes(table))
+        count = sum(self.write(table, data) for data in chunks)
+        self.call(lambda db: db.create_indexes(indexes.result()))
+        return count
+
+    def call(self, fn) -> Future:
+        """Run fn(db) on the writer thread after everything queued so far (committed first)"""
+        future = Future()
+        self._put(("call", self._stage, fn, future))
+        return future
+
+    def run(self, fn):
+        """call(fn) and wait for its result"""
+        future = self.call(fn)
+        while True:
+            self._check()
+            try:
+                return future.result(timeout=0.1)
+            except FutureTimeout:  # Not the builtin TimeoutError before Python 3.11
+                continue
+
+    def flush(self):
+        """Wait until everything queued so far is written and committed"""
+        self.run(lambda db: None)
+
+    def close(self):
+        """Write and commit everything queued, then stop the thread and close the connection"""
+        self.flush()
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._check()
+
+    def report(self) -> list[dict]:
+        """Per stage: producer time, write time, and the share of writes overlapped with production"""
+        blocked = [(start, end) for _, start, end in self._blocked]
+        producing = _subtract([i for intervals in self._stages.values() for i in intervals], blocked)
+        rows = []
+        for name, intervals in self._stages.items():
+            writes = [(start, end) for stage, start, end in self._writes if stage == name]
+            write_time = sum(end - start for start, end in writes)
+            stage_blocked = [(start, end) for stage, start, end in self._blocked if stage == name]
+            rows.append({
+                "stage": name,
+                "produce": sum(end - start for start, end in _subtract(intervals, stage_blocked)),
+                "write": write_time,
+                "overlapped": _overlap(writes, producing),
+                "blocked": sum(end - start for start, end in stage_blocked),
+            })
+        return rows